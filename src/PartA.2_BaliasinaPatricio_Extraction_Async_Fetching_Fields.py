@@ -1,12 +1,44 @@
 import asyncio
 import csv
 import os
-import copy
+import time
 
 #from collections import defaultdict
 from semanticscholar import AsyncSemanticScholar 
+from semanticscholar.Author import Author as S2Author
 from semanticscholar.Paper import Paper as S2Paper
 
+from s2_cache import open_cache
+from batch_fetch import BatchStats, fetch_resilient, report_lost_ids
+from s2_session import open_session, close_session
+from paper_record import PaperRecord
+from keyword_tagger import KeywordTagger
+from keyword_propagation import propagate_keywords
+from venue_registry import VenueRegistry
+from fetch_manifest import FetchManifest, content_hash
+from output_schema import (PAPER_COLUMNS, AUTHOR_COLUMNS, VENUE_COLUMNS,
+                           PAPER_KEYWORD_COLUMNS, paper_fields, author_fields)
+
+# Re-runs read Semantic Scholar responses from this SQLite file
+USE_CACHE = True
+
+# How many citation hops keywords flow into referenced papers
+# (None = until nothing changes)
+KEYWORD_PROPAGATION_DEPTH = 1
+
+# "csv" or "parquet" (typed columns, list-typed references/authors;
+# preprocessing reads either)
+OUTPUT_FORMAT = "csv"
+
+# Only fetch papers/authors that are new or were fetched more than
+# MANIFEST_MAX_AGE_DAYS ago (tracked in fetch_manifest.json); the rest
+# come from the response cache. Needs USE_CACHE. The fetch is incremental,
+# the outputs are not: when anything changed they are rebuilt in full from
+# the cache, because propagated keywords and venue IDs of existing papers
+# can change when a single paper is added or refreshed.
+INCREMENTAL = False
+MANIFEST_MAX_AGE_DAYS = 7
+
 # -------------------------------------------
 # A KNOWN KEYWORDS LIST (from old script)  
 # -------------------------------------------
@@ -67,61 +99,74 @@ async def fetch_papers_batch(sch, paper_ids_batch, fields, return_not_found=Fals
         return_not_found=return_not_found
     )
 
-async def fetch_all_papers_async(paper_ids, fields=None, concurrency=5, chunk_size=500, return_not_found=False):
+async def fetch_all_papers_async(paper_ids, fields=None, concurrency=5, chunk_size=500,
+                                 return_not_found=False, cache=None, sch=None,
+                                 on_batch=None, lost_ids=None, record_factory=S2Paper):
     """
     We will NOT ask for "references" in the fields,
     because we want to keep the references from the CSV only.
+
+    With a `cache`, IDs already on disk (including known not-found IDs)
+    are served from it and only the rest go to the API.
+    `on_batch(papers)` is called for every batch as soon as it arrives.
+    Pass a shared `sch` session to reuse its connection pool, and a
+    `lost_ids` list to collect unfetchable IDs instead of reporting them.
+    Each raw API object is turned into `record_factory(raw)`
+    (e.g. PaperRecord.from_raw) as soon as its batch arrives.
+    By default only the fields output_schema says the writers need are
+    requested.
     """
     if fields is None:
-        fields = [
-            "title",
-            "abstract",
-            "year",
-            "venue",
-            "authors",
-            "citationCount",
-            "publicationTypes",
-            "externalIds",
-            "fieldsOfStudy",
-            "journal",
-            "url",
-        ]
-
-    sch = AsyncSemanticScholar()
+        fields = paper_fields()
+
+    sch = sch or AsyncSemanticScholar()
 
     all_papers = []
     not_found_ids = []
 
-    sem = asyncio.Semaphore(concurrency)
-
-    async def worker(batch):
-        async with sem:
-            return await fetch_papers_batch(sch, batch, fields, return_not_found=return_not_found)
-
-    tasks = []
-    for i in range(0, len(paper_ids), chunk_size):
-        chunk = paper_ids[i : i + chunk_size]
-        task = asyncio.create_task(worker(chunk))
-        tasks.append(task)
-
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    if cache is not None:
+        found, paper_ids = cache.get_many("paper/batch", paper_ids, fields)
+        for pid, data in found.items():
+            if data is None:
+                not_found_ids.append(pid)
+            else:
+                all_papers.append(record_factory(data))
+        if on_batch is not None and all_papers:
+            on_batch(all_papers)
+
+    async def fetch_batch(batch):
+        started = time.monotonic()
+        papers_list, nf_list = await fetch_papers_batch(sch, batch, fields, return_not_found=True)
+        if cache is not None:
+            cache.record_fetch("paper/batch", time.monotonic() - started, len(batch))
+            cache.put_many(
+                "paper/batch",
+                [(p.paperId, p.raw_data) for p in papers_list] + [(nf, None) for nf in nf_list],
+                fields
+            )
+        if record_factory is not S2Paper:
+            papers_list = [record_factory(p.raw_data) for p in papers_list]
+        if on_batch is not None:
+            on_batch(papers_list)
+        return papers_list, nf_list
+
+    papers_list, nf_list, lost = await fetch_resilient(
+        paper_ids, fetch_batch,
+        concurrency=concurrency,
+        chunk_size=chunk_size,
+        max_chunk_size=500,
+        label="Paper Batch"
+    )
+    all_papers.extend(papers_list)
+    not_found_ids.extend(nf_list)
+    if lost_ids is not None:
+        lost_ids.extend(lost)
+    else:
+        report_lost_ids(lost, "Paper Batch", "lost_paper_ids.txt")
 
     if return_not_found:
-        for res in results:
-            if isinstance(res, Exception):
-                print("[Paper Batch Error]", res)
-                continue
-            papers_list, nf_list = res
-            all_papers.extend(papers_list)
-            not_found_ids.extend(nf_list)
         return all_papers, not_found_ids
-    else:
-        for res in results:
-            if isinstance(res, Exception):
-                print("[Paper Batch Error]", res)
-                continue
-            all_papers.extend(res)
-        return all_papers
+    return all_papers
 
 
 # -------------------------------------------
@@ -134,133 +179,187 @@ async def fetch_authors_batch(sch, author_ids_batch, fields, return_not_found=Fa
         return_not_found=return_not_found
     )
 
-async def fetch_all_authors_async(author_ids, fields=None, concurrency=10, chunk_size=100, return_not_found=False):
+async def fetch_all_authors_async(author_ids, fields=None, concurrency=10, chunk_size=100,
+                                  return_not_found=False, cache=None, sch=None, lost_ids=None,
+                                  batch_stats=None):
     if fields is None:
-        fields = [
-            "name",
-            "affiliations",
-            "homepage",
-            "paperCount",
-            "citationCount",
-            "hIndex",
-            "papers"
-        ]
-
-    sch = AsyncSemanticScholar()
+        fields = author_fields()
+
+    sch = sch or AsyncSemanticScholar()
     all_authors = []
     not_found_ids = []
 
-    sem = asyncio.Semaphore(concurrency)
-
-    async def worker(batch):
-        async with sem:
-            return await fetch_authors_batch(sch, batch, fields, return_not_found=return_not_found)
-
-    tasks = []
-    for i in range(0, len(author_ids), chunk_size):
-        chunk = author_ids[i : i + chunk_size]
-        task = asyncio.create_task(worker(chunk))
-        tasks.append(task)
-
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    if cache is not None:
+        found, author_ids = cache.get_many("author/batch", author_ids, fields)
+        for aid, data in found.items():
+            if data is None:
+                not_found_ids.append(aid)
+            else:
+                all_authors.append(S2Author(data))
+
+    async def fetch_batch(batch):
+        started = time.monotonic()
+        authors_list, nf_list = await fetch_authors_batch(sch, batch, fields, return_not_found=True)
+        if cache is not None:
+            cache.record_fetch("author/batch", time.monotonic() - started, len(batch))
+            cache.put_many(
+                "author/batch",
+                [(a.authorId, a.raw_data) for a in authors_list] + [(nf, None) for nf in nf_list],
+                fields
+            )
+        return authors_list, nf_list
+
+    authors_list, nf_list, lost = await fetch_resilient(
+        author_ids, fetch_batch,
+        concurrency=concurrency,
+        chunk_size=chunk_size,
+        max_chunk_size=1000,
+        label="Author Batch",
+        stats=batch_stats
+    )
+    all_authors.extend(authors_list)
+    not_found_ids.extend(nf_list)
+    if lost_ids is not None:
+        lost_ids.extend(lost)
+    else:
+        report_lost_ids(lost, "Author Batch", "lost_author_ids.txt")
 
     if return_not_found:
-        for res in results:
-            if isinstance(res, Exception):
-                print("[Author Batch Error]", res)
-                continue
-            authors_list, nf_list = res
-            all_authors.extend(authors_list)
-            not_found_ids.extend(nf_list)
         return all_authors, not_found_ids
-    else:
-        for res in results:
-            if isinstance(res, Exception):
-                print("[Author Batch Error]", res)
-                continue
-            all_authors.extend(res)
-        return all_authors
+    return all_authors
+
+
+# -------------------------------------------
+# PIPELINED PAPER -> AUTHOR FETCH
+# -------------------------------------------
+async def fetch_papers_and_authors_pipelined(
+    paper_ids,
+    paper_fields=None,
+    author_fields=None,
+    paper_concurrency=10,
+    author_concurrency=10,
+    paper_chunk_size=500,
+    author_chunk_size=100,
+    cache=None
+):
+    """
+    Fetches papers and, concurrently, the authors of every paper batch as
+    soon as that batch arrives. Author IDs go through a queue and are
+    fetched in groups of `author_chunk_size`, so total time is close to
+    max(paper fetch, author fetch) instead of their sum. Both stages share
+    one pooled HTTP session.
+
+    Papers come back as PaperRecord objects.
+    Returns (papers, not_found_papers, authors, not_found_authors).
+    """
+    sch = open_session(max_connections=paper_concurrency + author_concurrency)
+    queue = asyncio.Queue()
+    seen_authors = set()
+    lost_papers, lost_authors = [], []
+    authors, not_found_authors = [], []
+    author_slots = asyncio.Semaphore(author_concurrency)
+    # One summary line for all author groups instead of one per group
+    author_stats = BatchStats()
+
+    def on_paper_batch(papers):
+        for p in papers:
+            for aid in p.authorIds:
+                if aid not in seen_authors:
+                    seen_authors.add(aid)
+                    queue.put_nowait(aid)
+
+    async def fetch_author_group(group):
+        async with author_slots:
+            found, nf = await fetch_all_authors_async(
+                group,
+                fields=author_fields,
+                concurrency=1,
+                chunk_size=len(group),
+                return_not_found=True,
+                cache=cache,
+                sch=sch,
+                lost_ids=lost_authors,
+                batch_stats=author_stats
+            )
+        authors.extend(found)
+        not_found_authors.extend(nf)
+
+    async def author_consumer():
+        groups = []
+        buffer = []
+        try:
+            while True:
+                aid = await queue.get()
+                if aid is None:
+                    break
+                buffer.append(aid)
+                if len(buffer) >= author_chunk_size:
+                    groups.append(asyncio.create_task(fetch_author_group(buffer)))
+                    buffer = []
+            if buffer:
+                groups.append(asyncio.create_task(fetch_author_group(buffer)))
+            await asyncio.gather(*groups)
+        finally:
+            # Cancelled (the paper fetch failed): stop the groups in flight too
+            for group in groups:
+                group.cancel()
+            await asyncio.gather(*groups, return_exceptions=True)
+
+    consumer = asyncio.create_task(author_consumer())
+    try:
+        papers, not_found_papers = await fetch_all_papers_async(
+            paper_ids,
+            fields=paper_fields,
+            concurrency=paper_concurrency,
+            chunk_size=paper_chunk_size,
+            return_not_found=True,
+            cache=cache,
+            sch=sch,
+            on_batch=on_paper_batch,
+            lost_ids=lost_papers,
+            record_factory=PaperRecord.from_raw
+        )
+        queue.put_nowait(None)
+        await consumer
+    finally:
+        # Never leave the consumer waiting for a sentinel on a closed session
+        if not consumer.done():
+            consumer.cancel()
+            await asyncio.gather(consumer, return_exceptions=True)
+        await close_session(sch)
+
+    author_stats.report("Author Batch")
+    report_lost_ids(lost_papers, "Paper Batch", "lost_paper_ids.txt")
+    report_lost_ids(lost_authors, "Author Batch", "lost_author_ids.txt")
+    return papers, not_found_papers, authors, not_found_authors
 
 
 # -------------------------------------------
-# CSV WRITERS (modified to use _myKeywords)
+# CSV WRITERS (PaperRecord objects, combined keywords)
 # -------------------------------------------
 def save_papers_to_csv(papers, filename="papers.csv"):
-    fieldnames = [
-        "paperId",
-        "title",
-        "abstract",
-        "doi",
-        "url",
-        "citationCount",
-        "venue",
-        "venueType",
-        "year",
-        "fieldsOfStudy",
-        "pages",
-        "references",
-        "authors"
-    ]
+    fieldnames = list(PAPER_COLUMNS)
     with open(filename, "w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
 
         for p in papers:
-            pid = p.paperId
-            title = p.title
-            abstract = p.abstract
-            url = p.url
-            year = p.year
-            venue = p.venue
-            citation_count = getattr(p, "citationCount", 0)
-
-            # doi from externalIds
-            doi = ""
-            if getattr(p, "externalIds", None):
-                doi = p.externalIds.get("DOI") or p.externalIds.get("doi") or ""
-
-            # Use _myKeywords instead of p.fieldsOfStudy
-            fos = ""
-            if getattr(p, "_myKeywords", None):
-                fos = "; ".join(sorted(p._myKeywords))
-
-            # references
-            ref_str = ""
-            if getattr(p, "references", None):
-                ref_str = "; ".join(r.paperId for r in p.references if r.paperId)
-
-            # authors
-            authors_str = ""
-            if getattr(p, "authors", None):
-                authors_str = "; ".join(a.authorId or "" for a in p.authors if a.authorId)
-
-            # pages from p.journal if available
-            pages = ""
-            if getattr(p, "journal", None) and p.journal:
-                pages = getattr(p.journal, "pages", "") or ""
-
-            # venueType
-            venue_type = "Unknown"
-            if getattr(p, "publicationTypes", None):
-                if "JournalArticle" in p.publicationTypes:
-                    venue_type = "Journal"
-                elif "Conference" in p.publicationTypes:
-                    venue_type = "Conference"
-
             row = {
-                "paperId": pid,
-                "title": title,
-                "abstract": abstract,
-                "doi": doi,
-                "url": url,
-                "citationCount": citation_count,
-                "venue": venue,
-                "venueType": venue_type,
-                "year": year,
-                "fieldsOfStudy": fos,
-                "pages": pages,
-                "references": ref_str,
-                "authors": authors_str
+                "paperId": p.paperId,
+                "title": p.title,
+                "abstract": p.abstract,
+                "doi": p.doi,
+                "url": p.url,
+                "citationCount": p.citationCount,
+                "venue": p.venue,
+                "venueId": p.venueId,
+                "venueType": p.venueType,
+                "year": p.year,
+                # combined keywords instead of the raw fieldsOfStudy
+                "fieldsOfStudy": "; ".join(sorted(p.keywords)),
+                "pages": p.pages,
+                "references": "; ".join(p.references),
+                "authors": "; ".join(p.authorIds)
             }
             writer.writerow(row)
 
@@ -271,11 +370,7 @@ def save_authors_to_csv(authors, filename="authors.csv"):
     """
     Writes out only the columns: authorId, name, affiliations
     """
-    fieldnames = [
-        "authorId",
-        "name",
-        "affiliations",
-    ]
+    fieldnames = list(AUTHOR_COLUMNS)
 
     with open(filename, "w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
@@ -296,7 +391,7 @@ def save_authors_to_csv(authors, filename="authors.csv"):
 
 
 def save_venues_to_csv(venues, filename="venues.csv"):
-    fieldnames = ["venueType", "name", "volume", "pages"]
+    fieldnames = list(VENUE_COLUMNS)
     with open(filename, "w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
@@ -308,10 +403,10 @@ def save_venues_to_csv(venues, filename="venues.csv"):
 def save_paper_keywords_csv(papers, filename="paper_keywords.csv"):
     """
     Writes out each paper's final combined keywords 
-    from _myKeywords (rather than fieldsOfStudy).
+    from p.keywords (rather than fieldsOfStudy).
     """
     import csv
-    fieldnames = ["paperId", "keyword"]
+    fieldnames = list(PAPER_KEYWORD_COLUMNS)
     count = 0
 
     with open(filename, "w", newline="", encoding="utf-8") as f:
@@ -320,8 +415,8 @@ def save_paper_keywords_csv(papers, filename="paper_keywords.csv"):
 
         for p in papers:
             pid = p.paperId
-            if getattr(p, "_myKeywords", None):
-                for kw in p._myKeywords:
+            if p.keywords:
+                for kw in p.keywords:
                     row = {
                         "paperId": pid,
                         "keyword": kw
@@ -332,6 +427,44 @@ def save_paper_keywords_csv(papers, filename="paper_keywords.csv"):
     print(f"[save_paper_keywords_csv] Wrote {count} (paperId, keyword) pairs to {filename}")
 
 
+# -------------------------------------------
+# INCREMENTAL MODE
+# -------------------------------------------
+def paper_content_hash(p):
+    """Hash of the fetched fields of a PaperRecord (not the derived ones)."""
+    return content_hash([
+        getattr(p, slot) for slot in PaperRecord.__slots__
+        if slot not in ("references", "keywords", "venueId")
+    ])
+
+
+def record_in_manifest(manifest, papers, authors, refreshed_papers, refreshed_authors,
+                       paper_ids, references_map, old_keywords_map):
+    """
+    Stores the content hash of every paper, author and input row.
+    Returns True if anything is new, changed or gone since the manifest
+    was last saved, i.e. the outputs have to be rewritten. The caller
+    saves the manifest once the outputs are written.
+    """
+    for p in papers:
+        manifest.record("papers", p.paperId, paper_content_hash(p),
+                        fetched=p.paperId in refreshed_papers)
+    for a in authors:
+        manifest.record("authors", a.authorId, content_hash([a.name, a.affiliations]),
+                        fetched=a.authorId in refreshed_authors)
+    for pid in paper_ids:
+        manifest.record("inputs", pid, content_hash([references_map.get(pid), old_keywords_map.get(pid)]))
+    manifest.retain("papers", [p.paperId for p in papers])
+    manifest.retain("authors", [a.authorId for a in authors])
+    manifest.retain("inputs", paper_ids)
+
+    print(f"[manifest] {manifest.changed} new, changed or removed entries")
+
+    extension = "parquet" if OUTPUT_FORMAT == "parquet" else "csv"
+    outputs = ["papers", "authors", "venues", "paper_keywords"]
+    return manifest.changed > 0 or not all(os.path.exists(f"{name}.{extension}") for name in outputs)
+
+
 # -------------------------------------------
 # MAIN
 # -------------------------------------------
@@ -339,13 +472,15 @@ async def main():
     """
     1) Load paper IDs + references from step1_papers.csv
        + also load any old CSV keyword for each paper.
-    2) Fetch everything but references from the S2 API
+    2) Fetch everything but references from the S2 API, and fetch the
+       authors of each paper batch as it arrives (pipelined)
     3) Overwrite the paper's references with those from step1
-    4) Create combined keywords for each paper (old CSV + S2 fieldsOfStudy + title-based)
+    4) Create combined keywords for each paper (old CSV + S2 fieldsOfStudy
+       + known keywords in the title/abstract)
     5) Inherit the parent's keywords into each of its reference papers
-    6) Extract author info & venue info
-    7) Fetch authors in parallel
-    8) Write out final CSVs
+       (KEYWORD_PROPAGATION_DEPTH hops)
+    6) Extract venue info
+    7) Write out final CSVs
     """
 
     input_csv = "papers_combined.csv"
@@ -357,32 +492,55 @@ async def main():
     )
     print(f"[main] Loaded {len(paper_ids)} paper IDs from {input_csv}.")
 
-    # 2) fetch from API
-    all_papers, not_found = await fetch_all_papers_async(
+    cache = open_cache() if USE_CACHE else None
+
+    manifest = None
+    refreshed_papers, refreshed_authors = set(), set()
+    if INCREMENTAL and cache is None:
+        print("[main] INCREMENTAL needs USE_CACHE = True, running a full extraction.")
+    elif INCREMENTAL:
+        manifest = FetchManifest()
+        max_age = MANIFEST_MAX_AGE_DAYS * 24 * 3600
+        new_ids, stale_ids, fresh_ids = manifest.plan("papers", paper_ids, max_age)
+        stale_authors = manifest.stale_ids("authors", max_age)
+        # Stale entries are dropped from the cache so they are refetched
+        cache.invalidate("paper/batch", stale_ids)
+        cache.invalidate("author/batch", stale_authors)
+        refreshed_papers.update(stale_ids)
+        refreshed_authors.update(stale_authors)
+        print(f"[manifest] Papers: {len(new_ids)} new, {len(stale_ids)} stale, "
+              f"{len(fresh_ids)} up to date. Authors: {len(stale_authors)} stale.")
+
+    # 2) fetch papers from API, authors follow each paper batch
+    all_papers, not_found, all_authors, not_found_authors = await fetch_papers_and_authors_pipelined(
         paper_ids=paper_ids,
-        fields=None,  
-        concurrency=10,
-        chunk_size=500,
-        return_not_found=True
+        paper_concurrency=10,
+        author_concurrency=10,
+        paper_chunk_size=500,
+        author_chunk_size=100,
+        cache=cache
     )
     print(f"[main] Fetched {len(all_papers)} papers. Not found: {len(not_found)}")
+    print(f"[main] Fetched {len(all_authors)} authors. Not found = {len(not_found_authors)}")
 
-    # 3) Rebuild with references from CSV
+    if manifest is not None and not record_in_manifest(
+        manifest, all_papers, all_authors, refreshed_papers, refreshed_authors,
+        paper_ids, references_map, old_keywords_map
+    ):
+        print("[main] Nothing changed since the last run, outputs left as they are.")
+        manifest.save()
+        cache.report()
+        cache.close()
+        return
+
+    # 3) Attach references from CSV
     paper_dict = {}
     for p in all_papers:
+        p.references = references_map.get(p.paperId, [])
         paper_dict[p.paperId] = p
 
-    for pid, old_paper in paper_dict.items():
-        old_refs = references_map.get(pid, [])
-        
-        data_copy = copy.deepcopy(old_paper.raw_data)
-        
-        data_copy["references"] = []
-        for rid in old_refs:
-            data_copy["references"].append({"paperId": rid})
-    
-        new_paper = S2Paper(data_copy)
-
+    tagger = KeywordTagger(TITLE_KEYWORDS)
+    for pid, paper in paper_dict.items():
         # 4) Create combined keywords
         combined_keywords = set()
 
@@ -392,99 +550,53 @@ async def main():
             combined_keywords.add(old_kw)
 
         # (b) S2 fieldsOfStudy
-        if getattr(new_paper, "fieldsOfStudy", None):
-            for fs in new_paper.fieldsOfStudy:
-                if fs:
-                    combined_keywords.add(fs)
-
-        # (c) Check paper title for known keywords
-        title_lower = (new_paper.title or "").lower()
-        for tk in TITLE_KEYWORDS:
-            if tk.lower() in title_lower:
-                combined_keywords.add(tk)
+        combined_keywords.update(paper.fieldsOfStudy)
 
-        # Store the final set in _myKeywords
-        setattr(new_paper, "_myKeywords", combined_keywords)
+        # (c) Known keywords in the title or abstract
+        combined_keywords.update(tagger.tag(paper.title, paper.abstract))
 
-        paper_dict[pid] = new_paper
+        paper.keywords = combined_keywords
 
     # We now have "final" papers, but before we finalize them,
     # 5) Inherit parent's keywords into each reference
-    #    (only a single pass for direct references)
-    for pid, paper_obj in paper_dict.items():
-        if getattr(paper_obj, "references", None):
-            for ref in paper_obj.references:
-                rid = ref.paperId
-                if rid in paper_dict:
-                    # union the parent's keywords into the reference
-                    paper_dict[rid]._myKeywords |= paper_obj._myKeywords
+    propagated = propagate_keywords(
+        {pid: p.keywords for pid, p in paper_dict.items()},
+        {pid: p.references for pid, p in paper_dict.items()},
+        depth=KEYWORD_PROPAGATION_DEPTH
+    )
+    for pid, keywords in propagated.items():
+        paper_dict[pid].keywords = keywords
 
     final_papers = list(paper_dict.values())
 
-    # 6) Extract author info & venue info
-    author_ids_set = set()
-    venues_set = set()
-
+    # 6) Extract venue info, one interned ID per canonical venue
+    venues = VenueRegistry()
     for p in final_papers:
-        if getattr(p, "authors", None):
-            for a in p.authors:
-                if a.authorId:
-                    author_ids_set.add(a.authorId)
-
-        venue_type = "Unknown"
-        if getattr(p, "publicationTypes", None):
-            pub_types = p.publicationTypes or []
-            if "JournalArticle" in pub_types:
-                venue_type = "Journal"
-            elif "Conference" in pub_types:
-                venue_type = "Conference"
-        
-        name = p.venue or ""
-        volume = ""
-        pages = ""
-        
-        if venue_type == "Journal":
-            # quick check to see if it actually looks like a conference
-            conf_words = ["conference", "workshop", "proceedings", "symposium"]
-            if any(cw in name.lower() for cw in conf_words):
-                venue_type = "Conference"
-        
-        if venue_type == "Journal":
-            if getattr(p, "journal", None) and p.journal:
-                if getattr(p.journal, "name", None):
-                    name = p.journal.name
-                volume = getattr(p.journal, "volume", "") or ""
-                pages = getattr(p.journal, "pages", "") or ""
-        
-        if name:
-            vdict = {
-                "venueType": venue_type,
-                "name": name,
-                "volume": volume,
-                "pages": pages
-            }
-            venues_set.add(tuple(vdict.items()))
-
-
-    unique_venues = [dict(t) for t in venues_set]
-    print(f"[main] Found {len(author_ids_set)} unique authors, {len(unique_venues)} unique venues.")
-
-    # 7) Fetch authors in parallel
-    author_ids = list(author_ids_set)
-    all_authors, not_found_authors = await fetch_all_authors_async(
-        author_ids,
-        fields=None,
-        concurrency=10,
-        chunk_size=100,
-        return_not_found=True
-    )
-    print(f"[main] Fetched {len(all_authors)} authors. Not found = {len(not_found_authors)}")
+        p.venueId = venues.add_paper(p)
+
+    unique_venues = venues.rows()
+    print(f"[main] Found {len(unique_venues)} unique venues ({len(venues.names)} distinct names).")
+
+    if cache is not None:
+        cache.report()
+        cache.close()
+
+    # 7) Write final CSVs (or Parquet files)
+    if OUTPUT_FORMAT == "parquet":
+        from columnar_io import (papers_table, authors_table, venues_table,
+                                 paper_keywords_table, write_parquet)
+        write_parquet(papers_table(final_papers), "papers.parquet")
+        write_parquet(authors_table(all_authors), "authors.parquet")
+        write_parquet(venues_table(unique_venues), "venues.parquet")
+        write_parquet(paper_keywords_table(final_papers), "paper_keywords.parquet")
+    else:
+        save_papers_to_csv(final_papers, "papers.csv")
+        save_authors_to_csv(all_authors, "authors.csv")
+        save_venues_to_csv(unique_venues, "venues.csv")
+        save_paper_keywords_csv(final_papers, "paper_keywords.csv")
 
-    # 8) Write final CSVs
-    save_papers_to_csv(final_papers, "papers.csv")
-    save_authors_to_csv(all_authors, "authors.csv")
-    save_venues_to_csv(unique_venues, "venues.csv")
-    save_paper_keywords_csv(final_papers, "paper_keywords.csv")
+    if manifest is not None:
+        manifest.save()
 
     print("[main] Done.")
 
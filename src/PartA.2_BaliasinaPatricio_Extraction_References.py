@@ -1,156 +1,756 @@
 # paper_reference_gatherer.py
 
+import asyncio
 import csv
 import os
 import time
 import random
 from typing import List
 
+import httpx
 import pandas as pd
-from semanticscholar import SemanticScholar
+from semanticscholar import SemanticScholar, AsyncSemanticScholar
+from semanticscholar.SemanticScholarException import (
+    NoMorePagesException, InternalServerErrorException, GatewayTimeoutException
+)
+
+from rate_limit import TokenBucket, StageStats, retry_after_from_exception
+from s2_cache import MISSING, ResponseCache, open_cache
+from crawl_state import CrawlCheckpoint
+from frontier import BloomFilter, select_frontier
+
+# "sync" keeps the original one-by-one crawl,
+# "async" runs the concurrent, rate-limited crawler below,
+# "batch" (opt-in) harvests references through the /paper/batch endpoint.
+CRAWL_MODE = "async"
+
+# Async crawler settings (unauthenticated S2 allows roughly 1 req/s)
+CONCURRENCY = 8
+REQUESTS_PER_SECOND = 1.0
+MAX_RETRIES = 5
+
+# Batch harvest settings: /paper/batch takes up to 500 IDs per call and
+# returns at most REFERENCE_CAP nested references per paper.
+BATCH_SIZE = 500
+REFERENCE_CAP = 1000
+
+# Re-runs read Semantic Scholar responses from this SQLite file
+USE_CACHE = True
+
+ROW_FIELDS = ["paperId", "references", "keyword", "venueType"]
+
+# Levels of references crawled past the seed papers (1 = step 2 only).
+# More than one hop runs the batch-based BFS expansion, which crawls at
+# most PER_HOP_BUDGET papers per hop (None = unbounded), most cited first.
+EXPANSION_HOPS = 1
+PER_HOP_BUDGET = None
+BLOOM_CAPACITY = 10_000_000
 
 
 # ------------------------------------------------
 # STEP 1: Gather main papers (by keywords + venue)
 # ------------------------------------------------
 
+def fetch_references_sync(sch, pid, cache=None, tag="STEP1"):
+    """
+    Returns (references, from_cache). Failed lookups are not cached, so a
+    re-run retries them.
+    """
+    if cache is not None:
+        cached = cache.get("paper/references", pid, ["paperId"])
+        if cached is not MISSING:
+            return cached or [], True
+
+    references_list = []
+    try:
+        started = time.monotonic()
+        ref_result = sch.get_paper_references(paper_id=pid, fields=["paperId"])
+        if ref_result.items:
+            for ref_obj in ref_result.items:
+                if ref_obj.paper and ref_obj.paper.paperId:
+                    references_list.append(ref_obj.paper.paperId)
+        if cache is not None:
+            cache.record_fetch("paper/references", time.monotonic() - started, 1)
+            cache.put("paper/references", pid, ["paperId"], references_list)
+    except Exception as e:
+        print(f"    [{tag}] Error retrieving references for {pid}: {e}")
+    return references_list, False
+
+
+def group_hits(hits):
+    """[paperId, keyword, venueType] hits -> {paperId: [(keyword, venueType), ...]}"""
+    by_pid = {}
+    for pid, kw, pub_type in hits:
+        by_pid.setdefault(pid, []).append((kw, pub_type))
+    return by_pid
+
+
+def step1_rows(pid, references_list, group):
+    return [{
+        "paperId": pid,
+        "references": "; ".join(references_list),
+        "keyword": kw,
+        "venueType": pub_type
+    } for kw, pub_type in group]
+
+
 def run_step1_initial(
     keywords: List[str],
     limit: int = 20,
-    output_csv: str = "step1_papers.csv"
+    output_csv: str = "step1_papers.csv",
+    cache: ResponseCache = None
 ):
+    """
+    Rows are appended to `output_csv` as each paper completes; an
+    interrupted run picks up from the saved search hits and skips papers
+    already in the file. Returns the number of rows written.
+    """
     sch = SemanticScholar()
     publication_types = ["JournalArticle", "Conference"]
-    rows = []
-
-    for kw in keywords:
-        for pub_type in publication_types:
-            print(f"[STEP1] Searching for '{kw}' in {pub_type}, limit={limit}...")
-            results = sch.search_paper(
-                query=kw,
-                limit=limit,
-                publication_types=[pub_type],
-                fields=["paperId"]
-            )
-            print(f"  Found {results.total} total. We'll process {len(results.items)} items...")
-
-            for paper in results.items:
-                pid = paper.paperId
-                if not pid:
-                    continue
-                print(f"  -> Paper {pid}, retrieving ...")
-
-                references_list = []
-                try:
-                    ref_result = sch.get_paper_references(paper_id=pid)
-                    if ref_result.items:
-                        for ref_obj in ref_result.items:
-                            if ref_obj.paper and ref_obj.paper.paperId:
-                                references_list.append(ref_obj.paper.paperId)
-                except Exception as e:
-                    print(f"    [STEP1] Error retrieving references for {pid}: {e}")
-
-                row = {
-                    "paperId": pid,
-                    "references": "; ".join(references_list),
-                    "keyword": kw,
-                    "venueType": pub_type
-                }
-                rows.append(row)
 
+    with CrawlCheckpoint(output_csv, ROW_FIELDS) as ckpt:
+        hits = ckpt.load_frontier()
+        if hits is None:
+            hits = []
+            for kw in keywords:
+                for pub_type in publication_types:
+                    print(f"[STEP1] Searching for '{kw}' in {pub_type}, limit={limit}...")
+                    search_key = f"{kw}|{pub_type}|{limit}"
+                    paper_ids = cache.get("paper/search", search_key, ["paperId"]) if cache else MISSING
+                    if paper_ids is MISSING:
+                        results = sch.search_paper(
+                            query=kw,
+                            limit=limit,
+                            publication_types=[pub_type],
+                            fields=["paperId"]
+                        )
+                        print(f"  Found {results.total} total. We'll process {len(results.items)} items...")
+                        paper_ids = [paper.paperId for paper in results.items]
+                        if cache is not None:
+                            cache.put("paper/search", search_key, ["paperId"], paper_ids)
+                    hits.extend([pid, kw, pub_type] for pid in paper_ids or [] if pid)
+            ckpt.save_frontier(hits)
+
+        for pid, group in group_hits(hits).items():
+            if pid in ckpt.completed:
+                continue
+            print(f"  -> Paper {pid}, retrieving ...")
+
+            references_list, from_cache = fetch_references_sync(sch, pid, cache, "STEP1")
+            ckpt.write_rows(step1_rows(pid, references_list, group))
+
+            if not from_cache:
                 time.sleep(random.uniform(0.2, 0.8))
 
-    fieldnames = ["paperId", "references", "keyword", "venueType"]
-    with open(output_csv, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
+        ckpt.finish()
 
-    print(f"[STEP1] Wrote {len(rows)} rows to {os.path.abspath(output_csv)}")
-    return rows
+    print(f"[STEP1] Wrote {ckpt.rows_written} rows to {os.path.abspath(output_csv)}")
+    return ckpt.rows_written
 
 
 # --------------------------------------------
 # STEP 2: Gather second-level references
 # --------------------------------------------
 
+def read_reference_frontier(input_csv):
+    """Unique reference IDs of `input_csv`, in first-seen order."""
+    ref_ids = {}
+    total = 0
+    with open(input_csv, "r", newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            refs_str = row.get("references", "") or ""
+            for r in refs_str.split(";"):
+                r = r.strip()
+                if r:
+                    ref_ids[r] = None
+                    total += 1
+
+    print(f"[STEP2] Total references (with duplicates): {total}")
+    print(f"[STEP2] Found {len(ref_ids)} unique reference IDs from {input_csv}.")
+    return list(ref_ids)
+
+
+def step2_row(rid, references_list):
+    return {
+        "paperId": rid,
+        "references": "; ".join(references_list),
+        "keyword": "null",
+        "venueType": "null"
+    }
+
+
 def run_step2_expanded(
     input_csv: str = "step1_papers.csv",
-    output_csv: str = "step2_papers.csv"
+    output_csv: str = "step2_papers.csv",
+    cache: ResponseCache = None
 ):
     sch = SemanticScholar()
 
-    ref_ids = set()
-    ref_ids_list = []
+    with CrawlCheckpoint(output_csv, ROW_FIELDS) as ckpt:
+        frontier = ckpt.load_frontier()
+        if frontier is None:
+            frontier = read_reference_frontier(input_csv)
+            ckpt.save_frontier(frontier)
 
-    with open(input_csv, "r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            refs_str = row.get("references", "")
-            if refs_str.strip():
-                splitted = [x.strip() for x in refs_str.split(";") if x.strip()]
-                for r in splitted:
-                    ref_ids.add(r)
-                    ref_ids_list.append(r)
-
-    print(f"[STEP2] Total references (with duplicates): {len(ref_ids_list)}")
-    print(f"[STEP2] Found {len(ref_ids)} unique reference IDs from {input_csv}.")
+        for i, rid in enumerate(frontier, 1):
+            if rid in ckpt.completed:
+                continue
+            print(f"[{i}] -> Gathering references for {rid} ")
+            references_list, _ = fetch_references_sync(sch, rid, cache, "STEP2")
+            ckpt.write_rows([step2_row(rid, references_list)])
+
+            # Optional: Uncomment if rate-limiting needed
+            # time.sleep(random.uniform(0.2, 0.8))
+
+        ckpt.finish()
+
+    print(f"[STEP2] Wrote {ckpt.rows_written} rows to {os.path.abspath(output_csv)}")
+    return ckpt.rows_written
 
-    rows = []
-    for i, rid in enumerate(ref_ids, 1):
-        print(f"[{i}] -> Gathering references for {rid} ")
-        references_list = []
+
+# --------------------------------------------
+# ASYNC CRAWLER (bounded concurrency + shared rate limit)
+# --------------------------------------------
+
+# 500, 504, timeouts and dropped connections are worth another try
+TRANSIENT_ERRORS = (InternalServerErrorException, GatewayTimeoutException,
+                    httpx.TimeoutException, httpx.TransportError)
+
+
+async def call_with_rate_limit(coro_factory, bucket: TokenBucket, stats: StageStats):
+    """
+    Runs `coro_factory()` once a token is available. 429s put the whole
+    bucket on cooldown and are retried; server errors and timeouts are
+    retried after an exponential backoff of this request only. Either is
+    raised after MAX_RETRIES attempts, any other error right away.
+    """
+    for attempt in range(MAX_RETRIES):
+        await bucket.acquire()
+        stats.requests += 1
         try:
-            ref_result = sch.get_paper_references(paper_id=rid)
-            if ref_result.items:
-                for ref_obj in ref_result.items:
-                    if ref_obj.paper and ref_obj.paper.paperId:
-                        references_list.append(ref_obj.paper.paperId)
+            return await coro_factory()
+        except ConnectionRefusedError as e:
+            # The client maps HTTP 429 to ConnectionRefusedError
+            if attempt == MAX_RETRIES - 1:
+                raise ConnectionRefusedError(f"Still rate limited after {MAX_RETRIES} attempts") from e
+            wait = retry_after_from_exception(e, default=2 ** attempt)
+            print(f"  [{stats.name}] Rate limited, cooling down {wait:.1f}s")
+            bucket.penalize(wait)
+            stats.retries += 1
+        except TRANSIENT_ERRORS as e:
+            if attempt == MAX_RETRIES - 1:
+                raise
+            wait = 2 ** attempt + random.random()
+            print(f"  [{stats.name}] {type(e).__name__}, retrying in {wait:.1f}s")
+            stats.retries += 1
+            await asyncio.sleep(wait)
+
+
+async def fetch_references_async(sch, pid, bucket, stats, cache=None):
+    """
+    Reference IDs of `pid`, or None if the request failed. Failures are
+    neither cached nor written, so the ID stays pending like in batch mode.
+    """
+    references_list = []
+    try:
+        started = time.monotonic()
+        ref_result = await call_with_rate_limit(
+            lambda: sch.get_paper_references(paper_id=pid, fields=["paperId"]),
+            bucket, stats
+        )
+        for ref_obj in ref_result.items:
+            if ref_obj.paper and ref_obj.paper.paperId:
+                references_list.append(ref_obj.paper.paperId)
+        if cache is not None:
+            cache.record_fetch("paper/references", time.monotonic() - started, 1)
+            cache.put("paper/references", pid, ["paperId"], references_list)
+    except Exception as e:
+        stats.errors += 1
+        print(f"    [{stats.name}] Error retrieving references for {pid}: {e}")
+        return None
+    stats.items += 1
+    return references_list
+
+
+async def gather_references_async(paper_ids, sch, bucket, stats, on_result,
+                                  concurrency=CONCURRENCY, cache=None):
+    """
+    Fetches the reference lists for all `paper_ids` with at most
+    `concurrency` requests in flight. `on_result(paperId, refIds)` is
+    called as soon as each paper is done, so results are never all held
+    in memory at once. Papers whose request failed get no call and are
+    left for a re-run.
+    """
+    if cache is not None:
+        found, paper_ids = cache.get_many("paper/references", paper_ids, ["paperId"])
+        for pid, refs in found.items():
+            on_result(pid, refs)
+
+    sem = asyncio.Semaphore(concurrency)
+
+    async def worker(pid):
+        async with sem:
+            refs = await fetch_references_async(sch, pid, bucket, stats, cache)
+        if refs is not None:
+            on_result(pid, refs)
+
+    await asyncio.gather(*(worker(pid) for pid in paper_ids))
+
+
+# --------------------------------------------
+# BATCH HARVEST (references.paperId via /paper/batch)
+# --------------------------------------------
+
+BATCH_REFERENCE_FIELDS = ["referenceCount", "references.paperId"]
+
+
+async def fetch_all_references_paginated(sch, pid, bucket, stats, cache=None):
+    """
+    Walks every page of /paper/{id}/references. Only used for papers whose
+    nested reference list came back truncated from the batch endpoint.
+    Returns [[refId, citationCount], ...].
+    """
+    fields = ["paperId", "citationCount"]
+    if cache is not None:
+        cached = cache.get("paper/references/all", pid, fields)
+        if cached is not MISSING:
+            return cached or []
+
+    references_list = []
+    try:
+        ref_result = await call_with_rate_limit(
+            lambda: sch.get_paper_references(paper_id=pid, fields=fields, limit=1000),
+            bucket, stats
+        )
+        while ref_result.next:
+            try:
+                await call_with_rate_limit(ref_result.async_next_page, bucket, stats)
+            except NoMorePagesException:
+                break
+        for ref_obj in ref_result.items:
+            if ref_obj.paper and ref_obj.paper.paperId:
+                references_list.append([ref_obj.paper.paperId, ref_obj.paper.citationCount])
+        if cache is not None:
+            cache.put("paper/references/all", pid, fields, references_list)
+    except Exception as e:
+        stats.errors += 1
+        print(f"    [{stats.name}] Error paginating references for {pid}: {e}")
+    return references_list
+
+
+async def harvest_references_batch(paper_ids, sch, bucket, stats, on_result,
+                                   chunk_size=BATCH_SIZE, concurrency=CONCURRENCY, cache=None,
+                                   citation_counts=None):
+    """
+    Pulls `references.paperId` for whole chunks of IDs in one request each
+    and reports every paper through `on_result(paperId, refIds)`.
+    Papers whose referenceCount exceeds what the batch call returned (the
+    list hit REFERENCE_CAP) fall back to paginated per-paper calls. IDs the
+    API does not know are reported with no references; IDs of a failed
+    batch are not reported, so a resumed crawl retries them.
+
+    If `citation_counts` is a dict, it is filled with refId -> citationCount
+    for every reference seen (used to prioritise the next hop).
+    """
+    sem = asyncio.Semaphore(concurrency)
+    truncated = []
+    fields = BATCH_REFERENCE_FIELDS
+    if citation_counts is not None:
+        fields = BATCH_REFERENCE_FIELDS + ["references.citationCount"]
+
+    def absorb(pid, raw):
+        if raw is None:
+            on_result(pid, [])
+            return
+        refs = raw.get("references") or []
+        ref_count = raw.get("referenceCount") or 0
+        if len(refs) >= REFERENCE_CAP and ref_count > len(refs):
+            truncated.append(pid)
+            return
+        ref_ids = []
+        for r in refs:
+            rid = r.get("paperId")
+            if rid:
+                ref_ids.append(rid)
+                if citation_counts is not None:
+                    citation_counts[rid] = r.get("citationCount")
+        on_result(pid, ref_ids)
+
+    if cache is not None:
+        found, paper_ids = cache.get_many("paper/batch", paper_ids, fields)
+        for pid, raw in found.items():
+            absorb(pid, raw)
+
+    async def fetch_chunk(chunk):
+        async with sem:
+            try:
+                started = time.monotonic()
+                papers, not_found = await call_with_rate_limit(
+                    lambda: sch.get_papers(
+                        paper_ids=chunk,
+                        fields=fields,
+                        return_not_found=True
+                    ),
+                    bucket, stats
+                )
+            except Exception as e:
+                stats.errors += 1
+                print(f"  [{stats.name}] Batch of {len(chunk)} failed: {e}")
+                return
+        stats.items += len(papers)
+        if cache is not None:
+            cache.record_fetch("paper/batch", time.monotonic() - started, len(chunk))
+            cache.put_many(
+                "paper/batch",
+                [(p.paperId, p.raw_data) for p in papers] + [(nf, None) for nf in not_found],
+                fields
+            )
+        for p in papers:
+            absorb(p.paperId, p.raw_data)
+        for nf in not_found:
+            absorb(nf, None)
+
+    await asyncio.gather(*(
+        fetch_chunk(paper_ids[i:i + chunk_size])
+        for i in range(0, len(paper_ids), chunk_size)
+    ))
+
+    if truncated:
+        print(f"  [{stats.name}] {len(truncated)} truncated reference lists, paginating...")
+
+        async def paginate(pid):
+            async with sem:
+                pairs = await fetch_all_references_paginated(sch, pid, bucket, stats, cache)
+            if citation_counts is not None:
+                citation_counts.update(pairs)
+            on_result(pid, [rid for rid, _ in pairs])
+
+        await asyncio.gather(*(paginate(pid) for pid in truncated))
+
+
+def finish_or_keep(ckpt, pending, tag):
+    """Keeps the checkpoint if failed batches left IDs without a row."""
+    missing = sum(1 for pid in pending if pid not in ckpt.completed)
+    if missing:
+        print(f"[{tag}] {missing} IDs still pending, re-run to resume from the checkpoint")
+    else:
+        ckpt.finish()
+
+
+async def run_step1_initial_async(
+    keywords: List[str],
+    limit: int = 20,
+    output_csv: str = "step1_papers.csv",
+    bucket: TokenBucket = None,
+    use_batch: bool = False,
+    cache: ResponseCache = None
+):
+    sch = AsyncSemanticScholar(retry=False)
+    bucket = bucket or TokenBucket(rate=REQUESTS_PER_SECOND)
+    search_stats = StageStats("STEP1 search")
+    ref_stats = StageStats("STEP1 references")
+    publication_types = ["JournalArticle", "Conference"]
+
+    async def search(kw, pub_type):
+        search_key = f"{kw}|{pub_type}|{limit}"
+        if cache is not None:
+            cached_ids = cache.get("paper/search", search_key, ["paperId"])
+            if cached_ids is not MISSING:
+                return [[pid, kw, pub_type] for pid in cached_ids or [] if pid]
+        try:
+            results = await call_with_rate_limit(
+                lambda: sch.search_paper(
+                    query=kw,
+                    limit=limit,
+                    publication_types=[pub_type],
+                    fields=["paperId"]
+                ),
+                bucket, search_stats
+            )
         except Exception as e:
-            print(f"[STEP2] Error retrieving references for {rid}: {e}")
+            search_stats.errors += 1
+            print(f"[STEP1] Search failed for '{kw}' in {pub_type}: {e}")
+            return []
+        search_stats.items += len(results.items)
+        print(f"[STEP1] '{kw}' in {pub_type}: {results.total} total, processing {len(results.items)}")
+        if cache is not None:
+            cache.put("paper/search", search_key, ["paperId"], [p.paperId for p in results.items])
+        return [[p.paperId, kw, pub_type] for p in results.items if p.paperId]
 
-        row = {
-            "paperId": rid,
-            "references": "; ".join(references_list),
-            "keyword": "null",
-            "venueType": "null"
-        }
-        rows.append(row)
+    with CrawlCheckpoint(output_csv, ROW_FIELDS) as ckpt:
+        hits = ckpt.load_frontier()
+        if hits is None:
+            searches = await asyncio.gather(*(
+                search(kw, pub_type) for kw in keywords for pub_type in publication_types
+            ))
+            search_stats.stop()
+            search_stats.report()
+            hits = [hit for batch in searches for hit in batch]
+            ckpt.save_frontier(hits)
 
-        # Optional: Uncomment if rate-limiting needed
-        # time.sleep(random.uniform(0.2, 0.8))
+        by_pid = group_hits(hits)
+        pending = [pid for pid in by_pid if pid not in ckpt.completed]
 
-    fieldnames = ["paperId", "references", "keyword", "venueType"]
-    with open(output_csv, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
+        def on_result(pid, refs):
+            ckpt.write_rows(step1_rows(pid, refs, by_pid[pid]))
 
-    print(f"[STEP2] Wrote {len(rows)} rows to {os.path.abspath(output_csv)}")
-    return rows
+        if use_batch:
+            await harvest_references_batch(pending, sch, bucket, ref_stats, on_result, cache=cache)
+        else:
+            await gather_references_async(pending, sch, bucket, ref_stats, on_result, cache=cache)
+        ref_stats.stop()
+        ref_stats.report()
 
+        finish_or_keep(ckpt, pending, "STEP1")
 
-def main():
+    print(f"[STEP1] Wrote {ckpt.rows_written} rows to {os.path.abspath(output_csv)}")
+    return ckpt.rows_written
+
+
+async def run_step2_expanded_async(
+    input_csv: str = "step1_papers.csv",
+    output_csv: str = "step2_papers.csv",
+    bucket: TokenBucket = None,
+    use_batch: bool = False,
+    cache: ResponseCache = None
+):
+    sch = AsyncSemanticScholar(retry=False)
+    bucket = bucket or TokenBucket(rate=REQUESTS_PER_SECOND)
+    stats = StageStats("STEP2 references")
+
+    with CrawlCheckpoint(output_csv, ROW_FIELDS) as ckpt:
+        frontier = ckpt.load_frontier()
+        if frontier is None:
+            frontier = read_reference_frontier(input_csv)
+            ckpt.save_frontier(frontier)
+        pending = [rid for rid in frontier if rid not in ckpt.completed]
+
+        def on_result(rid, refs):
+            ckpt.write_rows([step2_row(rid, refs)])
+
+        if use_batch:
+            await harvest_references_batch(pending, sch, bucket, stats, on_result, cache=cache)
+        else:
+            await gather_references_async(pending, sch, bucket, stats, on_result, cache=cache)
+        stats.stop()
+        stats.report()
+
+        finish_or_keep(ckpt, pending, "STEP2")
+
+    print(f"[STEP2] Wrote {ckpt.rows_written} rows to {os.path.abspath(output_csv)}")
+    return ckpt.rows_written
+
+
+# --------------------------------------------
+# MULTI-HOP EXPANSION (BFS over references)
+# --------------------------------------------
+
+async def fetch_citation_counts(paper_ids, sch, bucket, stats,
+                                chunk_size=BATCH_SIZE, concurrency=CONCURRENCY, cache=None):
+    """{paperId: citationCount} via /paper/batch, for ranking the first hop."""
+    counts = {}
+    if cache is not None:
+        found, paper_ids = cache.get_many("paper/batch", paper_ids, ["citationCount"])
+        for pid, raw in found.items():
+            counts[pid] = (raw or {}).get("citationCount")
+
+    sem = asyncio.Semaphore(concurrency)
+
+    async def fetch_chunk(chunk):
+        async with sem:
+            try:
+                papers, not_found = await call_with_rate_limit(
+                    lambda: sch.get_papers(paper_ids=chunk, fields=["citationCount"], return_not_found=True),
+                    bucket, stats
+                )
+            except Exception as e:
+                stats.errors += 1
+                print(f"  [{stats.name}] Citation-count batch of {len(chunk)} failed: {e}")
+                return
+        for p in papers:
+            counts[p.paperId] = p.raw_data.get("citationCount")
+        if cache is not None:
+            cache.put_many(
+                "paper/batch",
+                [(p.paperId, p.raw_data) for p in papers] + [(nf, None) for nf in not_found],
+                ["citationCount"]
+            )
+
+    await asyncio.gather(*(
+        fetch_chunk(paper_ids[i:i + chunk_size])
+        for i in range(0, len(paper_ids), chunk_size)
+    ))
+    return counts
+
+
+def read_seed_ids(input_csv):
+    with open(input_csv, "r", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            pid = (row.get("paperId") or "").strip()
+            if pid:
+                yield pid
+
+
+def read_hop_candidates(output_csv, frontier, is_new):
+    """
+    References of the `frontier` papers already written to `output_csv`
+    that pass `is_new`, in first-seen order. Read back from the output so
+    that papers crawled before a restart contribute to the next hop.
+    """
+    frontier = set(frontier)
+    candidates = {}
+    with open(output_csv, "r", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if row["paperId"] not in frontier:
+                continue
+            for rid in (row.get("references") or "").split(";"):
+                rid = rid.strip()
+                if rid and rid not in candidates and is_new(rid):
+                    candidates[rid] = None
+    return candidates
+
+
+async def rank_candidates(candidates, per_hop_budget, sch, bucket, cache, tag, counts=None):
+    """Fills in citation counts (from `counts`, else /paper/batch) when the budget has to cut."""
+    if per_hop_budget is None or len(candidates) <= per_hop_budget:
+        return candidates
+    counts = counts or {}
+    unknown = [rid for rid in candidates if rid not in counts]
+    if unknown:
+        count_stats = StageStats(f"{tag} ranking")
+        counts = {**counts, **await fetch_citation_counts(unknown, sch, bucket, count_stats, cache=cache)}
+        count_stats.stop()
+        count_stats.report()
+    for rid in candidates:
+        candidates[rid] = counts.get(rid)
+    return candidates
+
+
+async def run_multihop_expansion(
+    input_csv: str = "step1_papers.csv",
+    output_csv: str = "step2_papers.csv",
+    hops: int = 2,
+    per_hop_budget: int = None,
+    bucket: TokenBucket = None,
+    cache: ResponseCache = None
+):
+    """
+    Breadth-first expansion over the citation graph, `hops` levels past
+    the seed papers in `input_csv` (hop 1 is what step 2 crawls). Each
+    hop crawls at most `per_hop_budget` new papers, highest citation
+    count first. Seen and completed IDs are Bloom filters instead of sets
+    of ID strings: `seen` (seeds and every frontier so far) only filters
+    candidates, and an ID counts as completed once its row is written.
+    A hop with failed papers keeps the checkpoint and stops; a re-run
+    retries them and resumes from that hop.
+    """
+    sch = AsyncSemanticScholar(retry=False)
+    bucket = bucket or TokenBucket(rate=REQUESTS_PER_SECOND)
+    seen = BloomFilter(capacity=BLOOM_CAPACITY)
+    completed = BloomFilter(capacity=BLOOM_CAPACITY)
+
+    with CrawlCheckpoint(output_csv, ROW_FIELDS, completed=completed) as ckpt:
+        seen.update(read_seed_ids(input_csv))
+
+        def is_new(rid):
+            return rid not in seen and rid not in ckpt.completed
+
+        state = ckpt.load_state()
+        hop = state.get("hop", 1)
+        frontier = state.get("frontier")
+        if frontier is None:
+            candidates = {rid: None for rid in read_reference_frontier(input_csv) if is_new(rid)}
+            candidates = await rank_candidates(candidates, per_hop_budget, sch, bucket, cache, "HOP1")
+            frontier = select_frontier(candidates, per_hop_budget)
+            ckpt.save_frontier(frontier, hop=hop)
+
+        while True:
+            stats = StageStats(f"HOP{hop} references")
+            # Papers already in the output were done before a restart
+            pending = [pid for pid in frontier if pid not in ckpt.completed]
+            seen.update(frontier)
+            print(f"[HOP{hop}] Crawling {len(pending)} papers ({len(frontier)} in frontier)")
+
+            last_hop = hop >= hops
+            counts = None if last_hop else {}
+
+            def on_result(pid, refs):
+                ckpt.write_rows([step2_row(pid, refs)])
+
+            await harvest_references_batch(
+                pending, sch, bucket, stats, on_result, cache=cache, citation_counts=counts
+            )
+            stats.stop()
+            stats.report()
+
+            missing = sum(1 for pid in frontier if pid not in ckpt.completed)
+            if missing:
+                print(f"[HOP{hop}] {missing} IDs still pending, re-run to resume from the checkpoint")
+                break
+            if last_hop:
+                ckpt.finish()
+                break
+
+            candidates = read_hop_candidates(output_csv, frontier, is_new)
+            candidates = await rank_candidates(
+                candidates, per_hop_budget, sch, bucket, cache, f"HOP{hop + 1}", counts=counts
+            )
+            frontier = select_frontier(candidates, per_hop_budget)
+            del candidates, counts
+            hop += 1
+            ckpt.save_frontier(frontier, hop=hop)
+
+    print(f"[HOPS] Wrote {ckpt.rows_written} rows ({len(seen)} IDs seen, "
+          f"{(seen.nbytes + completed.nbytes) / 1e6:.1f} MB filters) to {os.path.abspath(output_csv)}")
+    return ckpt.rows_written
+
+
+async def run_async_crawl(keywords, limit, step1_csv, step2_csv, use_batch=False, cache=None):
+    # One bucket for both steps so step 2 cannot burst past the limit
+    bucket = TokenBucket(rate=REQUESTS_PER_SECOND)
+    await run_step1_initial_async(
+        keywords, limit=limit, output_csv=step1_csv, bucket=bucket,
+        use_batch=use_batch, cache=cache
+    )
+    if EXPANSION_HOPS > 1:
+        await run_multihop_expansion(
+            input_csv=step1_csv, output_csv=step2_csv, hops=EXPANSION_HOPS,
+            per_hop_budget=PER_HOP_BUDGET, bucket=bucket, cache=cache
+        )
+    else:
+        await run_step2_expanded_async(
+            input_csv=step1_csv, output_csv=step2_csv, bucket=bucket,
+            use_batch=use_batch, cache=cache
+        )
+
+
+SEED_KEYWORDS = [
+    'data management', 'indexing', 'data modeling', 'big data',
+    'data processing', 'data storage', 'data querying',
+    'artificial intelligence', 'machine learning', 'ethics',
+    'semantic data', 'data warehouse', 'process mining', 'decision support'
+]
+
+
+def run_sync_crawl(cache=None):
     # Step 1
     step1_rows = run_step1_initial(
-        keywords=[
-            'data management', 'indexing', 'data modeling', 'big data',
-            'data processing', 'data storage', 'data querying',
-            'artificial intelligence', 'machine learning', 'ethics',
-            'semantic data', 'data warehouse', 'process mining', 'decision support'
-        ],
+        keywords=SEED_KEYWORDS,
         limit=20,
-        output_csv="step1_papers.csv"
+        output_csv="step1_papers.csv",
+        cache=cache
     )
 
     # Step 2
     step2_rows = run_step2_expanded(
         input_csv="step1_papers.csv",
-        output_csv="step2_papers.csv"
+        output_csv="step2_papers.csv",
+        cache=cache
     )
 
+
+def combine_steps():
     # Combine both into one CSV
     df1 = pd.read_csv("step1_papers.csv")
     df1 = df1[df1["references"].notna() & ~df1["references"].str.strip().eq("")]
@@ -161,5 +761,27 @@ def main():
     print("[FINAL] Combined data saved to papers_combined.csv")
 
 
+def main():
+    cache = open_cache() if USE_CACHE else None
+
+    if CRAWL_MODE in ("async", "batch") or EXPANSION_HOPS > 1:
+        asyncio.run(run_async_crawl(
+            keywords=SEED_KEYWORDS,
+            limit=20,
+            step1_csv="step1_papers.csv",
+            step2_csv="step2_papers.csv",
+            use_batch=(CRAWL_MODE == "batch"),
+            cache=cache
+        ))
+    else:
+        run_sync_crawl(cache=cache)
+
+    if cache is not None:
+        cache.report()
+        cache.close()
+
+    combine_steps()
+
+
 if __name__ == "__main__":
     main()
@@ -1,6 +1,8 @@
 from neo4j import GraphDatabase
 import os
 
+from neo4j_schema import ensure_schema, verify_schema
+
 # Neo4j connection params
 uri = "bolt://localhost:7687"  
 username = "neo4j"  
@@ -13,6 +15,7 @@ def load_csv_data(driver):
         LOAD CSV WITH HEADERS FROM 'file:///author_nodes.csv' AS row
         CREATE (:Author {
             authorId: row.authorId, 
+            authorKey: toInteger(row.authorKey),
             name: row.name, 
             email: row.email
         })
@@ -23,6 +26,7 @@ def load_csv_data(driver):
         LOAD CSV WITH HEADERS FROM 'file:///paper_nodes.csv' AS row
         CREATE (:Paper {
             paperId: row.paperId, 
+            paperKey: toInteger(row.paperKey),
             title: row.title, 
             abstract: row.abstract, 
             pages: toInteger(row.pages), 
@@ -73,23 +77,23 @@ def load_csv_data(driver):
         # Author WRITES Paper Relationships
         """
         LOAD CSV WITH HEADERS FROM 'file:///author_writes_paper.csv' AS row
-        MATCH (a:Author {authorId: row.authorId})
-        MATCH (p:Paper {paperId: row.paperId})
+        MATCH (a:Author {authorKey: toInteger(row.authorKey)})
+        MATCH (p:Paper {paperKey: toInteger(row.paperKey)})
         CREATE (a)-[:WRITES {corresponding_author: row.corresponding_author}]->(p)
         """,
         
         # Author REVIEWS Paper Relationships
         """
         LOAD CSV WITH HEADERS FROM 'file:///author_reviews_paper.csv' AS row
-        MATCH (a:Author {authorId: row.authorId})
-        MATCH (p:Paper {paperId: row.paperId})
+        MATCH (a:Author {authorKey: toInteger(row.authorKey)})
+        MATCH (p:Paper {paperKey: toInteger(row.paperKey)})
         CREATE (a)-[:REVIEWS]->(p)
         """,
         
         # Paper PUBLISHED_IN Journal Relationships
         """
         LOAD CSV WITH HEADERS FROM 'file:///paper_published_in.csv' AS row
-        MATCH (p:Paper {paperId: row.paperId})
+        MATCH (p:Paper {paperKey: toInteger(row.paperKey)})
         MATCH (j:Journal {journalName: row.journalName})
         CREATE (p)-[:PUBLISHED_IN {
             volume: row.volume, 
@@ -100,7 +104,7 @@ def load_csv_data(driver):
         # Paper HAS_KEYWORD Relationships
         """
         LOAD CSV WITH HEADERS FROM 'file:///paper_has_keyword.csv' AS row
-        MATCH (p:Paper {paperId: row.paperId})
+        MATCH (p:Paper {paperKey: toInteger(row.paperKey)})
         MATCH (k:Keyword {keyword: row.keyword})
         CREATE (p)-[:HAS_KEYWORD]->(k)
         """,
@@ -108,15 +112,15 @@ def load_csv_data(driver):
         # Paper CITES Paper Relationships
         """
         LOAD CSV WITH HEADERS FROM 'file:///paper_cites_paper.csv' AS row
-        MATCH (p1:Paper {paperId: row.sourcePaperId})
-        MATCH (p2:Paper {paperId: row.targetPaperId})
+        MATCH (p1:Paper {paperKey: toInteger(row.sourcePaperKey)})
+        MATCH (p2:Paper {paperKey: toInteger(row.targetPaperKey)})
         CREATE (p1)-[:CITES]->(p2)
         """,
         
         # Paper PRESENTED_IN Proceeding Relationships
         """
         LOAD CSV WITH HEADERS FROM 'file:///paper_presented_in.csv' AS row
-        MATCH (p:Paper {paperId: row.paperId})
+        MATCH (p:Paper {paperKey: toInteger(row.paperKey)})
         MATCH (pr:Proceeding {proceedingId: row.proceedingId})
         CREATE (p)-[:PRESENTED_IN]->(pr)
         """,
@@ -134,6 +138,11 @@ def load_csv_data(driver):
         print("Clearing existing data...")
         session.run("MATCH (n) DETACH DELETE n")
 
+    # Constraints before the loads, so every relationship MATCH is an index seek
+    print("Creating Constraints...")
+    ensure_schema(driver)
+
+    with driver.session() as session:
         print("Loading Nodes...")
         for query in node_load_queries:
             session.run(query)
@@ -142,24 +151,10 @@ def load_csv_data(driver):
         for query in relationship_load_queries:
             session.run(query)
 
-def create_indexes(driver):
-    index_queries = [
-        "CREATE INDEX author_id IF NOT EXISTS FOR (a:Author) ON (a.authorId)",
-        "CREATE INDEX paper_id IF NOT EXISTS FOR (p:Paper) ON (p.paperId)",
-        "CREATE INDEX journal_name IF NOT EXISTS FOR (j:Journal) ON (j.journalName)",
-        "CREATE INDEX keyword IF NOT EXISTS FOR (k:Keyword) ON (k.keyword)",
-        "CREATE INDEX conference_name IF NOT EXISTS FOR (c:Conference) ON (c.conferenceName)",
-        "CREATE INDEX proceeding_id IF NOT EXISTS FOR (p:Proceeding) ON (p.proceedingId)"
-    ]
-
-    print("\nCreating Indexes...")
-    with driver.session() as session:
-        for query in index_queries:
-            session.run(query)
-
-with GraphDatabase.driver(uri, auth=(username, password)) as driver:
-    try:
-        load_csv_data(driver)
-        create_indexes(driver)
-    except Exception as e:
-        print(f"An error occurred: {e}")
\ No newline at end of file
+if __name__ == "__main__":
+    with GraphDatabase.driver(uri, auth=(username, password)) as driver:
+        try:
+            load_csv_data(driver)
+            verify_schema(driver)
+        except Exception as e:
+            print(f"An error occurred: {e}")
\ No newline at end of file
@@ -3,6 +3,8 @@ import pandas as pd
 import random
 import os
 
+from neo4j_schema import ensure_schema
+
 # Neo4j connection params
 uri = "bolt://localhost:7687"  
 username = "neo4j"  
@@ -106,6 +108,9 @@ with GraphDatabase.driver(uri, auth=(username, password)) as driver:
         # Clean Up Affiliations
         session.run("MATCH p=()-[r:IS_FROM]->() DETACH DELETE r")
         session.run("MATCH (af:Affiliation) DETACH DELETE af")
+
+        # Affiliation/Author lookups below go through the uniqueness constraints
+        ensure_schema(driver)
         
         # Create Affiliation Nodes
         session.execute_write(create_affiliation_nodes, affiliation_names)
@@ -1,5 +1,7 @@
 from neo4j import GraphDatabase
 
+from neo4j_schema import ensure_schema
+
 uri = "bolt://localhost:7687"
 username = "neo4j"
 password = "password"
@@ -125,6 +127,8 @@ def run_step_4(tx):
 # ------------------------------
 if __name__ == "__main__":
     driver = GraphDatabase.driver(uri, auth=(username, password))
+    # MERGE on ResearchCommunity/Keyword needs the uniqueness constraints
+    ensure_schema(driver)
     with driver.session() as session:
         session.execute_write(clear_communities)
 
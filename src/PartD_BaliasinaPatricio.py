@@ -1,5 +1,7 @@
 from neo4j import GraphDatabase
 
+from neo4j_schema import ensure_schema
+
 # Neo4j connection details
 uri = "bolt://localhost:7687" 
 username = "neo4j"  
@@ -10,14 +12,16 @@ def clean_rank_graph(tx):
     tx.run(query, graphName='rankGraph')
 
 def create_rank_graph(tx):
-    query = """CALL gds.graph.project('rankGraph',['Paper'],'CITES')"""
+    # paperKey (integer, see id_interning.py) is carried into the projection
+    query = """CALL gds.graph.project('rankGraph',{Paper: {properties: {paperKey: {defaultValue: -1}}}},'CITES')"""
     tx.run(query)
 
 def run_pagerank(tx,graph):
     query = """
         CALL gds.pageRank.stream('rankGraph')
         YIELD nodeId, score
-        RETURN gds.util.asNode(nodeId).title AS title, score
+        RETURN gds.util.nodeProperty('rankGraph', nodeId, 'paperKey') AS paperKey,
+               gds.util.asNode(nodeId).title AS title, score
         ORDER BY score DESC, title ASC
         LIMIT 10
     """
@@ -30,14 +34,15 @@ def clean_louvain_graph(tx):
     tx.run(query, graphName='louvainGraph')
 
 def create_louvain_graph(tx):
-    query = """CALL gds.graph.project('louvainGraph',['Paper'],'CITES')"""
+    query = """CALL gds.graph.project('louvainGraph',{Paper: {properties: {paperKey: {defaultValue: -1}}}},'CITES')"""
     tx.run(query)
 
 def run_louvain(tx):
     query = """
     CALL gds.louvain.stream('louvainGraph')
         YIELD nodeId, communityId
-        RETURN gds.util.asNode(nodeId).title AS title, communityId
+        RETURN gds.util.nodeProperty('louvainGraph', nodeId, 'paperKey') AS paperKey,
+               gds.util.asNode(nodeId).title AS title, communityId
         ORDER BY communityId DESC
         LIMIT 10
     """
@@ -47,6 +52,9 @@ def run_louvain(tx):
 
 with GraphDatabase.driver(uri, auth=(username, password)) as driver:
     try:
+        # The projections read paperKey, which must be unique
+        ensure_schema(driver)
+
         # Run PageRank
         with driver.session() as session:
             try:
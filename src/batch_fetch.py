@@ -0,0 +1,167 @@
+import asyncio
+import time
+
+
+# -------------------------------------------
+# ADAPTIVE CHUNK SIZE (AIMD)
+# -------------------------------------------
+class AdaptiveChunkSize:
+    """
+    Chooses the size of the next batch from what the previous ones did.
+    Fast, successful batches grow the size by `step`; a failure halves
+    it and a batch slower than `target_latency` shrinks it by a quarter.
+    Latency and error rate are tracked as moving averages for the report.
+    """
+
+    def __init__(self, initial, minimum=1, maximum=500, target_latency=15.0, step=None):
+        self.size = max(minimum, min(initial, maximum))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.step = step or max(1, initial // 10)
+        self.avg_latency = None
+        self.error_rate = 0.0
+
+    def record(self, latency, ok):
+        alpha = 0.3
+        self.avg_latency = latency if self.avg_latency is None else (
+            alpha * latency + (1 - alpha) * self.avg_latency
+        )
+        self.error_rate = alpha * (0.0 if ok else 1.0) + (1 - alpha) * self.error_rate
+
+        if not ok:
+            self.size = max(self.minimum, self.size // 2)
+        elif latency > self.target_latency:
+            self.size = max(self.minimum, int(self.size * 0.75))
+        elif self.error_rate < 0.1:
+            self.size = min(self.maximum, self.size + self.step)
+
+
+# -------------------------------------------
+# RETRY + SPLIT BATCH FETCHER
+# -------------------------------------------
+class BatchStats:
+    """
+    Counters of fetch_resilient. Pass one instance to several calls (e.g.
+    every author group of the pipelined fetch) to report them as one line.
+    """
+
+    def __init__(self):
+        self.batches = 0
+        self.retries = 0
+        self.splits = 0
+        self.attempts = 0
+        self.failures = 0
+        self.latency = 0.0
+        self.chunk_size = None
+
+    def record(self, latency, ok):
+        self.attempts += 1
+        self.latency += latency
+        if not ok:
+            self.failures += 1
+
+    def report(self, label):
+        latency = f"{self.latency / self.attempts:.1f}s" if self.attempts else "n/a"
+        error_rate = self.failures / self.attempts if self.attempts else 0.0
+        print(f"[{label}] {self.batches} batches ok, {self.retries} retries, "
+              f"{self.splits} splits; final chunk size {self.chunk_size}, "
+              f"avg latency {latency}, error rate {error_rate:.0%}")
+
+
+async def fetch_resilient(
+    ids,
+    fetch_batch,
+    concurrency=5,
+    chunk_size=500,
+    max_chunk_size=500,
+    max_retries=3,
+    base_delay=2.0,
+    label="Batch",
+    stats=None
+):
+    """
+    Fetches `ids` through `fetch_batch(chunk) -> (items, not_found_ids)`.
+
+    A failing chunk is retried with exponential backoff (base_delay,
+    2*base_delay, ...). If it still fails it is split in half and each
+    half goes through the same cycle, down to single IDs; a single ID
+    that keeps failing is reported as lost. Chunk sizes for new batches
+    follow AdaptiveChunkSize.
+
+    Prints a summary when done, unless a BatchStats is passed as `stats`:
+    then the counts are added to it and the caller reports them.
+
+    Returns (items, not_found_ids, lost_ids).
+    """
+    sizer = AdaptiveChunkSize(chunk_size, maximum=max_chunk_size)
+    items, not_found, lost = [], [], []
+    quiet = stats is not None
+    stats = stats if quiet else BatchStats()
+    sem = asyncio.Semaphore(concurrency)
+
+    async def attempt(chunk):
+        for n in range(max_retries):
+            started = time.monotonic()
+            try:
+                result = await fetch_batch(chunk)
+                sizer.record(time.monotonic() - started, ok=True)
+                stats.record(time.monotonic() - started, ok=True)
+                stats.batches += 1
+                return result
+            except Exception as e:
+                sizer.record(time.monotonic() - started, ok=False)
+                stats.record(time.monotonic() - started, ok=False)
+                print(f"[{label} Error] {len(chunk)} IDs, attempt {n + 1}/{max_retries}: {e!r}")
+                if n + 1 < max_retries:
+                    stats.retries += 1
+                    await asyncio.sleep(base_delay * 2 ** n)
+        return None
+
+    async def run_chunk(chunk):
+        result = await attempt(chunk)
+        if result is not None:
+            chunk_items, chunk_nf = result
+            items.extend(chunk_items)
+            not_found.extend(chunk_nf)
+            return
+        if len(chunk) == 1:
+            lost.extend(chunk)
+            return
+        # Split and retry the halves in the same slot, so a bad ID
+        # cannot take the whole concurrency budget with it
+        stats.splits += 1
+        mid = len(chunk) // 2
+        await run_chunk(chunk[:mid])
+        await run_chunk(chunk[mid:])
+
+    async def run_slot(chunk):
+        try:
+            await run_chunk(chunk)
+        finally:
+            sem.release()
+
+    tasks = []
+    cursor = 0
+    while cursor < len(ids):
+        await sem.acquire()
+        chunk = ids[cursor:cursor + sizer.size]
+        cursor += len(chunk)
+        tasks.append(asyncio.create_task(run_slot(chunk)))
+    await asyncio.gather(*tasks)
+
+    stats.chunk_size = sizer.size
+    if not quiet:
+        stats.report(label)
+    return items, not_found, lost
+
+
+def report_lost_ids(lost_ids, label, filename):
+    """Prints and saves the IDs that could not be fetched at all."""
+    if not lost_ids:
+        print(f"[{label}] No IDs lost.")
+        return
+    with open(filename, "w", encoding="utf-8") as f:
+        for lid in lost_ids:
+            f.write(f"{lid}\n")
+    print(f"[{label}] {len(lost_ids)} IDs lost after retries and splits, written to {filename}")
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+
+# -------------------------------------------
+# CITATION EDGES (explode + hash semi-join)
+# -------------------------------------------
+def explode_references(paper_ids, references):
+    """
+    One (sourcePaperId, targetPaperId) row per reference. `references`
+    holds "; "-joined strings (CSV) or lists (Parquet).
+    """
+    if references.dtype == object or pd.api.types.is_string_dtype(references.dtype):
+        references = references.str.split(';')
+    edges = pd.DataFrame({
+        'sourcePaperId': paper_ids.to_numpy(),
+        'targetPaperId': references.to_numpy(),
+    }).explode('targetPaperId', ignore_index=True)
+    edges = edges.dropna(subset=['targetPaperId'])
+    edges['targetPaperId'] = edges['targetPaperId'].astype(str).str.strip()
+    return edges
+
+
+def iter_citation_edges(papers, chunk_size=100_000, paper_ids=None):
+    """
+    Yields the citation edges between papers of `papers` (columns paperId,
+    references), `chunk_size` citing papers at a time. References to
+    papers outside the table are dropped with a hash semi-join against
+    the set of paper IDs, so each chunk costs O(references in the chunk).
+
+    With an IdTable `paper_ids` holding every paper, the semi-join is a
+    key lookup into a bitmap and the edges also get
+    sourcePaperKey/targetPaperKey.
+    """
+    if paper_ids is None:
+        known = pd.Index(papers['paperId'].astype(str).unique())
+    else:
+        # The table may also hold papers of earlier runs: mark this run's
+        keys = paper_ids.lookup(papers['paperId'])
+        known = np.zeros(len(paper_ids), dtype=bool)
+        known[keys[keys >= 0]] = True
+    for start in range(0, len(papers), chunk_size):
+        part = papers.iloc[start:start + chunk_size]
+        edges = explode_references(part['paperId'].astype(str), part['references'])
+        if paper_ids is None:
+            yield edges[edges['targetPaperId'].isin(known)]
+            continue
+        targets = paper_ids.lookup(edges['targetPaperId'])
+        found = targets >= 0
+        found[found] = known[targets[found]]
+        edges = edges[found].reset_index(drop=True)
+        edges['sourcePaperKey'] = paper_ids.lookup(edges['sourcePaperId'])
+        edges['targetPaperKey'] = targets[found]
+        yield edges
+
+
+def write_citation_edges(papers, filename, chunk_size=100_000, paper_ids=None):
+    """Streams the edges chunk by chunk to `filename`; returns the edge count."""
+    columns = ['sourcePaperId', 'targetPaperId']
+    if paper_ids is not None:
+        columns += ['sourcePaperKey', 'targetPaperKey']
+    total = 0
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        for i, edges in enumerate(iter_citation_edges(papers, chunk_size, paper_ids)):
+            edges.to_csv(f, header=(i == 0), index=False)
+            total += len(edges)
+        if total == 0 and f.tell() == 0:
+            pd.DataFrame(columns=columns).to_csv(f, index=False)
+    return total
@@ -0,0 +1,131 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from output_schema import PAPER_COLUMNS, AUTHOR_COLUMNS, VENUE_COLUMNS, PAPER_KEYWORD_COLUMNS
+
+
+# -------------------------------------------
+# TYPED COLUMNAR SCHEMAS (same columns as the CSVs)
+# -------------------------------------------
+# references / authors / fieldsOfStudy / affiliations are real lists
+# instead of "; "-joined strings, so nothing has to be split again.
+
+_ids = pa.list_(pa.string())
+
+PAPERS_SCHEMA = pa.schema([
+    ("paperId", pa.string()),
+    ("title", pa.string()),
+    ("abstract", pa.string()),
+    ("doi", pa.string()),
+    ("url", pa.string()),
+    ("citationCount", pa.int64()),
+    ("venue", pa.string()),
+    ("venueId", pa.int32()),
+    ("venueType", pa.dictionary(pa.int8(), pa.string())),
+    ("year", pa.int16()),
+    ("fieldsOfStudy", _ids),
+    ("pages", pa.string()),
+    ("references", _ids),
+    ("authors", _ids),
+])
+
+AUTHORS_SCHEMA = pa.schema([
+    ("authorId", pa.string()),
+    ("name", pa.string()),
+    ("affiliations", _ids),
+])
+
+VENUES_SCHEMA = pa.schema([
+    ("venueId", pa.int32()),
+    ("venueType", pa.dictionary(pa.int8(), pa.string())),
+    ("name", pa.string()),
+    ("volume", pa.string()),
+    ("pages", pa.string()),
+])
+
+PAPER_KEYWORDS_SCHEMA = pa.schema([
+    ("paperId", pa.string()),
+    ("keyword", pa.string()),
+])
+
+for _schema, _columns in ((PAPERS_SCHEMA, PAPER_COLUMNS), (AUTHORS_SCHEMA, AUTHOR_COLUMNS),
+                          (VENUES_SCHEMA, VENUE_COLUMNS), (PAPER_KEYWORDS_SCHEMA, PAPER_KEYWORD_COLUMNS)):
+    assert _schema.names == list(_columns), f"Arrow schema out of sync with output_schema: {_schema.names}"
+
+
+def _table(columns, schema):
+    arrays = []
+    for field in schema:
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(columns[field.name], type=pa.string()).dictionary_encode()
+                          .cast(field.type))
+        else:
+            arrays.append(pa.array(columns[field.name], type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+# -------------------------------------------
+# TABLE BUILDERS
+# -------------------------------------------
+def papers_table(papers):
+    """PaperRecord objects -> papers table (keywords as fieldsOfStudy, like the CSV)."""
+    return _table({
+        "paperId": [p.paperId for p in papers],
+        "title": [p.title for p in papers],
+        "abstract": [p.abstract for p in papers],
+        "doi": [p.doi for p in papers],
+        "url": [p.url for p in papers],
+        "citationCount": [p.citationCount for p in papers],
+        "venue": [p.venue for p in papers],
+        "venueId": [p.venueId for p in papers],
+        "venueType": [p.venueType for p in papers],
+        "year": [p.year for p in papers],
+        "fieldsOfStudy": [sorted(p.keywords) for p in papers],
+        "pages": [p.pages for p in papers],
+        "references": [list(p.references) for p in papers],
+        "authors": [list(p.authorIds) for p in papers],
+    }, PAPERS_SCHEMA)
+
+
+def authors_table(authors):
+    return _table({
+        "authorId": [a.authorId for a in authors],
+        "name": [a.name or "" for a in authors],
+        "affiliations": [list(getattr(a, "affiliations", None) or []) for a in authors],
+    }, AUTHORS_SCHEMA)
+
+
+def venues_table(venues):
+    return _table({name: [v[name] for v in venues] for name in VENUES_SCHEMA.names}, VENUES_SCHEMA)
+
+
+def paper_keywords_table(papers):
+    pairs = [(p.paperId, kw) for p in papers for kw in p.keywords]
+    return _table({
+        "paperId": [pid for pid, _ in pairs],
+        "keyword": [kw for _, kw in pairs],
+    }, PAPER_KEYWORDS_SCHEMA)
+
+
+# -------------------------------------------
+# READ / WRITE
+# -------------------------------------------
+def write_parquet(table, filename):
+    pq.write_table(table, filename, compression="zstd")
+    print(f"[write_parquet] Wrote {table.num_rows} rows to {os.path.abspath(filename)}")
+
+
+def read_parquet(filename, columns=None):
+    """
+    Reads only `columns` from disk, into a DataFrame backed by the Arrow
+    buffers (pd.ArrowDtype), so strings and lists are not copied into
+    Python objects.
+    """
+    if columns is not None:
+        available = set(pq.read_schema(filename).names)
+        columns = [c for c in columns if c in available]
+    return pq.read_table(filename, columns=columns).to_pandas(types_mapper=pd.ArrowDtype)
+
@@ -0,0 +1,119 @@
+import csv
+import json
+import os
+import time
+
+
+# -------------------------------------------
+# CHECKPOINTED, RESUMABLE CRAWL OUTPUT
+# -------------------------------------------
+class CrawlCheckpoint:
+    """
+    Streams crawl rows to `output_csv` in append mode and keeps a small
+    JSON state file next to it (`<output_csv>.state.json`) with the
+    frontier still to be crawled.
+
+    The completed-ID set is the `key` column of the rows already on disk,
+    so it can never disagree with the output. Pass `completed` (anything
+    with `add` and `in`, e.g. a frontier.BloomFilter) to keep it compact.
+
+    While the state file exists the crawl is considered in progress and a
+    restart resumes from it; `finish()` removes it, and the next run
+    starts from scratch.
+
+        with CrawlCheckpoint("step2_papers.csv", FIELDNAMES) as ckpt:
+            frontier = ckpt.load_frontier() or compute_frontier()
+            ckpt.save_frontier(frontier)
+            for pid in frontier:
+                if pid in ckpt.completed:
+                    continue
+                ckpt.write_rows([...])
+            ckpt.finish()
+    """
+
+    def __init__(self, output_csv, fieldnames, key="paperId", flush_every=1, completed=None):
+        self.output_csv = output_csv
+        self.fieldnames = fieldnames
+        self.key = key
+        self.flush_every = flush_every
+        self.state_path = output_csv + ".state.json"
+        self.completed = completed if completed is not None else set()
+        self.rows_written = 0
+        self._pending_flush = 0
+        self._file = None
+        self._writer = None
+
+        self.resuming = os.path.exists(self.state_path) and os.path.exists(output_csv)
+        if self.resuming:
+            self._repair_tail()
+            with open(output_csv, "r", newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    self.completed.add(row[key])
+                    self.rows_written += 1
+            print(f"[checkpoint] Resuming {output_csv}: {self.rows_written} rows already done")
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def open(self):
+        mode = "a" if self.resuming else "w"
+        self._file = open(self.output_csv, mode, newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+        if not self.resuming:
+            self._writer.writeheader()
+            self._file.flush()
+            self._write_state({"frontier": None})
+
+    def close(self):
+        if self._file is not None:
+            self._file.flush()
+            self._file.close()
+            self._file = None
+
+    def _repair_tail(self):
+        """Drops a half-written last line left behind by a crash."""
+        with open(self.output_csv, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def _write_state(self, state):
+        state["updated"] = time.time()
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def load_state(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load_frontier(self):
+        return self.load_state().get("frontier")
+
+    def save_frontier(self, frontier, **extra):
+        """`extra` is stored alongside, e.g. the hop number of a multi-hop crawl."""
+        self._write_state({"frontier": list(frontier), **extra})
+
+    def write_rows(self, rows):
+        """Appends all rows for one completed ID and marks it done."""
+        for row in rows:
+            self._writer.writerow(row)
+            self.completed.add(row[self.key])
+            self.rows_written += 1
+        self._pending_flush += 1
+        if self._pending_flush >= self.flush_every:
+            self._file.flush()
+            self._pending_flush = 0
+
+    def finish(self):
+        self.close()
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
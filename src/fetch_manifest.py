@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import time
+
+
+# -------------------------------------------
+# FETCH MANIFEST (what was fetched, when, and what it looked like)
+# -------------------------------------------
+DEFAULT_MANIFEST_PATH = "fetch_manifest.json"
+
+
+def content_hash(values):
+    """Stable hash of any JSON-serialisable value."""
+    payload = json.dumps(values, sort_keys=True, default=list, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class FetchManifest:
+    """
+    Keeps, per kind ("papers", "authors", "inputs") and ID, the content
+    hash of the last fetched version and when it was fetched.
+
+    An incremental run asks `plan()` which IDs are new or older than
+    `max_age`, only refreshes those, and learns from `record()` whether a
+    refreshed entry actually changed. `save()` writes the file atomically.
+    """
+
+    def __init__(self, path=DEFAULT_MANIFEST_PATH):
+        self.path = path
+        self.entries = {}
+        self.changed = 0
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def plan(self, kind, ids, max_age):
+        """Returns (new, stale, fresh) lists of IDs, in input order."""
+        known = self.entries.get(kind, {})
+        cutoff = time.time() - max_age
+        new, stale, fresh = [], [], []
+        for rid in ids:
+            entry = known.get(rid)
+            if entry is None:
+                new.append(rid)
+            elif entry["fetched"] < cutoff:
+                stale.append(rid)
+            else:
+                fresh.append(rid)
+        return new, stale, fresh
+
+    def stale_ids(self, kind, max_age):
+        cutoff = time.time() - max_age
+        return [rid for rid, e in self.entries.get(kind, {}).items() if e["fetched"] < cutoff]
+
+    def record(self, kind, rid, digest, fetched=True):
+        """
+        Stores the hash of `rid`; `fetched=False` keeps the old fetch time
+        (e.g. for entries served from the cache). Returns True if the
+        content is new or differs from the last recorded version.
+        """
+        known = self.entries.setdefault(kind, {})
+        entry = known.get(rid)
+        is_changed = entry is None or entry["hash"] != digest
+        if entry is None or fetched:
+            known[rid] = {"hash": digest, "fetched": time.time()}
+        else:
+            entry["hash"] = digest
+        if is_changed:
+            self.changed += 1
+        return is_changed
+
+    def retain(self, kind, ids):
+        """Forgets entries of `kind` not in `ids`; each one counts as a change."""
+        keep = set(ids)
+        known = self.entries.get(kind, {})
+        removed = [rid for rid in known if rid not in keep]
+        for rid in removed:
+            del known[rid]
+        self.changed += len(removed)
+        return len(removed)
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+        counts = ", ".join(f"{len(v)} {k}" for k, v in sorted(self.entries.items()))
+        print(f"[manifest] Saved {counts} to {os.path.abspath(self.path)}")
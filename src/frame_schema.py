@@ -0,0 +1,122 @@
+import multiprocessing
+import os
+import resource
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from output_schema import PAPER_COLUMNS, AUTHOR_COLUMNS, VENUE_COLUMNS, PAPER_KEYWORD_COLUMNS
+
+
+# -------------------------------------------
+# TYPED PANDAS SCHEMAS FOR THE EXTRACTION CSVs
+# -------------------------------------------
+# What read_csv would otherwise infer: object for every string column,
+# float64 for IDs, years and counts with gaps. Instead:
+#   - IDs and free text are pyarrow-backed strings (no Python objects,
+#     and authorId stays "123" instead of 123.0)
+#   - repetitive strings (venueType, venue, keyword) are categoricals
+#   - year / citationCount / venueId are nullable integers
+
+_text = 'string[pyarrow]'
+
+CSV_DTYPES = {
+    'papers': {
+        'paperId': _text,
+        'title': _text,
+        'abstract': _text,
+        'doi': _text,
+        'url': _text,
+        'citationCount': 'Int32',
+        'venue': 'category',
+        'venueId': 'Int32',
+        'venueType': 'category',
+        'year': 'Int16',
+        'fieldsOfStudy': _text,
+        'pages': _text,
+        'references': _text,
+        'authors': _text,
+    },
+    'authors': {
+        'authorId': _text,
+        'name': _text,
+        'affiliations': _text,
+    },
+    'venues': {
+        'venueId': 'Int32',
+        'venueType': 'category',
+        'name': _text,
+        'volume': _text,
+        'pages': _text,
+    },
+    'paper_keywords': {
+        'paperId': _text,
+        'keyword': 'category',
+    },
+}
+
+for _name, _columns in (('papers', PAPER_COLUMNS), ('authors', AUTHOR_COLUMNS),
+                        ('venues', VENUE_COLUMNS), ('paper_keywords', PAPER_KEYWORD_COLUMNS)):
+    assert list(CSV_DTYPES[_name]) == list(_columns), f"CSV dtypes out of sync with output_schema: {_name}"
+
+
+def read_typed_csv(path, name, columns=None, **kwargs):
+    """
+    read_csv of one of the extraction files with its declared dtypes,
+    parsing only `columns` (those missing from the file are skipped).
+    Extra keyword arguments (e.g. chunksize) go to read_csv.
+    """
+    usecols = None if columns is None else (lambda c: c in columns)
+    return pd.read_csv(path, usecols=usecols, dtype=CSV_DTYPES.get(name), **kwargs)
+
+
+# -------------------------------------------
+# MEMORY REPORT (inferred vs declared dtypes)
+# -------------------------------------------
+def _peak_rss_mb():
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 ** 2 if sys.platform == 'darwin' else 1024)
+
+
+def _load(directory, typed, with_abstracts):
+    frames = {}
+    for name in CSV_DTYPES:
+        path = os.path.join(directory, f'{name}.csv')
+        columns = None
+        if name == 'papers' and not with_abstracts:
+            columns = [c for c in CSV_DTYPES[name] if c not in ('title', 'abstract')]
+        if typed:
+            frames[name] = read_typed_csv(path, name, columns)
+        else:
+            frames[name] = pd.read_csv(path, usecols=None if columns is None else (lambda c: c in columns))
+    frame_mb = {name: df.memory_usage(deep=True).sum() / 1024 ** 2 for name, df in frames.items()}
+    return frame_mb, _peak_rss_mb()
+
+
+def memory_report(directory='final_output'):
+    """
+    Loads the four extraction CSVs with inferred dtypes, with the typed
+    schema, and typed without titles/abstracts, each in a fresh process,
+    and prints the deep size of every frame and the peak RSS.
+    """
+    modes = [('inferred (read_csv)', False, True),
+             ('typed', True, True),
+             ('typed, no title/abstract', True, False)]
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for label, typed, with_abstracts in modes:
+        # One process per mode, so each peak RSS is its own
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            results.append((label, *pool.submit(_load, directory, typed, with_abstracts).result()))
+
+    print(f"[memory] {'':26s}" + ''.join(f"{name:>16s}" for name in CSV_DTYPES) + f"{'peak RSS':>12s}")
+    for label, frame_mb, peak in results:
+        sizes = ''.join(f"{frame_mb[name]:13.1f} MB" for name in CSV_DTYPES)
+        print(f"[memory] {label:26s}{sizes}{peak:9.0f} MB")
+    return results
+
+
+if __name__ == "__main__":
+    memory_report(sys.argv[1] if len(sys.argv) > 1 else 'final_output')
@@ -0,0 +1,93 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# -------------------------------------------
+# ID INTERNING (external string ID -> dense int64 key)
+# -------------------------------------------
+PAPER_ID_TABLE = 'paper_ids.csv'
+AUTHOR_ID_TABLE = 'author_ids.csv'
+
+
+def normalize_paper_id(value):
+    return str(value).strip()
+
+
+def normalize_author_id(value):
+    # authorId may come back from read_csv as a float ("123.0")
+    return str(value).split('.')[0].strip()
+
+
+class IdTable:
+    """
+    Maps external IDs to dense int64 keys 0, 1, 2, ... in order of first
+    appearance. Keys are never reassigned: a table loaded from disk only
+    grows, so keys written by an earlier run stay valid. Every distinct
+    value is normalised once (e.g. "123.0" -> "123" for author IDs);
+    missing values get key -1.
+    """
+
+    def __init__(self, ids=(), normalize=normalize_paper_id, key_column='key', id_column='id'):
+        self.normalize = normalize
+        self.key_column = key_column
+        self.id_column = id_column
+        self._ids = np.asarray(list(ids), dtype=object)
+        self._index = pd.Index(self._ids)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """Table saved at `path`, or an empty one if there is none yet."""
+        table = cls(**kwargs)
+        if os.path.exists(path):
+            frame = pd.read_csv(path, dtype={table.id_column: str})
+            ids = frame.sort_values(table.key_column)[table.id_column].to_numpy(dtype=object)
+            if not np.array_equal(frame[table.key_column].sort_values().to_numpy(), np.arange(len(ids))):
+                raise ValueError(f"{path} does not hold dense keys 0..{len(ids) - 1}")
+            table = cls(ids, **kwargs)
+        return table
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _keys(self, values, add):
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        normalized = pd.Index([self.normalize(v) for v in uniques], dtype=object)
+        unique_keys = self._index.get_indexer(normalized)
+        if add:
+            new = pd.unique(normalized[unique_keys < 0])
+            if len(new):
+                self._ids = np.concatenate([self._ids, np.asarray(new, dtype=object)])
+                self._index = pd.Index(self._ids)
+                unique_keys = self._index.get_indexer(normalized)
+        keys = unique_keys.astype(np.int64)[codes]
+        keys[codes < 0] = -1
+        return keys
+
+    def intern(self, values):
+        """int64 key of every value, adding unseen IDs to the table."""
+        return self._keys(values, add=True)
+
+    def lookup(self, values):
+        """int64 key of every value, -1 for IDs not in the table."""
+        return self._keys(values, add=False)
+
+    def external(self, keys):
+        """External IDs of `keys` (an array of valid keys)."""
+        return self._ids[np.asarray(keys, dtype=np.int64)]
+
+    def to_frame(self):
+        return pd.DataFrame({self.key_column: np.arange(len(self._ids), dtype=np.int64),
+                             self.id_column: self._ids})
+
+    def save(self, path):
+        self.to_frame().to_csv(path, index=False)
+
+
+def paper_id_table(path=PAPER_ID_TABLE):
+    return IdTable.load(path, normalize=normalize_paper_id, key_column='paperKey', id_column='paperId')
+
+
+def author_id_table(path=AUTHOR_ID_TABLE):
+    return IdTable.load(path, normalize=normalize_author_id, key_column='authorKey', id_column='authorId')
@@ -0,0 +1,136 @@
+import time
+
+import numpy as np
+
+
+# -------------------------------------------
+# KEYWORD BITSETS
+# -------------------------------------------
+def encode_keywords(keyword_sets, vocabulary=None):
+    """
+    Encodes one keyword set per paper as a row of uint64 words, bit i of
+    the row standing for vocabulary[i]. Returns (bits, vocabulary) where
+    bits has shape (n_papers, ceil(len(vocabulary) / 64)).
+    """
+    if vocabulary is None:
+        vocabulary = sorted(set().union(*keyword_sets)) if keyword_sets else []
+    index = {kw: i for i, kw in enumerate(vocabulary)}
+    n_words = max(1, (len(vocabulary) + 63) // 64)
+
+    bits = np.zeros((len(keyword_sets), n_words), dtype=np.uint64)
+    for row, keywords in enumerate(keyword_sets):
+        for kw in keywords:
+            i = index[kw]
+            bits[row, i >> 6] |= np.uint64(1) << np.uint64(i & 63)
+    return bits, vocabulary
+
+
+def decode_keywords(bits, vocabulary):
+    """Inverse of encode_keywords: one set of keywords per row."""
+    flags = np.unpackbits(
+        np.ascontiguousarray(bits).astype("<u8").view(np.uint8), axis=1, bitorder="little"
+    )[:, :len(vocabulary)]
+    rows, cols = np.nonzero(flags)
+    keyword_sets = [set() for _ in range(len(bits))]
+    for row, col in zip(rows.tolist(), cols.tolist()):
+        keyword_sets[row].add(vocabulary[col])
+    return keyword_sets
+
+
+# -------------------------------------------
+# CSR ADJACENCY + PROPAGATION
+# -------------------------------------------
+def build_csr(n_nodes, src, dst):
+    """
+    Groups the edges src -> dst by destination: the sources of node v are
+    indices[indptr[v]:indptr[v + 1]].
+    """
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    order = np.argsort(dst, kind="stable")
+    indices = src[order]
+    indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(dst, minlength=n_nodes), out=indptr[1:])
+    return indptr, indices
+
+
+def propagate(bits, indptr, indices, depth=None):
+    """
+    Repeatedly ORs into every node the bits of its sources (see build_csr).
+    Each step uses the bits of the previous step only, so the result does
+    not depend on any iteration order. Runs `depth` steps, or until
+    nothing changes when depth is None. Returns (bits, steps_run).
+    """
+    bits = bits.copy()
+    has_sources = np.diff(indptr) > 0
+    targets = np.nonzero(has_sources)[0]
+    starts = indptr[:-1][has_sources]
+    if len(targets) == 0:
+        return bits, 0
+
+    steps = 0
+    while depth is None or steps < depth:
+        incoming = np.bitwise_or.reduceat(bits[indices], starts, axis=0)
+        updated = bits[targets] | incoming
+        steps += 1
+        if np.array_equal(updated, bits[targets]):
+            break
+        bits[targets] = updated
+    return bits, steps
+
+
+def propagate_keywords(keywords_by_paper, references_by_paper, depth=None):
+    """
+    keywords_by_paper: {paperId: set of keywords}
+    references_by_paper: {paperId: [referenced paperIds]}
+
+    A paper's keywords flow into the papers it references, `depth` hops
+    far or to a fixed point. References outside keywords_by_paper are
+    ignored. Returns {paperId: set of keywords}.
+    """
+    paper_ids = list(keywords_by_paper)
+    position = {pid: i for i, pid in enumerate(paper_ids)}
+
+    src, dst = [], []
+    for pid, refs in references_by_paper.items():
+        i = position.get(pid)
+        if i is None:
+            continue
+        for rid in refs:
+            j = position.get(rid)
+            if j is not None and j != i:
+                src.append(i)
+                dst.append(j)
+
+    bits, vocabulary = encode_keywords([keywords_by_paper[pid] for pid in paper_ids])
+    indptr, indices = build_csr(len(paper_ids), src, dst)
+    bits, steps = propagate(bits, indptr, indices, depth)
+    print(f"[propagate_keywords] {len(paper_ids)} papers, {len(src)} edges, "
+          f"{len(vocabulary)} keywords, {steps} steps")
+    return dict(zip(paper_ids, decode_keywords(bits, vocabulary)))
+
+
+# -------------------------------------------
+# BENCHMARK
+# -------------------------------------------
+def benchmark(n_nodes=200_000, n_edges=1_000_000, n_keywords=100, seed=42):
+    rng = np.random.default_rng(seed)
+    src = rng.integers(0, n_nodes, n_edges)
+    dst = rng.integers(0, n_nodes, n_edges)
+    n_words = (n_keywords + 63) // 64
+    bits = np.zeros((n_nodes, n_words), dtype=np.uint64)
+    seeded = rng.integers(0, n_nodes, n_nodes // 100)
+    bits[seeded, 0] = np.uint64(1) << rng.integers(0, 64, len(seeded)).astype(np.uint64)
+
+    started = time.perf_counter()
+    indptr, indices = build_csr(n_nodes, src, dst)
+    built = time.perf_counter() - started
+    for depth in (1, 3, None):
+        started = time.perf_counter()
+        _, steps = propagate(bits, indptr, indices, depth)
+        print(f"[benchmark] {n_nodes} nodes, {n_edges} edges, depth={depth}: "
+              f"{steps} steps in {time.perf_counter() - started:.2f}s (CSR build {built:.2f}s)")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -4,6 +4,12 @@ import random
 import uuid
 import re
 from datetime import datetime
+import os
+import sys
+
+# Venue names are cleaned by the shared normaliser in src/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from venue_normalizer import clean_venue_name
 
 # Function to generate random emails based on author names
 def generate_email(name):
@@ -41,24 +47,6 @@ def generate_city_and_venue():
     
     return city, venue
 
-# Clean the venue names
-def clean_venue_name(name):
-    if isinstance(name, str):
-        name = name.strip('"')
-        name = re.sub(r'\b\d{4}\b|\[\d{4}\]|\b\d{4}\s+\d+(?:st|nd|rd|th)?', '', name)
-        name = re.sub(r'Proceedings of( the)?|Proceeding of the|Proceedings\.?', '', name)
-        name = re.sub(r'\b(?:\d+(?:st|nd|rd|th)|First|Second|Third|Fourth|Fifth|Sixth|Seventh|Eighth|Ninth|Tenth|Eleventh|Twelfth|Thirteenth)\b', '', name)
-        name = re.sub(r'\(Cat\.\s*No\..*?\)', '', name)
-        name = re.sub(r', \d{4}(?:\.|$)', '', name)
-        name = re.sub(r'(?:- |, )(?:Proceedings|Volume \d+)', '', name)
-        name = re.sub(r'\s+', ' ', name)
-        name = re.sub(r'\s*-\s*', ' ', name)
-        name = re.sub(r'\s*:\s*', ': ', name)
-        name = re.sub(r'\s*,\s*', ', ', name)
-        name = re.sub(r'^\/', '', name)
-        name = name.strip(' .,;:-"')
-    return name
-
 # Clean text e.g. abstract and title
 def clean_text(text):
     if isinstance(text, str):
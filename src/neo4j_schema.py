@@ -0,0 +1,111 @@
+import sys
+
+from neo4j import GraphDatabase
+
+
+# -------------------------------------------
+# NEO4J SCHEMA (uniqueness constraints on every node key)
+# -------------------------------------------
+# Created before any LOAD CSV, so that the relationship loads (and the
+# MATCH/MERGE in Parts A.3 and C) find their endpoints with an index
+# seek instead of a label scan. Each uniqueness constraint comes with
+# its own range index; no separate index is needed on these properties.
+#
+#   python neo4j_schema.py          # create (if missing), wait, verify
+
+uri = "bolt://localhost:7687"
+username = "neo4j"
+password = "password"
+
+INDEX_TIMEOUT_SECONDS = 600
+
+# (constraint name, node label, property)
+CONSTRAINTS = [
+    # Integer keys from id_interning.py, used by the relationship loads
+    ('author_key_unique', 'Author', 'authorKey'),
+    ('paper_key_unique', 'Paper', 'paperKey'),
+    # String IDs, used by Part A.3 and for display
+    ('author_id_unique', 'Author', 'authorId'),
+    ('paper_id_unique', 'Paper', 'paperId'),
+    ('journal_name_unique', 'Journal', 'journalName'),
+    ('keyword_unique', 'Keyword', 'keyword'),
+    ('proceeding_id_unique', 'Proceeding', 'proceedingId'),
+    ('conference_name_unique', 'Conference', 'conferenceName'),
+    # Nodes added by Parts A.3 and C
+    ('affiliation_name_unique', 'Affiliation', 'affiliationName'),
+    ('research_community_name_unique', 'ResearchCommunity', 'name'),
+]
+
+
+def _constraint_query(name, label, prop):
+    return f"CREATE CONSTRAINT {name} IF NOT EXISTS FOR (n:{label}) REQUIRE n.{prop} IS UNIQUE"
+
+
+def _drop_plain_indexes(session):
+    # Older uploads created plain indexes (author_id, paper_key, ...) on the
+    # same properties; Neo4j refuses a constraint over an existing index
+    wanted = {(label, prop) for _, label, prop in CONSTRAINTS}
+    indexes = session.run(
+        "SHOW INDEXES YIELD name, labelsOrTypes, properties, owningConstraint "
+        "WHERE owningConstraint IS NULL RETURN name, labelsOrTypes, properties"
+    ).data()
+    for index in indexes:
+        labels, props = index['labelsOrTypes'] or [], index['properties'] or []
+        if len(labels) == 1 and len(props) == 1 and (labels[0], props[0]) in wanted:
+            print(f"Dropping index {index['name']} (replaced by a uniqueness constraint)")
+            session.run(f"DROP INDEX `{index['name']}` IF EXISTS")
+
+
+def verify_schema(driver):
+    """
+    Checks that every declared constraint exists and that its index is
+    ONLINE. Raises RuntimeError listing what is missing or not online.
+    """
+    with driver.session() as session:
+        constraints = session.run(
+            "SHOW CONSTRAINTS YIELD name, type, labelsOrTypes, properties, ownedIndex "
+            "RETURN name, type, labelsOrTypes, properties, ownedIndex"
+        ).data()
+        states = {row['name']: row['state'] for row in session.run(
+            "SHOW INDEXES YIELD name, state RETURN name, state"
+        ).data()}
+
+    found = {(tuple(c['labelsOrTypes'] or []), tuple(c['properties'] or [])): c
+             for c in constraints if 'UNIQUE' in c['type']}
+    problems = []
+    for name, label, prop in CONSTRAINTS:
+        constraint = found.get(((label,), (prop,)))
+        if constraint is None:
+            problems.append(f"{name}: no uniqueness constraint on :{label}({prop})")
+        elif states.get(constraint['ownedIndex']) != 'ONLINE':
+            problems.append(f"{name}: index {constraint['ownedIndex']} is "
+                            f"{states.get(constraint['ownedIndex'], 'missing')}")
+    if problems:
+        raise RuntimeError("Neo4j schema is incomplete:\n  " + "\n  ".join(problems))
+    return len(CONSTRAINTS)
+
+
+def ensure_schema(driver, timeout=INDEX_TIMEOUT_SECONDS):
+    """
+    Creates the declared constraints that do not exist yet, waits until
+    their indexes are online and verifies them. Safe to call before every
+    run; the constraints must be created while the labels hold no
+    duplicate values (e.g. right after the upload clears the database).
+    """
+    with driver.session() as session:
+        _drop_plain_indexes(session)
+        for name, label, prop in CONSTRAINTS:
+            session.run(_constraint_query(name, label, prop))
+        session.run("CALL db.awaitIndexes($timeout)", timeout=timeout)
+    count = verify_schema(driver)
+    print(f"Schema ready: {count} uniqueness constraints online")
+    return count
+
+
+if __name__ == "__main__":
+    with GraphDatabase.driver(uri, auth=(username, password)) as driver:
+        try:
+            ensure_schema(driver)
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            sys.exit(1)
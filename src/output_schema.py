@@ -0,0 +1,133 @@
+import asyncio
+import csv
+import json
+import sys
+import time
+
+
+# -------------------------------------------
+# DECLARED OUTPUT SCHEMA
+# -------------------------------------------
+# Every column the extraction writes, mapped to the Semantic Scholar
+# fields it is built from. The fetch field lists are derived from here,
+# so a column that is dropped stops being requested, and a field is only
+# requested if some writer (and therefore preprocessing / A.3) uses it.
+# paperId / authorId are always returned by the API.
+
+PAPER_COLUMNS = {
+    "paperId": [],
+    "title": ["title"],
+    "abstract": ["abstract"],
+    "doi": ["externalIds"],
+    "url": ["url"],
+    "citationCount": ["citationCount"],
+    "venue": ["venue"],
+    "venueId": ["venue", "publicationTypes", "journal"],   # venue_registry ID
+    "venueType": ["publicationTypes"],
+    "year": ["year"],
+    "fieldsOfStudy": ["fieldsOfStudy"],   # seeds the combined keywords
+    "pages": ["journal"],
+    "references": [],                      # taken from papers_combined.csv
+    "authors": ["authors"],
+}
+
+VENUE_COLUMNS = {
+    "venueId": [],
+    "venueType": ["publicationTypes", "venue"],
+    "name": ["venue", "journal"],
+    "volume": ["journal"],
+    "pages": ["journal"],
+}
+
+PAPER_KEYWORD_COLUMNS = {
+    "paperId": [],
+    "keyword": ["fieldsOfStudy", "title", "abstract"],   # KeywordTagger scans title + abstract
+}
+
+AUTHOR_COLUMNS = {
+    "authorId": [],
+    "name": ["name"],
+    "affiliations": ["affiliations"],      # used by PartA.3
+}
+
+
+def _fields_for(*schemas):
+    fields = []
+    for schema in schemas:
+        for api_fields in schema.values():
+            for field in api_fields:
+                if field not in fields:
+                    fields.append(field)
+    return fields
+
+
+def paper_fields():
+    """API fields needed by papers.csv, venues.csv and paper_keywords.csv."""
+    return _fields_for(PAPER_COLUMNS, VENUE_COLUMNS, PAPER_KEYWORD_COLUMNS)
+
+
+def author_fields():
+    """API fields needed by authors.csv."""
+    return _fields_for(AUTHOR_COLUMNS)
+
+
+# -------------------------------------------
+# PER-FIELD COST REPORT
+# -------------------------------------------
+async def profile_field_costs(fetch, sample_ids, fields, label):
+    """
+    Requests `sample_ids` once per field through `fetch(ids, [field])`
+    and prints the JSON bytes per record and the request latency, so the
+    cost of each field (including ones the schema no longer asks for) is
+    visible. Returns {field: (bytes_per_record, seconds)}.
+    """
+    costs = {}
+    for field in fields:
+        started = time.monotonic()
+        try:
+            records = await fetch(sample_ids, [field])
+        except Exception as e:
+            print(f"[{label}] {field}: request failed ({e})")
+            continue
+        elapsed = time.monotonic() - started
+        size = sum(len(json.dumps(r.raw_data)) for r in records)
+        costs[field] = (size / max(1, len(records)), elapsed)
+
+    print(f"[{label}] cost per field over {len(sample_ids)} IDs:")
+    for field, (per_record, elapsed) in sorted(costs.items(), key=lambda kv: -kv[1][0]):
+        print(f"    {field:18s} {per_record:10.0f} bytes/record {elapsed:7.2f}s")
+    return costs
+
+
+async def report_field_costs(papers_csv="papers_combined.csv", sample_size=100):
+    from semanticscholar import AsyncSemanticScholar
+
+    with open(papers_csv, newline="", encoding="utf-8") as f:
+        paper_ids = [row["paperId"] for _, row in zip(range(sample_size), csv.DictReader(f))]
+
+    sch = AsyncSemanticScholar()
+    all_paper_fields = paper_fields() + ["references", "citations", "s2FieldsOfStudy", "tldr"]
+    papers = await profile_field_costs(
+        lambda ids, fields: sch.get_papers(paper_ids=ids, fields=fields),
+        paper_ids, all_paper_fields, "paper fields"
+    )
+
+    author_ids = []
+    for p in await sch.get_papers(paper_ids=paper_ids, fields=["authors"]):
+        author_ids.extend(a.authorId for a in (p.authors or []) if a.authorId)
+    author_ids = list(dict.fromkeys(author_ids))[:sample_size]
+    all_author_fields = author_fields() + ["homepage", "paperCount", "citationCount", "hIndex", "papers"]
+    authors = await profile_field_costs(
+        lambda ids, fields: sch.get_authors(author_ids=ids, fields=fields),
+        author_ids, all_author_fields, "author fields"
+    )
+
+    requested = sum(papers.get(f, (0, 0))[0] for f in paper_fields()) + \
+        sum(authors.get(f, (0, 0))[0] for f in author_fields())
+    everything = sum(c[0] for c in papers.values()) + sum(c[0] for c in authors.values())
+    if everything:
+        print(f"[schema] Requested fields are {requested / everything:.0%} of the profiled bytes")
+
+
+if __name__ == "__main__":
+    asyncio.run(report_field_costs(*sys.argv[1:2]))
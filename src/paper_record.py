@@ -0,0 +1,147 @@
+import copy
+import time
+import tracemalloc
+
+
+# -------------------------------------------
+# COMPACT PAPER RECORD
+# -------------------------------------------
+class PaperRecord:
+    """
+    Only the paper fields the CSV writers and the venue step use, read
+    straight from the API JSON. No nested S2 objects are built and
+    nothing is deep-copied; `references`, `keywords` and `venueId` are
+    filled in by the extraction script.
+    """
+
+    __slots__ = (
+        "paperId", "title", "abstract", "doi", "url", "citationCount",
+        "venue", "venueType", "year", "fieldsOfStudy", "pages",
+        "journalName", "journalVolume", "authorIds", "references", "keywords",
+        "venueId",
+    )
+
+    def __init__(self, paperId, title=None, abstract=None, doi="", url=None,
+                 citationCount=0, venue=None, venueType="Unknown", year=None,
+                 fieldsOfStudy=(), pages="", journalName="", journalVolume="",
+                 authorIds=(), references=(), keywords=None, venueId=None):
+        self.paperId = paperId
+        self.title = title
+        self.abstract = abstract
+        self.doi = doi
+        self.url = url
+        self.citationCount = citationCount
+        self.venue = venue
+        self.venueType = venueType
+        self.year = year
+        self.fieldsOfStudy = fieldsOfStudy
+        self.pages = pages
+        self.journalName = journalName
+        self.journalVolume = journalVolume
+        self.authorIds = authorIds
+        self.references = references
+        self.keywords = keywords if keywords is not None else set()
+        self.venueId = venueId
+
+    @classmethod
+    def from_raw(cls, data):
+        """Builds a record from one /paper/batch JSON object."""
+        external_ids = data.get("externalIds") or {}
+        journal = data.get("journal") or {}
+        pub_types = data.get("publicationTypes") or []
+
+        venue_type = "Unknown"
+        if "JournalArticle" in pub_types:
+            venue_type = "Journal"
+        elif "Conference" in pub_types:
+            venue_type = "Conference"
+
+        return cls(
+            paperId=data.get("paperId"),
+            title=data.get("title"),
+            abstract=data.get("abstract"),
+            doi=external_ids.get("DOI") or external_ids.get("doi") or "",
+            url=data.get("url"),
+            citationCount=data.get("citationCount", 0),
+            venue=data.get("venue"),
+            venueType=venue_type,
+            year=data.get("year"),
+            fieldsOfStudy=tuple(fs for fs in (data.get("fieldsOfStudy") or []) if fs),
+            pages=journal.get("pages") or "",
+            journalName=journal.get("name") or "",
+            journalVolume=journal.get("volume") or "",
+            authorIds=tuple(a["authorId"] for a in (data.get("authors") or []) if a.get("authorId")),
+        )
+
+
+# -------------------------------------------
+# MEMORY BENCHMARK: records vs deepcopy + S2Paper
+# -------------------------------------------
+def _synthetic_raw_paper(i):
+    return {
+        "paperId": f"{i:040x}",
+        "title": f"A study of data management technique number {i}",
+        "abstract": "We present an approach to scalable data processing. " * 20,
+        "year": 2000 + i % 25,
+        "venue": "International Conference on Data Engineering",
+        "authors": [{"authorId": str(10_000_000 + i * 5 + k), "name": f"Author {k}"} for k in range(5)],
+        "citationCount": i % 500,
+        "publicationTypes": ["JournalArticle"] if i % 2 else ["Conference"],
+        "externalIds": {"DOI": f"10.1000/{i}", "CorpusId": i},
+        "fieldsOfStudy": ["Computer Science"],
+        "journal": {"name": "J. Data Eng.", "volume": str(i % 50), "pages": "1-12"},
+        "url": f"https://www.semanticscholar.org/paper/{i:040x}",
+    }
+
+
+def _measure(build, raws):
+    tracemalloc.start()
+    started = time.perf_counter()
+    papers = build(raws)
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del papers
+    return current, peak, elapsed
+
+
+def benchmark_memory(n=20_000, references_per_paper=30):
+    """
+    Compares the old path (S2Paper + deepcopy + S2Paper rebuild with the
+    CSV references) against PaperRecord.from_raw on `n` synthetic papers.
+    Memory of the raw API responses themselves is excluded from both.
+    """
+    from semanticscholar.Paper import Paper as S2Paper
+
+    raws = [_synthetic_raw_paper(i) for i in range(n)]
+    refs = [[f"{(i * 7 + k) % n:040x}" for k in range(references_per_paper)] for i in range(n)]
+
+    def old_path(raws):
+        # main() kept both the fetched papers and their rebuilt copies alive
+        fetched_papers = [S2Paper(raw) for raw in raws]
+        papers = []
+        for fetched, ref_ids in zip(fetched_papers, refs):
+            data_copy = copy.deepcopy(fetched.raw_data)
+            data_copy["references"] = [{"paperId": rid} for rid in ref_ids]
+            new_paper = S2Paper(data_copy)
+            new_paper._myKeywords = set(new_paper.fieldsOfStudy or [])
+            papers.append(new_paper)
+        return fetched_papers, papers
+
+    def record_path(raws):
+        papers = []
+        for raw, ref_ids in zip(raws, refs):
+            record = PaperRecord.from_raw(raw)
+            record.references = ref_ids
+            record.keywords = set(record.fieldsOfStudy)
+            papers.append(record)
+        return papers
+
+    for label, build in (("deepcopy + S2Paper", old_path), ("PaperRecord", record_path)):
+        current, peak, elapsed = _measure(build, raws)
+        print(f"[benchmark] {label:20s} n={n}: retained {current / 1e6:7.1f} MB, "
+              f"peak {peak / 1e6:7.1f} MB, {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    benchmark_memory()
@@ -0,0 +1,44 @@
+import os
+import runpy
+import sys
+
+from preprocessing_stages import STAGES, SEED
+from stage_dag import Stage, run_stages
+
+
+# -------------------------------------------
+# PREPROCESSING -> UPLOAD PIPELINE
+# -------------------------------------------
+# Runs the preprocessing stages and the Neo4j upload as one DAG. Every
+# stage is fingerprinted (code, params, seed, source files, upstream
+# fingerprints); a stage whose fingerprint and outputs are unchanged
+# since the last run is skipped, and everything downstream of a stage
+# that ran is run again. Cache and timings live in .stages/.
+#
+#   python pipeline.py                 # only what changed
+#   python pipeline.py upload ...      # also force the named stages
+
+WORKERS = None
+UPLOAD_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'PartA.2_BaliasinaPatricio_Upload.py')
+SCHEMA_MODULE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'neo4j_schema.py')
+
+# Every CSV the preprocessing writes is loaded by the upload
+NODE_AND_EDGE_CSVS = [name for stage in STAGES for name in stage.outputs if name.endswith('.csv')]
+
+
+def upload(*csv_paths):
+    # The CSVs are read by Neo4j from its import directory, not from here
+    script = runpy.run_path(UPLOAD_SCRIPT, run_name='upload')
+    with script['GraphDatabase'].driver(script['uri'], auth=(script['username'], script['password'])) as driver:
+        script['load_csv_data'](driver)
+        script['verify_schema'](driver)
+    return {}
+
+
+PIPELINE = STAGES + [
+    Stage('upload', upload, inputs=NODE_AND_EDGE_CSVS, sources=[UPLOAD_SCRIPT, SCHEMA_MODULE]),
+]
+
+
+if __name__ == "__main__":
+    run_stages(PIPELINE, workers=WORKERS, seed=SEED, force=sys.argv[1:])
@@ -0,0 +1,91 @@
+import os
+import random
+import re
+
+import numpy as np
+import pandas as pd
+
+from frame_schema import read_typed_csv
+
+
+# Values the generators below (and synthetic_graph.py) draw from
+EMAIL_DOMAINS = ['university.edu', 'research.org', 'institute.net', 'lab.com', 'science.io']
+
+CITY_UNIVERSITY_PAIRS = {
+    "New York": ["Columbia University", "New York University", "Cornell Tech", "City University of New York"],
+    "San Francisco": ["Stanford University", "University of California, San Francisco", "Berkeley", "San Francisco State University"],
+    "Boston": ["Harvard University", "Massachusetts Institute of Technology", "Northeastern University", "Boston University"],
+    "Chicago": ["University of Chicago", "Northwestern University", "Illinois Institute of Technology", "Loyola University Chicago"],
+    "London": ["University of Oxford", "Imperial College London", "University College London", "King's College London"],
+    "Paris": ["Sorbonne University", "École Polytechnique", "Paris-Saclay University", "Sciences Po"],
+    "Berlin": ["Humboldt University of Berlin", "Technical University of Berlin", "Free University of Berlin", "Charité - Universitätsmedizin Berlin"],
+    "Zurich": ["ETH Zurich", "University of Zurich", "Swiss Federal Institute of Technology"],
+    "Tokyo": ["University of Tokyo", "Tokyo Institute of Technology", "Keio University", "Waseda University"],
+    "Beijing": ["Tsinghua University", "Peking University", "Beijing University of Posts and Telecommunications", "Beijing Normal University"],
+    "Singapore": ["National University of Singapore", "Nanyang Technological University", "Singapore Management University"],
+    "Seoul": ["Seoul National University", "Korea Advanced Institute of Science and Technology", "Yonsei University"],
+    "Toronto": ["University of Toronto", "York University", "Ryerson University", "University of Waterloo"],
+    "Sydney": ["University of Sydney", "University of New South Wales", "Macquarie University", "University of Technology Sydney"],
+    "Amsterdam": ["University of Amsterdam", "VU Amsterdam", "Delft University of Technology", "Wageningen University"]
+}
+
+# Function to generate random emails based on author names
+def generate_email(name):
+    name = re.sub(r'[^\w\s]', '', name).lower()
+    username = name.replace(' ', '.').lower()
+    return f"{username}@{random.choice(EMAIL_DOMAINS)}"
+
+# Function to generate random city and venue
+def generate_city_and_venue():
+    city = random.choice(list(CITY_UNIVERSITY_PAIRS.keys()))
+    venue = random.choice(CITY_UNIVERSITY_PAIRS[city])
+    return city, venue
+
+def clean_text(text):
+    if isinstance(text, str):
+        text = re.sub(r'[^A-Za-z0-9\s.,-:]', '', text)
+        text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+def convert_int(value):
+    try:
+        return int(value)
+    except:
+        return value
+
+def id_list(value):
+    # "; "-joined string from the CSVs, or a list from the Parquet files
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(';')]
+    if value is None or value is pd.NA or (isinstance(value, float) and np.isnan(value)):
+        return []
+    return list(value)
+
+def output_path(name, directory='final_output'):
+    # Extraction output file: the Parquet file when present, else the CSV
+    parquet_path = os.path.join(directory, f'{name}.parquet')
+    if os.path.exists(parquet_path):
+        return parquet_path
+    return os.path.join(directory, f'{name}.csv')
+
+def load_output(name, columns=None, directory='final_output'):
+    # Extraction output as Parquet when present, else the CSV with its
+    # declared dtypes (frame_schema.py); only `columns` are read
+    path = output_path(name, directory)
+    if path.endswith('.parquet'):
+        from columnar_io import read_parquet
+        return read_parquet(path, columns)
+    return read_typed_csv(path, name, columns)
+
+def iter_output(name, chunk_size, columns=None, directory='final_output'):
+    # Same as load_output, but yields DataFrames of at most `chunk_size` rows
+    parquet_path = os.path.join(directory, f'{name}.parquet')
+    if os.path.exists(parquet_path):
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(parquet_path)
+        if columns is not None:
+            columns = [c for c in columns if c in parquet_file.schema_arrow.names]
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas(types_mapper=pd.ArrowDtype)
+        return
+    yield from read_typed_csv(os.path.join(directory, f'{name}.csv'), name, columns, chunksize=chunk_size)
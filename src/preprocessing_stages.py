@@ -0,0 +1,289 @@
+import random
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from preprocessing_common import (generate_email, generate_city_and_venue, clean_text,
+                                  convert_int, id_list, load_output, output_path)
+from venue_registry import VenueRegistry
+from reviewer_assignment import assign_reviewers
+from citation_edges import write_citation_edges
+from proceedings_index import build_paper_presented_in, ProceedingsIndex
+from stage_dag import Stage
+from id_interning import PAPER_ID_TABLE, AUTHOR_ID_TABLE, paper_id_table, author_id_table
+
+
+# Stages of PartA.2_BaliasinaPatricio_Preprocessing.py, importable so
+# that worker processes and pipeline.py can load them.
+
+# Seed for reproducibility; every stage reseeds random/np.random from it
+# (stage_dag.stage_seed). The draws (emails, pages, volumes, reviewers,
+# cities, recurring authors) therefore differ from those of the original
+# single-stream script, which called random.seed(42) once.
+SEED = 42
+
+# Extraction output the load stages read (fingerprinted by the pipeline)
+FINAL_OUTPUT = 'final_output'
+
+# Titles and abstracts are only read by the paper_nodes stage, so they stay
+# out of the papers frame every other stage loads. With False the
+# abstracts are not read at all and paper_nodes.csv leaves them empty.
+LOAD_ABSTRACTS = True
+
+
+# ---------------------------
+# LOAD AND CLEAN
+# ---------------------------
+def load_venues():
+    venues = load_output('venues', directory=FINAL_OUTPUT)
+    if 'venueId' not in venues.columns:
+        venues['name'] = VenueRegistry().map_names(venues['name'])
+    return {'venues': venues}
+
+
+def load_papers(venues):
+    papers = load_output('papers', directory=FINAL_OUTPUT, columns=[
+        'paperId', 'doi', 'url', 'citationCount', 'venue', 'venueId',
+        'venueType', 'year', 'pages', 'references', 'authors'
+    ])
+    if 'venueId' in papers.columns and 'venueId' in venues.columns:
+        # Venue names were normalised and interned at extraction time
+        venue_names = venues.drop_duplicates(subset=['venueId']).set_index('venueId')['name']
+        papers['venue'] = papers['venueId'].map(venue_names)
+    else:
+        papers['venue'] = VenueRegistry().map_names(papers['venue'])
+    papers['venue'] = papers['venue'].astype('category')
+    papers['pages'] = papers['pages'].apply(clean_text)
+    return {'papers': papers}
+
+
+def load_authors():
+    return {'authors': load_output('authors', columns=['authorId', 'name'], directory=FINAL_OUTPUT)}
+
+
+# ---------------------------
+# ID INTERNING
+# ---------------------------
+def intern_ids(papers, authors, authorship):
+    # Persistent tables: keys assigned by earlier runs are kept, new IDs appended
+    paper_ids = paper_id_table(PAPER_ID_TABLE)
+    paper_ids.intern(papers['paperId'])
+    author_ids = author_id_table(AUTHOR_ID_TABLE)
+    author_ids.intern(authors['authorId'])
+    author_ids.intern(authorship['authorId'])
+    return {'paper_ids': paper_ids, 'author_ids': author_ids,
+            PAPER_ID_TABLE: paper_ids.to_frame(), AUTHOR_ID_TABLE: author_ids.to_frame()}
+
+
+def key_column(table, values):
+    # Keys as a nullable integer column: IDs not in the table stay empty
+    keys = table.lookup(values)
+    column = pd.array(keys, dtype='Int64')
+    column[keys < 0] = pd.NA
+    return column
+
+
+# ---------------------------
+# NODES
+# ---------------------------
+def build_author_nodes(authors, author_ids):
+    author_nodes = pd.DataFrame({
+        'authorId': authors['authorId'].apply(lambda x: str(x).split('.')[0]),
+        'authorKey': key_column(author_ids, authors['authorId']),
+        'name': authors['name'],
+        'email': authors['name'].apply(generate_email)
+    })
+    return {'author_nodes.csv': author_nodes}
+
+
+def build_paper_nodes(papers, paper_ids, load_abstracts=LOAD_ABSTRACTS):
+    # Same file and row order as the papers stage
+    text = load_output('papers', directory=FINAL_OUTPUT,
+                       columns=['paperId', 'title', 'abstract'] if load_abstracts else ['paperId', 'title'])
+    if not text['paperId'].astype(str).equals(papers['paperId'].astype(str)):
+        raise RuntimeError("papers file changed between stages")
+    paper_nodes = pd.DataFrame({
+        'paperId': papers['paperId'],
+        'paperKey': key_column(paper_ids, papers['paperId']),
+        'title': text['title'].apply(clean_text),
+        'abstract': text['abstract'].apply(clean_text) if load_abstracts else None,
+        'pages': np.random.randint(1, 30, size=len(papers)),
+        'doi': papers['doi'],
+        'url': papers['url'],
+        'citationCount': papers['citationCount']
+    })
+    return {'paper_nodes.csv': paper_nodes}
+
+
+def build_journal_nodes(venues):
+    journals = []
+    for _, row in venues.iterrows():
+        if row['venueType'] == 'Journal':
+            journals.append({'journalName': row['name']})
+
+    journal_nodes = pd.DataFrame(journals, columns=['journalName']).drop_duplicates(subset=['journalName'])
+    return {'journal_nodes.csv': journal_nodes}
+
+
+def build_conference_nodes(venues):
+    conferences = []
+    for _, row in venues.iterrows():
+        if row['venueType'] == 'Conference':
+            conferences.append({'conferenceName': row['name']})
+
+    conference_nodes = pd.DataFrame(conferences, columns=['conferenceName']).drop_duplicates(subset=['conferenceName'])
+    return {'conferences_nodes.csv': conference_nodes}
+
+
+def build_keywords(paper_ids):
+    keywords = load_output('paper_keywords', directory=FINAL_OUTPUT)
+    keyword_nodes = pd.DataFrame({
+        'keyword': keywords['keyword']
+    }).drop_duplicates(subset=['keyword'])
+
+    # Paper has keywords
+    paper_has_keyword = pd.DataFrame({
+        'paperId': keywords['paperId'],
+        'paperKey': key_column(paper_ids, keywords['paperId']),
+        'keyword': keywords['keyword'],
+    })
+    return {'keyword_nodes.csv': keyword_nodes, 'paper_has_keyword.csv': paper_has_keyword}
+
+
+def build_proceedings(papers):
+    proceedings = []
+    for _, row in papers.iterrows():
+        city, venue = generate_city_and_venue()
+        if row['venueType'] == 'Conference':
+            proceedings.append({
+                'proceedingId': uuid.uuid4(),
+                'conferenceName': row['venue'],
+                'year': convert_int(row['year']),
+                'venue': venue,
+                'city': city
+            })
+
+    proceedings_nodes = pd.DataFrame(
+        proceedings, columns=['proceedingId', 'conferenceName', 'year', 'venue', 'city']
+    ).drop_duplicates(subset=['conferenceName', 'year'])
+    proceedings_nodes.sort_values(by=['conferenceName', 'year'], inplace=True)
+    proceedings_nodes['edition'] = proceedings_nodes.groupby('conferenceName')['year'].transform(lambda x: x - x.iloc[0] + 1).astype('Int64')
+
+    # Proceedings is part of Conference
+    proceeding_part_of_conf = proceedings_nodes[['proceedingId', 'conferenceName']].copy()
+    return {'proceedings_nodes': proceedings_nodes,
+            'proceedings_nodes.csv': proceedings_nodes,
+            'proceeding_part_of.csv': proceeding_part_of_conf}
+
+
+# ---------------------------
+# RELATIONSHIPS
+# ---------------------------
+def build_authorship(papers):
+    author_papers = []
+    for _, row in papers.iterrows():
+        paperId = row['paperId']
+        author_list = id_list(row['authors'])
+        if author_list:
+            for i, authorId in enumerate(author_list):
+                author_papers.append({
+                    'authorId': authorId,
+                    'paperId': paperId,
+                    'corresponding_author': (i == 0)
+                })
+
+    return {'authorship': pd.DataFrame(author_papers, columns=['authorId', 'paperId', 'corresponding_author'])}
+
+
+def build_reviews(papers, authors, authorship, paper_ids, author_ids, seed=SEED):
+    # Own authors are never drawn as reviewers (conflicts checked on the integer keys)
+    keyed_authorship = pd.DataFrame({
+        'authorId': author_ids.lookup(authorship['authorId']),
+        'paperId': paper_ids.lookup(authorship['paperId']),
+    })
+    paper_keys = paper_ids.lookup(papers['paperId'])
+    author_keys = author_ids.lookup(authors['authorId'])
+    reviews = assign_reviewers(paper_keys[paper_keys >= 0], author_keys[author_keys >= 0],
+                               keyed_authorship, seed=seed)
+    author_reviews_paper = pd.DataFrame({
+        'authorId': author_ids.external(reviews['authorId']),
+        'paperId': paper_ids.external(reviews['paperId']),
+        'authorKey': reviews['authorId'].to_numpy(),
+        'paperKey': reviews['paperId'].to_numpy(),
+    })
+    return {'author_reviews_paper.csv': author_reviews_paper}
+
+
+def build_published_in(papers, paper_ids):
+    paper_journal = []
+    for _, row in papers.iterrows():
+        if row['venueType'] == 'Journal':
+            paper_journal.append({
+                'paperId': row['paperId'],
+                'journalName': row['venue'],
+                'volume': random.randint(1, 50),
+                'year': convert_int(row['year'])
+            })
+
+    paper_published_in = pd.DataFrame(paper_journal, columns=['paperId', 'journalName', 'volume', 'year'])
+    paper_published_in.insert(1, 'paperKey', key_column(paper_ids, paper_published_in['paperId']))
+    return {'paper_published_in.csv': paper_published_in}
+
+
+def build_citations(papers, paper_ids):
+    # Only references to papers we have, streamed in chunks (written here, hence None)
+    write_citation_edges(papers[['paperId', 'references']], 'paper_cites_paper.csv', paper_ids=paper_ids)
+    return {'paper_cites_paper.csv': None}
+
+
+def build_presented_in(papers, proceedings_nodes, paper_ids):
+    paper_presented_in = build_paper_presented_in(papers, proceedings_nodes)
+    paper_presented_in.insert(1, 'paperKey', key_column(paper_ids, paper_presented_in['paperId']))
+    return {'paper_presented_in': paper_presented_in, 'paper_presented_in.csv': paper_presented_in}
+
+
+def build_author_writes(proceedings_nodes, paper_presented_in, authorship, paper_ids, author_ids):
+    authorship = authorship.assign(authorKey=author_ids.lookup(authorship['authorId']),
+                                   paperKey=paper_ids.lookup(authorship['paperId']))
+
+    # Conferences with >=4 editions => pick authors & add them to other editions
+    proceedings_index = ProceedingsIndex(proceedings_nodes, paper_presented_in, authorship,
+                                         paper_column='paperKey', author_column='authorKey')
+    recurring_authors = proceedings_index.add_recurring_authors(min_editions=4, rng=random)
+    recurring_authors.insert(0, 'authorId', author_ids.external(recurring_authors['authorKey']))
+    recurring_authors.insert(1, 'paperId', paper_ids.external(recurring_authors['paperKey']))
+    author_writes_paper = pd.concat([authorship, recurring_authors], ignore_index=True)
+    return {'author_writes_paper.csv': author_writes_paper}
+
+
+STAGES = [
+    Stage('venues', load_venues, outputs=['venues'],
+          sources=[output_path('venues', FINAL_OUTPUT)]),
+    Stage('papers', load_papers, inputs=['venues'], outputs=['papers'],
+          sources=[output_path('papers', FINAL_OUTPUT)]),
+    Stage('authors', load_authors, outputs=['authors'],
+          sources=[output_path('authors', FINAL_OUTPUT)]),
+    Stage('authorship', build_authorship, inputs=['papers'], outputs=['authorship']),
+    Stage('ids', intern_ids, inputs=['papers', 'authors', 'authorship'],
+          outputs=['paper_ids', 'author_ids', PAPER_ID_TABLE, AUTHOR_ID_TABLE]),
+    Stage('author_nodes', build_author_nodes, inputs=['authors', 'author_ids'], outputs=['author_nodes.csv']),
+    Stage('paper_nodes', build_paper_nodes, inputs=['papers', 'paper_ids'], outputs=['paper_nodes.csv'],
+          params={'load_abstracts': LOAD_ABSTRACTS}, sources=[output_path('papers', FINAL_OUTPUT)]),
+    Stage('journal_nodes', build_journal_nodes, inputs=['venues'], outputs=['journal_nodes.csv']),
+    Stage('conference_nodes', build_conference_nodes, inputs=['venues'], outputs=['conferences_nodes.csv']),
+    Stage('keywords', build_keywords, inputs=['paper_ids'], outputs=['keyword_nodes.csv', 'paper_has_keyword.csv'],
+          sources=[output_path('paper_keywords', FINAL_OUTPUT)]),
+    Stage('proceedings', build_proceedings, inputs=['papers'],
+          outputs=['proceedings_nodes', 'proceedings_nodes.csv', 'proceeding_part_of.csv']),
+    Stage('reviews', build_reviews, inputs=['papers', 'authors', 'authorship', 'paper_ids', 'author_ids'],
+          outputs=['author_reviews_paper.csv'], params={'seed': SEED}),
+    Stage('published_in', build_published_in, inputs=['papers', 'paper_ids'], outputs=['paper_published_in.csv']),
+    Stage('citations', build_citations, inputs=['papers', 'paper_ids'], outputs=['paper_cites_paper.csv']),
+    Stage('presented_in', build_presented_in, inputs=['papers', 'proceedings_nodes', 'paper_ids'],
+          outputs=['paper_presented_in', 'paper_presented_in.csv']),
+    Stage('author_writes', build_author_writes,
+          inputs=['proceedings_nodes', 'paper_presented_in', 'authorship', 'paper_ids', 'author_ids'],
+          outputs=['author_writes_paper.csv']),
+]
+
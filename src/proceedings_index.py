@@ -0,0 +1,127 @@
+import random
+
+import numpy as np
+import pandas as pd
+
+
+def _year(value):
+    # Missing years (None, NaN or pd.NA from nullable ints) become np.nan
+    return np.nan if pd.isna(value) else value
+
+
+def _numeric_year(values):
+    return pd.to_numeric(values, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+
+# -------------------------------------------
+# PAPER -> PROCEEDING (one merge instead of a mask per paper)
+# -------------------------------------------
+def build_paper_presented_in(papers, proceedings_nodes):
+    """
+    Links every conference paper to the proceeding of its (venue, year).
+    Papers without a venue or year are left out, as before.
+    """
+    conf_papers = papers.loc[papers['venueType'] == 'Conference', ['paperId', 'venue', 'year']]
+    left = pd.DataFrame({
+        'paperId': conf_papers['paperId'].to_numpy(),
+        'conferenceName': conf_papers['venue'].to_numpy(),
+        'year': _numeric_year(conf_papers['year']),
+    }).dropna(subset=['conferenceName', 'year'])
+    right = pd.DataFrame({
+        'proceedingId': proceedings_nodes['proceedingId'].to_numpy(),
+        'conferenceName': proceedings_nodes['conferenceName'].to_numpy(),
+        'year': _numeric_year(proceedings_nodes['year']),
+    }).dropna(subset=['conferenceName', 'year']).drop_duplicates(subset=['conferenceName', 'year'])
+
+    linked = left.merge(right, on=['conferenceName', 'year'], how='inner', sort=False)
+    return linked[['paperId', 'proceedingId']].reset_index(drop=True)
+
+
+# -------------------------------------------
+# GROUP INDEXES FOR THE MAJOR-CONFERENCE PASS
+# -------------------------------------------
+class ProceedingsIndex:
+    """
+    Lookups the major-conference pass needs, computed once:
+    conference -> its edition years, (conference, year) -> proceedingId,
+    proceedingId -> papers and paper -> authors. The authorship index is
+    kept up to date as authors are added. `paper_column` and
+    `author_column` choose the ID columns, e.g. the interned integer keys.
+    """
+
+    def __init__(self, proceedings_nodes, paper_presented_in, author_writes_paper,
+                 paper_column='paperId', author_column='authorId'):
+        self.paper_column = paper_column
+        self.author_column = author_column
+        self.years_by_conf = {
+            conf: [_year(y) for y in group.unique().tolist()]
+            for conf, group in proceedings_nodes.groupby('conferenceName', sort=True)['year']
+        }
+        self.proceeding_by_conf_year = {}
+        for proc_id, conf, year in zip(proceedings_nodes['proceedingId'],
+                                       proceedings_nodes['conferenceName'],
+                                       proceedings_nodes['year']):
+            self.proceeding_by_conf_year.setdefault((conf, _year(year)), proc_id)
+
+        self.papers_by_proceeding = {}
+        for paper_id, proc_id in zip(paper_presented_in[paper_column], paper_presented_in['proceedingId']):
+            self.papers_by_proceeding.setdefault(proc_id, []).append(paper_id)
+
+        self.authors_by_paper = {}
+        self.authorships = set()
+        for author_id, paper_id in zip(author_writes_paper[author_column], author_writes_paper[paper_column]):
+            self._add_authorship(author_id, paper_id)
+
+    def _add_authorship(self, author_id, paper_id):
+        if (paper_id, author_id) in self.authorships:
+            return False
+        self.authorships.add((paper_id, author_id))
+        self.authors_by_paper.setdefault(paper_id, []).append(author_id)
+        return True
+
+    def papers_in(self, conf, year):
+        proc_id = self.proceeding_by_conf_year.get((conf, year))
+        return self.papers_by_proceeding.get(proc_id, []) if proc_id is not None else []
+
+    def add_recurring_authors(self, min_editions=4, rng=random):
+        """
+        For every conference with at least `min_editions` editions: pick
+        one paper of a random edition, and place 2 of its authors on a
+        random paper of 3 other editions each. Returns the new
+        author/paper/corresponding_author rows as a DataFrame.
+        """
+        new_rows = []
+        for conf_name, conf_years in self.years_by_conf.items():
+            # NaN years do not count as editions
+            if sum(1 for y in conf_years if y == y) < min_editions:
+                continue
+
+            chosen_year = rng.choice(conf_years)
+            year_papers = self.papers_in(conf_name, chosen_year)
+            if not year_papers:
+                continue
+            chosen_paper = rng.choice(year_papers)
+
+            these_authors = self.authors_by_paper.get(chosen_paper, [])
+            if len(these_authors) < 2:
+                continue
+            chosen_authors = rng.sample(these_authors, 2)
+
+            other_years = [y for y in conf_years if y != chosen_year]
+            if len(other_years) < 3:
+                continue
+
+            for auth_id in chosen_authors:
+                for oy in rng.sample(other_years, 3):
+                    oy_papers = list(dict.fromkeys(self.papers_in(conf_name, oy)))
+                    if not oy_papers:
+                        continue
+                    chosen_paper_for_author = rng.choice(oy_papers)
+                    if self._add_authorship(auth_id, chosen_paper_for_author):
+                        new_rows.append({
+                            self.author_column: auth_id,
+                            self.paper_column: chosen_paper_for_author,
+                            'corresponding_author': False
+                        })
+
+        return pd.DataFrame(new_rows, columns=[self.author_column, self.paper_column, 'corresponding_author'])
@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+
+# -------------------------------------------
+# TOKEN BUCKET shared by all crawler workers
+# -------------------------------------------
+class TokenBucket:
+    """
+    Async token bucket: `rate` requests per second on average, with bursts
+    of up to `capacity`. All workers of a crawl share one bucket, so the
+    concurrency level never changes how fast we hit the API.
+
+    When the server answers 429, call `penalize(retry_after)` and every
+    worker waits until the cooldown has passed before the next request.
+    """
+
+    def __init__(self, rate=1.0, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._last
+        self._last = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+    def penalize(self, retry_after):
+        """
+        Stop handing out tokens for `retry_after` seconds and drain the
+        bucket, so the first requests after the cooldown are not a burst.
+        """
+        now = time.monotonic()
+        self._blocked_until = max(self._blocked_until, now + retry_after)
+        self._tokens = 0.0
+        self._last = self._blocked_until
+
+
+def retry_after_from_exception(exc, default=5.0):
+    """
+    Best-effort Retry-After lookup. The semanticscholar client turns 429s
+    into a bare ConnectionRefusedError, so most of the time we fall back
+    to `default`; httpx errors still carry the response headers.
+    """
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+# -------------------------------------------
+# PER-STAGE THROUGHPUT COUNTERS
+# -------------------------------------------
+class StageStats:
+    """
+    Counts requests, returned items, retries and errors for one crawl
+    stage and reports throughput against wall-clock time.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.requests = 0
+        self.items = 0
+        self.retries = 0
+        self.errors = 0
+        self.started = time.monotonic()
+        self.finished = None
+
+    def stop(self):
+        self.finished = time.monotonic()
+
+    @property
+    def elapsed(self):
+        end = self.finished if self.finished is not None else time.monotonic()
+        return end - self.started
+
+    def report(self):
+        elapsed = max(self.elapsed, 1e-9)
+        print(
+            f"[{self.name}] {self.requests} requests, {self.items} items, "
+            f"{self.retries} retries, {self.errors} errors in {elapsed:.1f}s "
+            f"({self.requests / elapsed:.2f} req/s, {self.items / elapsed:.2f} items/s)"
+        )
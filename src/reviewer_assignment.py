@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+from id_interning import normalize_author_id
+
+
+# Reviewer count per paper, biased towards 3 (as generate_weighted_reviewer_count)
+REVIEWER_COUNTS = (2, 3, 4, 5)
+REVIEWER_WEIGHTS = (0.1, 0.6, 0.2, 0.1)
+
+
+# -------------------------------------------
+# VECTORISED REVIEWER ASSIGNMENT
+# -------------------------------------------
+def _author_ids(values):
+    # Interned integer keys are used as they are; string IDs are normalised
+    values = pd.Series(values)
+    if pd.api.types.is_integer_dtype(values.dtype):
+        return values
+    return values.map(normalize_author_id)
+
+
+def paper_author_keys(author_writes_paper, paper_index, author_index):
+    """
+    Encodes every (paper, author) authorship as one int64 key
+    paper_position * n_authors + author_position, for fast conflict checks.
+    """
+    papers = author_writes_paper['paperId'].map(paper_index)
+    authors = _author_ids(author_writes_paper['authorId']).map(author_index)
+    known = papers.notna() & authors.notna()
+    return np.unique(
+        papers[known].to_numpy(np.int64) * len(author_index) + authors[known].to_numpy(np.int64)
+    )
+
+
+def assign_reviewers(paper_ids, author_ids, author_writes_paper, seed=42,
+                     counts=REVIEWER_COUNTS, weights=REVIEWER_WEIGHTS):
+    """
+    Draws reviewers for every paper at once: a reviewer count per paper
+    from `counts`/`weights`, then reviewers uniformly at random among all
+    authors, without repeats within a paper and never one of the paper's
+    own authors. Draws that hit a conflict or a repeat are redrawn, so the
+    result has the same distribution as sampling from the allowed authors
+    directly. Reproducible for a given `seed`. IDs may be strings or
+    interned integer keys (see id_interning.py).
+
+    Returns a DataFrame with columns authorId, paperId.
+    """
+    rng = np.random.default_rng(seed)
+    paper_ids = pd.Index(pd.unique(pd.Series(paper_ids)))
+    author_ids = pd.Index(pd.unique(_author_ids(author_ids)))
+    n_papers, n_authors = len(paper_ids), len(author_ids)
+
+    paper_index = pd.Series(np.arange(n_papers), index=paper_ids)
+    author_index = pd.Series(np.arange(n_authors), index=author_ids)
+    conflicts = paper_author_keys(author_writes_paper, paper_index, author_index)
+
+    per_paper = rng.choice(counts, size=n_papers, p=np.asarray(weights) / np.sum(weights))
+    # Never ask for more reviewers than there are non-authors
+    own_authors = np.bincount(conflicts // max(1, n_authors), minlength=n_papers)
+    per_paper = np.minimum(per_paper, n_authors - own_authors)
+
+    paper_slot = np.repeat(np.arange(n_papers, dtype=np.int64), per_paper)
+    reviewer = rng.integers(0, n_authors, size=len(paper_slot))
+    pending = np.arange(len(paper_slot))
+
+    while len(pending):
+        keys = paper_slot * n_authors + reviewer
+        bad = np.isin(keys, conflicts)
+        # A repeat within the same paper: keep the first draw, redraw the rest
+        order = np.argsort(keys, kind="stable")
+        repeat = np.zeros(len(keys), dtype=bool)
+        repeat[order[1:]] = keys[order[1:]] == keys[order[:-1]]
+        bad |= repeat
+
+        pending = np.nonzero(bad)[0]
+        reviewer[pending] = rng.integers(0, n_authors, size=len(pending))
+
+    return pd.DataFrame({
+        'authorId': author_ids.to_numpy()[reviewer],
+        'paperId': paper_ids.to_numpy()[paper_slot],
+    })
@@ -0,0 +1,183 @@
+import json
+import os
+import sqlite3
+import time
+from collections import defaultdict
+
+
+# -------------------------------------------
+# PERSISTENT RESPONSE CACHE (SQLite)
+# -------------------------------------------
+DEFAULT_CACHE_PATH = "s2_cache.sqlite"
+DEFAULT_TTL = 30 * 24 * 3600          # 30 days
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3      # 2 GiB of JSON payload
+
+# Returned by ResponseCache.get on a miss; a cached not-found ID is None
+MISSING = object()
+
+
+class ResponseCache:
+    """
+    On-disk cache for Semantic Scholar responses.
+
+    Entries are keyed by (endpoint, id, fields) where `fields` is the
+    sorted, comma-joined field list, so asking for a different field set
+    never returns a stale shape. Values are the raw JSON the API returned
+    (or null for IDs the API reported as not found).
+
+    Expired entries are ignored on read and removed by `evict()`, which
+    also drops least-recently-used rows until the payload fits in
+    `max_bytes`.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+        self.fetch_seconds = defaultdict(float)
+        self.fetched = defaultdict(int)
+
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                endpoint TEXT NOT NULL,
+                id TEXT NOT NULL,
+                fields TEXT NOT NULL,
+                data TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL,
+                PRIMARY KEY (endpoint, id, fields)
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self.conn.commit()
+
+    @staticmethod
+    def fields_key(fields):
+        return ",".join(sorted(fields or []))
+
+    def get_many(self, endpoint, ids, fields):
+        """
+        Returns (found, missing): `found` maps id -> cached JSON (None for
+        cached not-found IDs), `missing` lists the IDs still to fetch in
+        their original order.
+        """
+        fkey = self.fields_key(fields)
+        now = time.time()
+        found = {}
+        ids = list(ids)
+
+        # SQLite caps bound parameters, so look IDs up in slices
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT id, data, created FROM responses "
+                f"WHERE endpoint = ? AND fields = ? AND id IN ({placeholders})",
+                [endpoint, fkey, *chunk]
+            ).fetchall()
+            for rid, data, created in rows:
+                if now - created <= self.ttl:
+                    found[rid] = json.loads(data)
+
+        if found:
+            self.conn.executemany(
+                "UPDATE responses SET accessed = ? WHERE endpoint = ? AND fields = ? AND id = ?",
+                [(now, endpoint, fkey, rid) for rid in found]
+            )
+            self.conn.commit()
+
+        missing = [rid for rid in ids if rid not in found]
+        self.hits[endpoint] += len(found)
+        self.misses[endpoint] += len(missing)
+        return found, missing
+
+    def get(self, endpoint, rid, fields):
+        """Cached JSON for `rid` (None if cached as not found), or MISSING."""
+        found, _ = self.get_many(endpoint, [rid], fields)
+        return found.get(rid, MISSING)
+
+    def put_many(self, endpoint, items, fields):
+        """`items` is an iterable of (id, json_data) pairs."""
+        fkey = self.fields_key(fields)
+        now = time.time()
+        rows = []
+        for rid, data in items:
+            payload = json.dumps(data)
+            rows.append((endpoint, rid, fkey, payload, len(payload), now, now))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO responses "
+            "(endpoint, id, fields, data, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        self.conn.commit()
+
+    def put(self, endpoint, rid, fields, data):
+        self.put_many(endpoint, [(rid, data)], fields)
+
+    def invalidate(self, endpoint, ids):
+        """Drops the cached responses for `ids` (any field set), so they are refetched."""
+        ids = list(ids)
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            self.conn.execute(
+                f"DELETE FROM responses WHERE endpoint = ? AND id IN ({placeholders})",
+                [endpoint, *chunk]
+            )
+        self.conn.commit()
+
+    def record_fetch(self, endpoint, seconds, n_items):
+        """Feeds the network-time estimate in `report()`."""
+        self.fetch_seconds[endpoint] += seconds
+        self.fetched[endpoint] += n_items
+
+    def evict(self):
+        now = time.time()
+        expired = self.conn.execute(
+            "DELETE FROM responses WHERE created < ?", (now - self.ttl,)
+        ).rowcount
+
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        dropped = 0
+        if total > self.max_bytes:
+            excess = total - self.max_bytes
+            cursor = self.conn.execute("SELECT endpoint, id, fields, size FROM responses ORDER BY accessed")
+            victims = []
+            for endpoint, rid, fkey, size in cursor:
+                victims.append((endpoint, rid, fkey))
+                excess -= size
+                if excess <= 0:
+                    break
+            self.conn.executemany(
+                "DELETE FROM responses WHERE endpoint = ? AND id = ? AND fields = ?", victims
+            )
+            dropped = len(victims)
+
+        self.conn.commit()
+        if expired or dropped:
+            print(f"[cache] Evicted {expired} expired and {dropped} LRU entries")
+
+    def report(self):
+        for endpoint in sorted(set(self.hits) | set(self.misses)):
+            hits, misses = self.hits[endpoint], self.misses[endpoint]
+            total = hits + misses
+            rate = hits / total if total else 0.0
+            line = f"[cache] {endpoint}: {hits} hits, {misses} misses ({rate:.1%} hit rate)"
+            if self.fetched[endpoint]:
+                per_item = self.fetch_seconds[endpoint] / self.fetched[endpoint]
+                line += f", ~{hits * per_item:.1f}s of network time saved"
+            print(line)
+
+    def close(self):
+        self.evict()
+        self.conn.close()
+
+
+def open_cache(path=DEFAULT_CACHE_PATH, **kwargs):
+    print(f"[cache] Using {os.path.abspath(path)}")
+    return ResponseCache(path, **kwargs)
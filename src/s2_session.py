@@ -0,0 +1,83 @@
+import logging
+
+import httpx
+from semanticscholar import AsyncSemanticScholar
+from semanticscholar.ApiRequester import ApiRequester
+from semanticscholar.SemanticScholarException import (
+    BadQueryParametersException, GatewayTimeoutException,
+    InternalServerErrorException, ObjectNotFoundException)
+from tenacity import retry as rerun
+from tenacity import retry_if_exception_type, stop_after_attempt, wait_exponential
+
+logger = logging.getLogger("semanticscholar")
+
+
+# -------------------------------------------
+# ONE POOLED HTTP SESSION FOR ALL S2 CALLS
+# -------------------------------------------
+class PooledApiRequester(ApiRequester):
+    """
+    Same request/response handling as semanticscholar's ApiRequester, but
+    reuses one httpx.AsyncClient (keep-alive connection pool) instead of
+    opening a new client, TCP and TLS connection for every request.
+    """
+
+    def __init__(self, timeout, retry=True, max_connections=20):
+        super().__init__(timeout, retry)
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            )
+        )
+
+    @rerun(
+        wait=wait_exponential(min=5, max=60),
+        retry=retry_if_exception_type(ConnectionRefusedError),
+        stop=stop_after_attempt(10)
+    )
+    async def _get_data_async(self, url, parameters, headers, payload=None):
+        parameters = parameters.lstrip("&")
+        method = "POST" if payload else "GET"
+        logger.debug(f"HTTP Request: {method} {url}?{parameters}")
+
+        r = await self._client.request(
+            method, url, params=parameters, timeout=self._timeout,
+            headers=headers, json=payload
+        )
+
+        data = {}
+        if r.status_code == 200:
+            data = r.json()
+            if len(data) == 1 and "error" in data:
+                data = {}
+        elif r.status_code == 400:
+            raise BadQueryParametersException(r.json()["error"])
+        elif r.status_code == 403:
+            raise PermissionError("HTTP status 403 Forbidden.")
+        elif r.status_code == 404:
+            raise ObjectNotFoundException(r.json()["error"])
+        elif r.status_code == 429:
+            raise ConnectionRefusedError("HTTP status 429 Too Many Requests.")
+        elif r.status_code == 500:
+            raise InternalServerErrorException(r.json()["message"])
+        elif r.status_code == 504:
+            raise GatewayTimeoutException(r.json()["message"])
+
+        return data
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+def open_session(max_connections=20, **kwargs):
+    """AsyncSemanticScholar client backed by one pooled HTTP session."""
+    sch = AsyncSemanticScholar(**kwargs)
+    sch._requester = PooledApiRequester(sch.timeout, sch.retry, max_connections)
+    return sch
+
+
+async def close_session(sch):
+    if isinstance(sch._requester, PooledApiRequester):
+        await sch._requester.aclose()
@@ -0,0 +1,371 @@
+import ast
+import csv
+import hashlib
+import inspect
+import json
+import multiprocessing
+import os
+import pickle
+import random
+import resource
+import sys
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+
+# -------------------------------------------
+# STAGES
+# -------------------------------------------
+class Stage:
+    """
+    One step of a pipeline. `func(*inputs, **params)` gets the DataFrames
+    of its `inputs` and returns {output name: DataFrame}. Names ending in
+    .csv are written to the output directory (and passed on as their path,
+    for stages like the upload that hand files to another tool); anything
+    else is an intermediate pickled into the work directory. A stage that
+    writes an output file itself returns None for it. A stage depends on
+    the stages that produce its inputs, and nothing else; `sources` are
+    files it reads from outside the DAG.
+    """
+
+    def __init__(self, name, func, inputs=(), outputs=(), params=None, sources=()):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.params = params or {}
+        self.sources = list(sources)
+
+
+def artifact_path(name, workdir, outdir):
+    return os.path.join(outdir, name) if name.endswith('.csv') else os.path.join(workdir, name + '.pkl')
+
+
+def _read_artifact(name, workdir, outdir):
+    path = artifact_path(name, workdir, outdir)
+    if name.endswith('.csv'):
+        return path
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def _write_artifact(name, value, workdir, outdir):
+    path = artifact_path(name, workdir, outdir)
+    if value is None:
+        if not os.path.exists(path):
+            raise RuntimeError(f"{path} was not written")
+    elif name.endswith('.csv'):
+        value.to_csv(path, index=False)
+    else:
+        with open(path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def stage_seed(seed, name):
+    """Per-stage seed, so results do not depend on which stages ran first."""
+    return zlib.crc32(f'{seed}:{name}'.encode()) & 0xFFFFFFFF
+
+
+def file_hash(path, block_size=1 << 20):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _project_file(name, root):
+    base = os.path.join(root, *name.split('.'))
+    for path in (base + '.py', os.path.join(base, '__init__.py')):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _project_files(path, root, found):
+    """`path` and every module under `root` it imports, transitively."""
+    if path in found:
+        return
+    found.add(path)
+    with open(path, 'rb') as f:
+        tree = ast.parse(f.read(), filename=path)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            # `from package import module` imports a module as well
+            names = [node.module] + [f'{node.module}.{alias.name}' for alias in node.names]
+        else:
+            continue
+        for name in names:
+            imported = _project_file(name, root)
+            if imported is not None:
+                _project_files(imported, root, found)
+
+
+def code_hash(func):
+    """
+    Hash of the source of `func`'s module and of every project module it
+    imports, directly or through other project modules (those in the same
+    directory tree), so that editing a helper a stage calls invalidates it.
+    """
+    module = sys.modules.get(func.__module__)
+    path = getattr(module, '__file__', None)
+    if path is None:
+        try:
+            source = inspect.getsource(func)
+        except (OSError, TypeError):
+            source = f'{func.__module__}.{func.__qualname__}'
+        return hashlib.sha1(source.encode('utf-8')).hexdigest()
+    path = os.path.abspath(path)
+    root = os.path.dirname(path)
+    found = set()
+    _project_files(path, root, found)
+    digest = hashlib.sha1()
+    for path in sorted(found):
+        digest.update(os.path.relpath(path, root).encode('utf-8'))
+        digest.update(file_hash(path).encode('ascii'))
+    return digest.hexdigest()
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 ** 2 if sys.platform == 'darwin' else 1024)
+
+
+def reset_peak_rss():
+    """
+    Resets this process's peak RSS (VmHWM) to its current RSS. Linux only;
+    returns False where it cannot, and peak_rss_mb then keeps reporting
+    the peak since the process started.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        return False
+    return True
+
+
+def _peak_since_reset_mb():
+    with open('/proc/self/status', 'r') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+    return peak_rss_mb()
+
+
+def _run_stage(stage, workdir, outdir, seed):
+    # Stages run in this process (workers=1) each get their own peak, not
+    # the running maximum of every stage before them
+    own_peak = reset_peak_rss()
+    started = time.perf_counter()
+    random.seed(stage_seed(seed, stage.name))
+    np.random.seed(stage_seed(seed, stage.name))
+
+    inputs = [_read_artifact(name, workdir, outdir) for name in stage.inputs]
+    results = stage.func(*inputs, **stage.params)
+    missing = set(stage.outputs) - set(results)
+    if missing:
+        raise RuntimeError(f"Stage {stage.name} did not produce {sorted(missing)}")
+    for name in stage.outputs:
+        _write_artifact(name, results[name], workdir, outdir)
+    seconds = time.perf_counter() - started
+    return seconds, _peak_since_reset_mb() if own_peak else peak_rss_mb(), own_peak
+
+
+# -------------------------------------------
+# STAGE CACHE (fingerprint of the last run -> outputs still on disk)
+# -------------------------------------------
+def _file_stats(paths):
+    stats = {}
+    for path in paths:
+        st = os.stat(path)
+        stats[path] = [st.st_size, st.st_mtime_ns]
+    return stats
+
+
+class StageCache:
+    """
+    Keeps, per stage, the fingerprint of its last successful run and the
+    size and mtime of every output it wrote. A stage is fresh when its
+    fingerprint is unchanged and its outputs are still those files.
+    Per-stage timings of every run are appended to timings.csv.
+    """
+
+    def __init__(self, workdir):
+        self.path = os.path.join(workdir, 'stage_cache.json')
+        self.timings_path = os.path.join(workdir, 'timings.csv')
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def is_fresh(self, name, fingerprint, paths):
+        entry = self.entries.get(name)
+        if entry is None or entry['fingerprint'] != fingerprint:
+            return False
+        try:
+            return _file_stats(paths) == entry['outputs']
+        except FileNotFoundError:
+            return False
+
+    def record(self, name, fingerprint, paths, seconds, peak):
+        self.entries[name] = {'fingerprint': fingerprint, 'outputs': _file_stats(paths),
+                              'seconds': seconds, 'peak_mb': peak, 'finished': time.time()}
+        # Saved after every stage, so an interrupted run keeps what it finished
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def log_timings(self, report):
+        is_new = not os.path.exists(self.timings_path)
+        started = time.strftime('%Y-%m-%d %H:%M:%S')
+        with open(self.timings_path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if is_new:
+                writer.writerow(['run', 'stage', 'status', 'seconds', 'peak_rss_mb'])
+            for name, (seconds, peak, status) in report.items():
+                writer.writerow([started, name, status, f'{seconds:.3f}', f'{peak:.0f}'])
+
+
+# -------------------------------------------
+# DAG RUNNER
+# -------------------------------------------
+def _dependencies(stages):
+    producers = {}
+    for stage in stages:
+        for name in stage.outputs:
+            if name in producers:
+                raise ValueError(f"{name} is produced by both {producers[name]} and {stage.name}")
+            producers[name] = stage.name
+    deps = {}
+    for stage in stages:
+        unknown = [name for name in stage.inputs if name not in producers]
+        if unknown:
+            raise ValueError(f"Stage {stage.name} needs {unknown}, which no stage produces")
+        deps[stage.name] = {producers[name] for name in stage.inputs}
+    return deps
+
+
+def _topological_order(stages, deps):
+    order, done = [], set()
+    while len(order) < len(stages):
+        ready = [s for s in stages if s.name not in done and deps[s.name] <= done]
+        if not ready:
+            raise ValueError(f"Dependency cycle between {sorted(s.name for s in stages if s.name not in done)}")
+        for stage in ready:
+            order.append(stage)
+            done.add(stage.name)
+    return order
+
+
+def fingerprints(stages, seed):
+    """
+    Hash per stage of everything its outputs depend on: its code (see
+    code_hash), params and seed, the content of its source files and the
+    fingerprints of the stages it reads from. An upstream change therefore
+    changes every downstream fingerprint too.
+    """
+    deps = _dependencies(stages)
+    by_output, result = {}, {}
+    for stage in _topological_order(stages, deps):
+        payload = {
+            'code': code_hash(stage.func),
+            'params': repr(sorted(stage.params.items())),
+            'seed': stage_seed(seed, stage.name),
+            'sources': {path: file_hash(path) if os.path.exists(path) else None for path in stage.sources},
+            'inputs': {name: by_output[name] for name in stage.inputs},
+        }
+        digest = hashlib.sha1(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+        result[stage.name] = digest
+        for name in stage.outputs:
+            by_output[name] = digest
+    return result
+
+
+def run_stages(stages, workers=None, workdir='.stages', outdir='.', seed=42, use_cache=True, force=()):
+    """
+    Runs every stage as soon as the stages it depends on are done.
+    With workers > 1 independent stages run in parallel, each in a fresh
+    process, so its peak RSS is the stage's own; with workers=1 the peak
+    is reset before each stage where the OS allows it (Linux), and marked
+    as cumulative otherwise. With `use_cache`, a
+    stage whose fingerprint and outputs are unchanged is skipped, unless
+    it is in `force` or a stage it depends on ran. Prints and returns
+    {stage: (seconds, peak RSS MB, 'ran' or 'cached')}.
+    """
+    os.makedirs(workdir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    by_name = {stage.name: stage for stage in stages}
+    deps = _dependencies(stages)
+    _topological_order(stages, deps)   # raises on a cycle
+    cache = StageCache(workdir) if use_cache else None
+    prints = fingerprints(stages, seed) if use_cache else {}
+    done, ran, report, cumulative = set(), set(), {}, set()
+    started = time.perf_counter()
+
+    def output_paths(name):
+        return [artifact_path(output, workdir, outdir) for output in by_name[name].outputs]
+
+    def is_cached(name):
+        if cache is None or name in force or deps[name] & ran:
+            return False
+        return cache.is_fresh(name, prints[name], output_paths(name))
+
+    def finish(name, seconds, peak, own_peak):
+        report[name] = (seconds, peak, 'ran')
+        # A fresh child process starts with its own peak anyway
+        if workers == 1 and not own_peak:
+            cumulative.add(name)
+        done.add(name)
+        ran.add(name)
+        if cache is not None:
+            cache.record(name, prints[name], output_paths(name), seconds, peak)
+
+    def ready():
+        waiting = [name for name in by_name
+                   if name not in done and name not in running and deps[name] <= done]
+        # Cached stages are done straight away, which may make others ready
+        for name in waiting:
+            if is_cached(name):
+                entry = cache.entries[name]
+                report[name] = (entry['seconds'], entry['peak_mb'], 'cached')
+                done.add(name)
+        return [name for name in waiting if name not in done]
+
+    running = {}
+    if workers == 1:
+        while len(done) < len(by_name):
+            for name in ready():
+                finish(name, *_run_stage(by_name[name], workdir, outdir, seed))
+    else:
+        # spawn + one task per child: a clean process (and RSS) per stage
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, max_tasks_per_child=1) as pool:
+            while len(done) < len(by_name):
+                for name in ready():
+                    running[name] = pool.submit(_run_stage, by_name[name], workdir, outdir, seed)
+                if not running:
+                    continue
+                finished, _ = wait(running.values(), return_when=FIRST_COMPLETED)
+                for name, future in list(running.items()):
+                    if future in finished:
+                        del running[name]
+                        finish(name, *future.result())
+
+    total = time.perf_counter() - started
+    skipped = sum(1 for _, _, status in report.values() if status == 'cached')
+    print(f"[stages] {len(report) - skipped} stages run, {skipped} cached, on {workers} worker(s) in {total:.1f}s")
+    for name in by_name:
+        seconds, peak, status = report[name]
+        note = '  (peak of all stages so far)' if name in cumulative else ''
+        print(f"    {name:20s} {seconds:7.2f}s  peak RSS {peak:7.0f} MB  {status}{note}")
+    if cache is not None:
+        cache.log_timings({name: report[name] for name in by_name})
+    return report
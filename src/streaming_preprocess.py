@@ -0,0 +1,260 @@
+import os
+import random
+import resource
+import sys
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from preprocessing_common import (generate_email, generate_city_and_venue, clean_text,
+                                  convert_int, id_list, iter_output)
+from venue_normalizer import clean_venue_name
+from reviewer_assignment import assign_reviewers
+from citation_edges import explode_references
+from proceedings_index import ProceedingsIndex
+from preprocessing_stages import STAGES
+from id_interning import PAPER_ID_TABLE, AUTHOR_ID_TABLE, normalize_author_id, paper_id_table, author_id_table
+
+
+# -------------------------------------------
+# OUT-OF-CORE PREPROCESSING
+# -------------------------------------------
+# Same node/edge CSVs as PartA.2_BaliasinaPatricio_Preprocessing.py, but
+# every input is read CHUNK_SIZE rows at a time and every output is
+# appended chunk by chunk. Titles and abstracts are never held for more
+# than one chunk; only the lookup indexes below stay in memory:
+#   - the paper and author ID tables (citation semi-join, integer keys)
+#   - authorship (paper, author) key pairs (reviewer conflicts, recurring authors)
+#   - (conference, year) -> proceeding and paper -> proceeding
+#   - venueId -> name, author IDs, distinct keyword / journal / conference names
+
+CHUNK_SIZE = 50_000
+
+PAPER_COLUMNS = ['paperId', 'title', 'abstract', 'doi', 'url', 'citationCount', 'venue',
+                 'venueId', 'venueType', 'year', 'references', 'authors']
+
+
+class CsvSink:
+    """Appends DataFrame chunks to one CSV, header written once."""
+
+    def __init__(self, filename, columns):
+        self.columns = columns
+        self.rows = 0
+        self._file = open(filename, 'w', newline='', encoding='utf-8')
+        pd.DataFrame(columns=columns).to_csv(self._file, index=False)
+
+    def write(self, df):
+        if len(df):
+            df[self.columns].to_csv(self._file, header=False, index=False)
+            self.rows += len(df)
+
+    def close(self):
+        self._file.close()
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 ** 2 if sys.platform == 'darwin' else 1024)
+
+
+def _venue_names(directory, chunk_size):
+    """venueId -> name, journal names and conference names, from venues."""
+    names, journals, conferences = {}, {}, {}
+    for chunk in iter_output('venues', chunk_size, directory=directory):
+        if 'venueId' not in chunk.columns:
+            chunk = chunk.assign(name=chunk['name'].map(clean_venue_name))
+        else:
+            for vid, name in zip(chunk['venueId'], chunk['name']):
+                names.setdefault(vid, name)
+        for vtype, name in zip(chunk['venueType'], chunk['name']):
+            if vtype == 'Journal':
+                journals.setdefault(name, None)
+            elif vtype == 'Conference':
+                conferences.setdefault(name, None)
+    return names, list(journals), list(conferences)
+
+
+def run_streaming(directory='final_output', chunk_size=CHUNK_SIZE, seed=42):
+    random.seed(seed)
+    np.random.seed(seed)
+    started = time.perf_counter()
+
+    # Nodes from the small tables
+    venue_names, journal_names, conference_names = _venue_names(directory, chunk_size)
+    pd.DataFrame({'journalName': journal_names}).to_csv('journal_nodes.csv', index=False)
+    pd.DataFrame({'conferenceName': conference_names}).to_csv('conferences_nodes.csv', index=False)
+
+    author_table = author_id_table(AUTHOR_ID_TABLE)
+    author_keys = []
+    authors_out = CsvSink('author_nodes.csv', ['authorId', 'authorKey', 'name', 'email'])
+    for chunk in iter_output('authors', chunk_size, columns=['authorId', 'name'], directory=directory):
+        keys = author_table.intern(chunk['authorId'])
+        author_keys.append(keys[keys >= 0])
+        authors_out.write(pd.DataFrame({
+            'authorId': chunk['authorId'].map(normalize_author_id).to_numpy(),
+            'authorKey': keys,
+            'name': chunk['name'].to_numpy(),
+            'email': chunk['name'].map(generate_email).to_numpy(),
+        }))
+    authors_out.close()
+    author_keys = np.concatenate(author_keys) if author_keys else np.empty(0, dtype=np.int64)
+
+    # Pass 1 over papers: only the IDs, interned for the citation semi-join
+    paper_table = paper_id_table(PAPER_ID_TABLE)
+    paper_keys = []
+    for chunk in iter_output('papers', chunk_size, columns=['paperId'], directory=directory):
+        keys = paper_table.intern(chunk['paperId'])
+        # -1 (missing paperId) would index the last paper of the table
+        paper_keys.append(keys[keys >= 0])
+    paper_keys = np.concatenate(paper_keys) if paper_keys else np.empty(0, dtype=np.int64)
+    # The table may also hold papers of earlier runs: mark this run's
+    known_papers = np.zeros(len(paper_table), dtype=bool)
+    known_papers[paper_keys] = True
+
+    # Keywords after pass 1, so that every row carries its paperKey
+    keywords_seen = {}
+    has_keyword_out = CsvSink('paper_has_keyword.csv', ['paperId', 'paperKey', 'keyword'])
+    for chunk in iter_output('paper_keywords', chunk_size, directory=directory):
+        chunk['paperKey'] = paper_table.lookup(chunk['paperId'])
+        has_keyword_out.write(chunk)
+        keywords_seen.update(dict.fromkeys(chunk['keyword']))
+    has_keyword_out.close()
+    pd.DataFrame({'keyword': list(keywords_seen)}).to_csv('keyword_nodes.csv', index=False)
+
+    # Pass 2 over papers: everything, written out chunk by chunk
+    paper_nodes_out = CsvSink('paper_nodes.csv', ['paperId', 'paperKey', 'title', 'abstract', 'pages', 'doi', 'url', 'citationCount'])
+    published_out = CsvSink('paper_published_in.csv', ['paperId', 'paperKey', 'journalName', 'volume', 'year'])
+    cites_out = CsvSink('paper_cites_paper.csv', ['sourcePaperId', 'targetPaperId', 'sourcePaperKey', 'targetPaperKey'])
+    writes_out = CsvSink('author_writes_paper.csv', ['authorId', 'paperId', 'corresponding_author', 'authorKey', 'paperKey'])
+    presented_out = CsvSink('paper_presented_in.csv', ['paperId', 'paperKey', 'proceedingId'])
+
+    proceedings = {}           # (conferenceName, year) -> proceeding row
+    presented_pairs = []       # (paperKey, proceedingId)
+    authorship_pairs = []      # per chunk: (authorKey, paperKey) int64 arrays
+
+    for chunk in iter_output('papers', chunk_size, columns=PAPER_COLUMNS, directory=directory):
+        if 'venueId' in chunk.columns and venue_names:
+            chunk['venue'] = chunk['venueId'].map(venue_names)
+        else:
+            chunk['venue'] = chunk['venue'].map(clean_venue_name)
+
+        chunk['paperKey'] = paper_table.lookup(chunk['paperId'])
+        paper_nodes_out.write(pd.DataFrame({
+            'paperId': chunk['paperId'].to_numpy(),
+            'paperKey': chunk['paperKey'].to_numpy(),
+            'title': chunk['title'].map(clean_text).to_numpy(),
+            'abstract': chunk['abstract'].map(clean_text).to_numpy(),
+            'pages': np.random.randint(1, 30, size=len(chunk)),
+            'doi': chunk['doi'].to_numpy(),
+            'url': chunk['url'].to_numpy(),
+            'citationCount': chunk['citationCount'].to_numpy(),
+        }))
+
+        # Only this chunk's references are exploded, matched against all papers
+        edges = explode_references(chunk['paperId'].astype(str), chunk['references'])
+        targets = paper_table.lookup(edges['targetPaperId'])
+        found = targets >= 0
+        found[found] = known_papers[targets[found]]
+        edges = edges[found].reset_index(drop=True)
+        edges['sourcePaperKey'] = paper_table.lookup(edges['sourcePaperId'])
+        edges['targetPaperKey'] = targets[found]
+        cites_out.write(edges)
+
+        journal_rows, chunk_authorships, chunk_presented = [], [], []
+        for paper_id, paper_key, venue, venue_type, year, authors in zip(
+            chunk['paperId'], chunk['paperKey'], chunk['venue'], chunk['venueType'], chunk['year'], chunk['authors']
+        ):
+            city, place = generate_city_and_venue()
+            if venue_type == 'Journal':
+                journal_rows.append({'paperId': paper_id, 'paperKey': paper_key, 'journalName': venue,
+                                     'volume': random.randint(1, 50), 'year': convert_int(year)})
+            elif venue_type == 'Conference':
+                year = convert_int(year)
+                # Missing values share one key, like drop_duplicates
+                key = (None if pd.isna(venue) else venue, None if pd.isna(year) else year)
+                if key not in proceedings:
+                    proceedings[key] = {'proceedingId': uuid.uuid4(), 'conferenceName': venue,
+                                        'year': year, 'venue': place, 'city': city}
+                # NaN venue or year never matches a proceeding
+                if not (pd.isna(venue) or pd.isna(year)):
+                    chunk_presented.append((paper_id, paper_key, proceedings[key]['proceedingId']))
+            for i, author_id in enumerate(id_list(authors)):
+                chunk_authorships.append((author_id, paper_id, i == 0))
+
+        writes = pd.DataFrame(chunk_authorships, columns=writes_out.columns[:3])
+        writes['authorKey'] = author_table.intern(writes['authorId'])
+        writes['paperKey'] = paper_table.lookup(writes['paperId'])
+        published_out.write(pd.DataFrame(journal_rows, columns=published_out.columns))
+        writes_out.write(writes)
+        presented_out.write(pd.DataFrame(chunk_presented, columns=presented_out.columns))
+        authorship_pairs.append((writes['authorKey'].to_numpy(np.int64), writes['paperKey'].to_numpy(np.int64)))
+        presented_pairs.extend((paper_key, proc_id) for _, paper_key, proc_id in chunk_presented)
+        print(f"[streaming] {paper_nodes_out.rows} papers written, peak RSS {peak_rss_mb():.0f} MB")
+
+    for sink in (paper_nodes_out, published_out, cites_out, presented_out):
+        sink.close()
+
+    proceedings_nodes = pd.DataFrame(list(proceedings.values()),
+                                     columns=['proceedingId', 'conferenceName', 'year', 'venue', 'city'])
+    proceedings_nodes.sort_values(by=['conferenceName', 'year'], inplace=True)
+    proceedings_nodes['edition'] = proceedings_nodes.groupby('conferenceName')['year'].transform(
+        lambda x: x - x.iloc[0] + 1).astype('Int64')
+    proceedings_nodes.to_csv('proceedings_nodes.csv', index=False)
+    proceedings_nodes[['proceedingId', 'conferenceName']].to_csv('proceeding_part_of.csv', index=False)
+
+    # Reviewers and recurring authors are drawn on the integer keys
+    author_writes_paper = pd.DataFrame({
+        'authorId': np.concatenate([a for a, _ in authorship_pairs] or [np.empty(0, dtype=np.int64)]),
+        'paperId': np.concatenate([p for _, p in authorship_pairs] or [np.empty(0, dtype=np.int64)]),
+    })
+    reviews = assign_reviewers(paper_keys, author_keys, author_writes_paper, seed=seed)
+    pd.DataFrame({
+        'authorId': author_table.external(reviews['authorId']),
+        'paperId': paper_table.external(reviews['paperId']),
+        'authorKey': reviews['authorId'].to_numpy(),
+        'paperKey': reviews['paperId'].to_numpy(),
+    }).to_csv('author_reviews_paper.csv', index=False)
+
+    paper_presented_in = pd.DataFrame(presented_pairs, columns=['paperKey', 'proceedingId'])
+    index = ProceedingsIndex(proceedings_nodes, paper_presented_in, author_writes_paper.rename(columns={
+        'authorId': 'authorKey', 'paperId': 'paperKey'}), paper_column='paperKey', author_column='authorKey')
+    recurring = index.add_recurring_authors(min_editions=4, rng=random)
+    recurring['authorId'] = author_table.external(recurring['authorKey'])
+    recurring['paperId'] = paper_table.external(recurring['paperKey'])
+    writes_out.write(recurring)
+    writes_out.close()
+
+    paper_table.save(PAPER_ID_TABLE)
+    author_table.save(AUTHOR_ID_TABLE)
+
+    print(f"[streaming] Done in {time.perf_counter() - started:.1f}s, "
+          f"peak RSS {peak_rss_mb():.0f} MB, chunk size {chunk_size}")
+
+
+def check_header_parity(reference_dir, directory='.'):
+    """
+    Compares the header of every node/edge CSV with the one the stage
+    DAG wrote to `reference_dir`. Raises ValueError listing the files
+    whose columns differ, since the upload matches on them by name.
+    """
+    mismatches = []
+    for name in (name for stage in STAGES for name in stage.outputs if name.endswith('.csv')):
+        headers = []
+        for path in (os.path.join(directory, name), os.path.join(reference_dir, name)):
+            with open(path, newline='', encoding='utf-8') as f:
+                headers.append(f.readline().strip())
+        if headers[0] != headers[1]:
+            mismatches.append(f"{name}: {headers[0]} (stage DAG: {headers[1]})")
+    if mismatches:
+        raise ValueError("Streaming output differs from the stage DAG:\n  " + "\n  ".join(mismatches))
+    print(f"[streaming] Headers match the stage DAG outputs in {reference_dir}")
+
+
+if __name__ == "__main__":
+    # python streaming_preprocess.py [chunk_size] [stage DAG output dir to compare headers with]
+    run_streaming(chunk_size=int(sys.argv[1]) if len(sys.argv) > 1 else CHUNK_SIZE)
+    if len(sys.argv) > 2:
+        check_header_parity(sys.argv[2])
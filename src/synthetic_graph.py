@@ -0,0 +1,337 @@
+import os
+import sys
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from preprocessing_common import EMAIL_DOMAINS, CITY_UNIVERSITY_PAIRS
+from reviewer_assignment import assign_reviewers
+
+
+# -------------------------------------------
+# SYNTHETIC SCHOLARLY GRAPH
+# -------------------------------------------
+# Writes the same node/edge CSVs as the preprocessing script (the
+# data/ingested_data schema), without touching the API, for load-testing
+# the upload and the queries. Everything is drawn with one seeded numpy
+# Generator, a whole column at a time. Paper and author positions are
+# the integer keys (paperKey/authorKey, as in id_interning.py).
+#
+# Degree distributions:
+#   - authors per paper: 1 + negative binomial (mean ~5, long tail)
+#   - papers per author: Zipf with exponent 1 (Lotka's law), every author
+#     writes at least one paper
+#   - papers per journal / conference: Zipf
+#   - citations: negative binomial out-degree; targets are older papers
+#     drawn proportionally to a Pareto "fitness", so in-degree is heavy
+#     tailed and old, fit papers collect most citations
+
+SCALE_FACTORS = (1, 10, 100)
+
+# Size of the crawled graph in data/ingested_data, i.e. scale factor 1
+BASE_SIZES = {'papers': 14_300, 'authors': 53_295, 'journals': 2_362, 'conferences': 1_126}
+
+JOURNAL_SHARE = 0.63          # published_in vs presented_in in the crawl
+FIRST_YEAR, LAST_YEAR = 1990, 2024
+MEAN_AUTHORS_PER_PAPER = 5
+MEAN_REFERENCES = 12
+MEAN_KEYWORDS = 1.5
+VENUE_ZIPF = 1.1
+
+# Keywords of the crawl: the title keywords plus the fields of study
+KEYWORDS = [
+    'data management', 'indexing', 'data modeling', 'big data', 'data processing',
+    'data storage', 'data querying', 'artificial intelligence', 'machine learning', 'ethics',
+    'semantic data', 'data warehouse', 'process mining', 'decision support',
+    'Computer Science', 'Medicine', 'Chemistry', 'Biology', 'Materials Science', 'Physics',
+    'Geology', 'Psychology', 'Art', 'History', 'Geography', 'Sociology', 'Business',
+    'Political Science', 'Economics', 'Philosophy', 'Mathematics', 'Engineering',
+    'Environmental Science',
+]
+
+TOPICS = [
+    'Data Engineering', 'Knowledge Discovery', 'Information Systems', 'Databases',
+    'Machine Learning', 'Semantic Web', 'Distributed Computing', 'Software Engineering',
+    'Computational Biology', 'Process Mining', 'Artificial Intelligence', 'Data Science',
+]
+
+FIRST_NAMES = [
+    'Ana', 'Wei', 'John', 'Maria', 'Li', 'David', 'Sara', 'Hiroshi', 'Elena', 'Ahmed',
+    'Laura', 'Jun', 'Pablo', 'Anna', 'Michael', 'Yuki', 'Fatima', 'Lucas', 'Ines', 'Chen',
+]
+LAST_NAMES = [
+    'Wang', 'Smith', 'Garcia', 'Kim', 'Müller', 'Rossi', 'Tanaka', 'Silva', 'Zhang', 'Novak',
+    'Patel', 'Martin', 'Lopez', 'Nguyen', 'Johnson', 'Cohen', 'Ivanova', 'Dubois', 'Khan', 'Li',
+]
+
+WORDS = (
+    'data graph query model system approach method analysis learning network scalable '
+    'efficient semantic distributed index storage process knowledge evaluation framework '
+    'large scale real time optimization benchmark algorithm structure pattern mining '
+    'representation inference integration management quality schema streaming cloud'
+).split()
+
+
+# -------------------------------------------
+# HELPERS
+# -------------------------------------------
+def zipf_weights(n, exponent, rng):
+    """Zipf probabilities over n items, shuffled so rank is not the ID order."""
+    weights = np.arange(1, n + 1, dtype=np.float64) ** -exponent
+    rng.shuffle(weights)
+    return weights / weights.sum()
+
+
+def hex_ids(n, nbytes, rng):
+    # Semantic Scholar style paper IDs: 2 * nbytes hex characters
+    raw = rng.integers(0, 256, size=n * nbytes, dtype=np.uint8).tobytes().hex()
+    width = 2 * nbytes
+    return np.array([raw[i:i + width] for i in range(0, len(raw), width)], dtype=object)
+
+
+def numeric_ids(n, rng, low=1_000_000, high=3_000_000_000):
+    # Distinct, shuffled integer IDs in [low, high), as strings like the crawl's
+    step = max(1, (high - low) // max(n, 1))
+    ids = low + np.arange(n, dtype=np.int64) * step + rng.integers(0, step, size=n)
+    rng.shuffle(ids)
+    return ids.astype(str).astype(object)
+
+
+def uuids(n, rng):
+    raw = rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+    return np.array([str(uuid.UUID(bytes=row.tobytes(), version=4)) for row in raw], dtype=object)
+
+
+def sentences(n, rng, min_words, max_words):
+    lengths = rng.integers(min_words, max_words + 1, size=n)
+    words = np.array(WORDS, dtype=object)[rng.integers(0, len(WORDS), size=lengths.sum())]
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    return [' '.join(words[bounds[i]:bounds[i + 1]]).capitalize() for i in range(n)]
+
+
+def scaled_sizes(scale):
+    return {name: max(1, int(round(size * scale))) for name, size in BASE_SIZES.items()}
+
+
+# -------------------------------------------
+# NODES AND EDGES
+# -------------------------------------------
+def make_authors(n, rng):
+    first = np.array(FIRST_NAMES, dtype=object)[rng.integers(0, len(FIRST_NAMES), size=n)]
+    last = np.array(LAST_NAMES, dtype=object)[rng.integers(0, len(LAST_NAMES), size=n)]
+    names = pd.Series(first + ' ' + last)
+    # Same shape as generate_email
+    usernames = names.str.replace(r'[^\w\s]', '', regex=True).str.lower().str.replace(' ', '.')
+    domains = np.array(EMAIL_DOMAINS, dtype=object)[rng.integers(0, len(EMAIL_DOMAINS), size=n)]
+    return pd.DataFrame({
+        'authorId': numeric_ids(n, rng),
+        'authorKey': np.arange(n, dtype=np.int64),
+        'name': names.to_numpy(),
+        'email': (usernames + '@' + domains).to_numpy(),
+    })
+
+
+def make_authorship(n_papers, n_authors, rng):
+    """(paper position, author position) pairs; the first author of each paper is corresponding."""
+    team = 1 + rng.negative_binomial(1, 1 / MEAN_AUTHORS_PER_PAPER, size=n_papers)
+    paper = np.repeat(np.arange(n_papers), team)
+    author = rng.choice(n_authors, size=len(paper), p=zipf_weights(n_authors, 1.0, rng))
+    # Every author writes something: the first slots go to a permutation of all authors
+    covered = min(n_authors, len(paper))
+    slots = rng.permutation(len(paper))[:covered]
+    author[slots] = rng.permutation(n_authors)[:covered]
+
+    writes = pd.DataFrame({'paper': paper, 'author': author}).drop_duplicates()
+    writes['corresponding_author'] = ~writes['paper'].duplicated()
+    return writes
+
+
+def make_citations(years, rng):
+    """
+    Citation edges between paper positions. Each paper cites older (or
+    same-year, earlier) papers, chosen proportionally to their fitness.
+    """
+    n = len(years)
+    order = np.argsort(years, kind='stable')          # chronological rank -> paper
+    fitness = rng.pareto(2.0, size=n) + 1.0
+    cumulative = np.cumsum(fitness[order])
+
+    out_degree = rng.negative_binomial(1.5, 1.5 / (1.5 + MEAN_REFERENCES), size=n)
+    out_degree = np.minimum(out_degree, np.arange(n))  # rank r has only r older papers
+    source_rank = np.repeat(np.arange(n), out_degree)
+    draws = rng.random(len(source_rank)) * cumulative[np.maximum(source_rank - 1, 0)]
+    target_rank = np.minimum(np.searchsorted(cumulative, draws, side='right'), source_rank - 1)
+
+    edges = pd.DataFrame({'source': order[source_rank], 'target': order[target_rank]}).drop_duplicates()
+    return edges
+
+
+def make_proceedings(conference, years, conference_names, rng):
+    """Proceeding per distinct (conference, year), numbered like the preprocessing script."""
+    keys, paper_proceeding = np.unique(conference * (LAST_YEAR + 1) + years, return_inverse=True)
+    proc_conf, proc_year = keys // (LAST_YEAR + 1), keys % (LAST_YEAR + 1)
+
+    cities = list(CITY_UNIVERSITY_PAIRS)
+    city = rng.integers(0, len(cities), size=len(keys))
+    n_venues = np.array([len(CITY_UNIVERSITY_PAIRS[c]) for c in cities])
+    venue = (rng.random(len(keys)) * n_venues[city]).astype(int)
+
+    proceedings = pd.DataFrame({
+        'proceedingId': uuids(len(keys), rng),
+        'conferenceName': conference_names[proc_conf],
+        'year': proc_year,
+        'venue': [CITY_UNIVERSITY_PAIRS[cities[c]][v] for c, v in zip(city, venue)],
+        'city': np.array(cities, dtype=object)[city],
+    })
+    first_year = proceedings.groupby('conferenceName')['year'].transform('min')
+    proceedings['edition'] = proceedings['year'] - first_year + 1
+    return proceedings, paper_proceeding
+
+
+def write_paper_nodes(filename, paper_ids, citation_count, rng, chunk_size):
+    # Titles and abstracts are the bulk of the data: built and written per chunk
+    n = len(paper_ids)
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        for start in range(0, n, chunk_size):
+            ids = paper_ids[start:start + chunk_size]
+            k = len(ids)
+            abstracts = [' '.join(s) for s in zip(*(sentences(k, rng, 8, 20) for _ in range(6)))]
+            pd.DataFrame({
+                'paperId': ids,
+                'paperKey': np.arange(start, start + k, dtype=np.int64),
+                'title': sentences(k, rng, 5, 12),
+                'abstract': abstracts,
+                'pages': rng.integers(1, 30, size=k),
+                'doi': [f'10.5555/synthetic.{i}' for i in range(start, start + k)],
+                'url': 'https://www.semanticscholar.org/paper/' + pd.Series(ids),
+                'citationCount': citation_count[start:start + k],
+            }).to_csv(f, header=(start == 0), index=False)
+
+
+# -------------------------------------------
+# GENERATOR
+# -------------------------------------------
+def generate(scale=1, outdir=None, seed=42, chunk_size=100_000):
+    """
+    Writes a complete node/edge CSV set at `scale` times the size of the
+    crawl to `outdir` (default synthetic_<scale>x) and returns {file: rows}.
+    """
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    sizes = scaled_sizes(scale)
+    outdir = outdir or f'synthetic_{scale}x'
+    os.makedirs(outdir, exist_ok=True)
+    rows = {}
+
+    def write(name, df):
+        df.to_csv(os.path.join(outdir, name), index=False)
+        rows[name] = len(df)
+
+    # Venues and keywords
+    journal_names = np.array([f'Journal of {TOPICS[i % len(TOPICS)]} {i}' for i in range(sizes['journals'])], dtype=object)
+    conference_names = np.array([f'International Conference on {TOPICS[i % len(TOPICS)]} {i}'
+                                 for i in range(sizes['conferences'])], dtype=object)
+    write('journal_nodes.csv', pd.DataFrame({'journalName': journal_names}))
+    write('conferences_nodes.csv', pd.DataFrame({'conferenceName': conference_names}))
+    write('keyword_nodes.csv', pd.DataFrame({'keyword': KEYWORDS}))
+
+    # Authors
+    authors = make_authors(sizes['authors'], rng)
+    write('author_nodes.csv', authors)
+    write('author_ids.csv', authors[['authorKey', 'authorId']])
+    author_ids = authors['authorId'].to_numpy()
+
+    # Papers: year skewed to recent, a journal or a conference each
+    n = sizes['papers']
+    paper_ids = hex_ids(n, 20, rng)
+    write('paper_ids.csv', pd.DataFrame({'paperKey': np.arange(n, dtype=np.int64), 'paperId': paper_ids}))
+    years = np.maximum(LAST_YEAR - rng.exponential(8.0, size=n).astype(int), FIRST_YEAR)
+    is_journal = rng.random(n) < JOURNAL_SHARE
+
+    journal_papers = np.flatnonzero(is_journal)
+    journal = rng.choice(len(journal_names), size=len(journal_papers),
+                         p=zipf_weights(len(journal_names), VENUE_ZIPF, rng))
+    write('paper_published_in.csv', pd.DataFrame({
+        'paperId': paper_ids[journal_papers],
+        'paperKey': journal_papers,
+        'journalName': journal_names[journal],
+        'volume': rng.integers(1, 51, size=len(journal_papers)),
+        'year': years[journal_papers],
+    }))
+
+    conference_papers = np.flatnonzero(~is_journal)
+    conference = rng.choice(len(conference_names), size=len(conference_papers),
+                            p=zipf_weights(len(conference_names), VENUE_ZIPF, rng))
+    proceedings, paper_proceeding = make_proceedings(conference, years[conference_papers], conference_names, rng)
+    write('paper_presented_in.csv', pd.DataFrame({
+        'paperId': paper_ids[conference_papers],
+        'paperKey': conference_papers,
+        'proceedingId': proceedings['proceedingId'].to_numpy()[paper_proceeding],
+    }))
+    proceedings.sort_values(by=['conferenceName', 'year'], inplace=True)
+    write('proceedings_nodes.csv', proceedings)
+    write('proceeding_part_of.csv', proceedings[['proceedingId', 'conferenceName']])
+
+    # Authorship and reviews
+    writes = make_authorship(n, len(author_ids), rng)
+    write('author_writes_paper.csv', pd.DataFrame({
+        'authorId': author_ids[writes['author'].to_numpy()],
+        'paperId': paper_ids[writes['paper'].to_numpy()],
+        'corresponding_author': writes['corresponding_author'].to_numpy(),
+        'authorKey': writes['author'].to_numpy(),
+        'paperKey': writes['paper'].to_numpy(),
+    }))
+    # Drawn on the integer keys
+    reviews = assign_reviewers(np.arange(n), np.arange(len(author_ids)),
+                               pd.DataFrame({'authorId': writes['author'], 'paperId': writes['paper']}), seed=seed)
+    write('author_reviews_paper.csv', pd.DataFrame({
+        'authorId': author_ids[reviews['authorId'].to_numpy()],
+        'paperId': paper_ids[reviews['paperId'].to_numpy()],
+        'authorKey': reviews['authorId'].to_numpy(),
+        'paperKey': reviews['paperId'].to_numpy(),
+    }))
+    del writes, reviews
+
+    # Keywords
+    per_paper = rng.poisson(MEAN_KEYWORDS, size=n)
+    keyword_paper = np.repeat(np.arange(n), per_paper)
+    keyword = rng.choice(len(KEYWORDS), size=len(keyword_paper), p=zipf_weights(len(KEYWORDS), 1.0, rng))
+    has_keyword = pd.DataFrame({'paper': keyword_paper, 'keyword': keyword}).drop_duplicates()
+    write('paper_has_keyword.csv', pd.DataFrame({
+        'paperId': paper_ids[has_keyword['paper'].to_numpy()],
+        'paperKey': has_keyword['paper'].to_numpy(),
+        'keyword': np.array(KEYWORDS, dtype=object)[has_keyword['keyword'].to_numpy()],
+    }))
+    del has_keyword
+
+    # Citations, then the papers (citationCount is the in-degree)
+    edges = make_citations(years, rng)
+    citation_count = np.bincount(edges['target'].to_numpy(), minlength=n)
+    filename = os.path.join(outdir, 'paper_cites_paper.csv')
+    for i, start in enumerate(range(0, len(edges), chunk_size)):
+        chunk = edges.iloc[start:start + chunk_size]
+        pd.DataFrame({
+            'sourcePaperId': paper_ids[chunk['source'].to_numpy()],
+            'targetPaperId': paper_ids[chunk['target'].to_numpy()],
+            'sourcePaperKey': chunk['source'].to_numpy(),
+            'targetPaperKey': chunk['target'].to_numpy(),
+        }).to_csv(filename, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+    rows['paper_cites_paper.csv'] = len(edges)
+    del edges
+
+    write_paper_nodes(os.path.join(outdir, 'paper_nodes.csv'), paper_ids, citation_count, rng, chunk_size)
+    rows['paper_nodes.csv'] = n
+
+    print(f"[synthetic] scale {scale}x -> {outdir} in {time.perf_counter() - started:.1f}s")
+    for name, count in sorted(rows.items()):
+        print(f"    {name:28s} {count:>12,d} rows")
+    print(f"    citations per paper: mean {citation_count.mean():.1f}, max {citation_count.max()}")
+    return rows
+
+
+if __name__ == "__main__":
+    # python synthetic_graph.py [scale ...]   (default: 1 10 100)
+    for scale in ([float(s) if '.' in s else int(s) for s in sys.argv[1:]] or SCALE_FACTORS):
+        generate(scale)
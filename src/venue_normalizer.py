@@ -0,0 +1,130 @@
+import random
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import pandas as pd
+
+
+# -------------------------------------------
+# PRECOMPILED VENUE NAME RULES (applied in this order)
+# -------------------------------------------
+_ORDINALS = (r'\b(?:\d+(?:st|nd|rd|th)|First|Second|Third|Fourth|Fifth|Sixth|Seventh|'
+             r'Eighth|Ninth|Tenth|Eleventh|Twelfth|Thirteenth)\b')
+
+VENUE_RULES = [
+    (re.compile(r'\b\d{4}\b|\[\d{4}\]|\b\d{4}\s+\d+(?:st|nd|rd|th)?'), ''),
+    (re.compile(r'Proceedings of( the)?|Proceeding of the|Proceedings\.?'), ''),
+    (re.compile(_ORDINALS), ''),
+    (re.compile(r'\(Cat\.\s*No\..*?\)'), ''),
+    (re.compile(r', \d{4}(?:\.|$)'), ''),
+    (re.compile(r'(?:- |, )(?:Proceedings|Volume \d+)'), ''),
+    (re.compile(r'\s+'), ' '),
+    (re.compile(r'\s*-\s*'), ' '),
+    (re.compile(r'\s*:\s*'), ': '),
+    (re.compile(r'\s*,\s*'), ', '),
+    (re.compile(r'^\/'), ''),
+]
+
+
+def _normalize(name):
+    name = name.strip('"')
+    for pattern, replacement in VENUE_RULES:
+        name = pattern.sub(replacement, name)
+    return name.strip(' .,;:-"')
+
+
+_normalize_cached = lru_cache(maxsize=1 << 16)(_normalize)
+
+
+def clean_venue_name(name):
+    """Canonical venue name; non-strings (e.g. NaN) are returned unchanged."""
+    if isinstance(name, str):
+        return _normalize_cached(name)
+    return name
+
+
+# -------------------------------------------
+# BATCH API
+# -------------------------------------------
+def map_unique(values, processes=1):
+    """
+    Normalises every distinct string in `values` once and maps the
+    results back. Returns a Series for a Series input, else a list.
+    With `processes` > 1 the distinct names are split over a process
+    pool, which only pays off for very large dumps.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    uniques = [v for v in series.dropna().unique() if isinstance(v, str)]
+
+    if processes > 1 and len(uniques) > 1:
+        chunksize = max(1, len(uniques) // (processes * 4))
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            mapping = dict(zip(uniques, pool.map(_normalize, uniques, chunksize=chunksize)))
+    else:
+        mapping = {v: clean_venue_name(v) for v in uniques}
+
+    result = series.map(lambda v: mapping.get(v, v) if isinstance(v, str) else v)
+    return result if isinstance(values, pd.Series) else result.tolist()
+
+
+# -------------------------------------------
+# MICRO-BENCHMARK
+# -------------------------------------------
+def _clean_venue_name_uncompiled(name):
+    # The original per-row implementation, kept as the benchmark baseline
+    if isinstance(name, str):
+        name = name.strip('"')
+        name = re.sub(r'\b\d{4}\b|\[\d{4}\]|\b\d{4}\s+\d+(?:st|nd|rd|th)?', '', name)
+        name = re.sub(r'Proceedings of( the)?|Proceeding of the|Proceedings\.?', '', name)
+        name = re.sub(_ORDINALS, '', name)
+        name = re.sub(r'\(Cat\.\s*No\..*?\)', '', name)
+        name = re.sub(r', \d{4}(?:\.|$)', '', name)
+        name = re.sub(r'(?:- |, )(?:Proceedings|Volume \d+)', '', name)
+        name = re.sub(r'\s+', ' ', name)
+        name = re.sub(r'\s*-\s*', ' ', name)
+        name = re.sub(r'\s*:\s*', ': ', name)
+        name = re.sub(r'\s*,\s*', ', ', name)
+        name = re.sub(r'^\/', '', name)
+        name = name.strip(' .,;:-"')
+    return name
+
+
+def benchmark(n_rows=500_000, n_distinct=5_000, seed=42):
+    rng = random.Random(seed)
+    templates = [
+        "Proceedings of the {ord} International Conference on {topic} ({year})",
+        "{year} IEEE {ord} Symposium on {topic} - Proceedings",
+        "Journal of {topic}, {year}.",
+        "{topic}: {ord} Workshop, {topic} {year}, Volume {vol}",
+    ]
+    topics = ["Data Engineering", "Very Large Data Bases", "Knowledge Discovery", "Information Systems"]
+    ordinals = ["1st", "2nd", "Third", "25th", "Twelfth"]
+    distinct = [
+        rng.choice(templates).format(ord=rng.choice(ordinals), topic=f"{rng.choice(topics)} {i}",
+                                     year=rng.randint(1990, 2024), vol=rng.randint(1, 20))
+        for i in range(n_distinct)
+    ]
+    names = pd.Series([rng.choice(distinct) for _ in range(n_rows)])
+
+    runs = [
+        ("uncompiled apply", lambda: names.apply(_clean_venue_name_uncompiled)),
+        ("compiled apply", lambda: names.apply(_normalize)),
+        ("map_unique", lambda: map_unique(names)),
+        ("map_unique x4 procs", lambda: map_unique(names, processes=4)),
+    ]
+    expected = None
+    for label, run in runs:
+        _normalize_cached.cache_clear()
+        started = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - started
+        if expected is None:
+            expected = result
+        assert result.equals(expected), label
+        print(f"[benchmark] {label:20s} {n_rows} rows / {n_distinct} distinct: {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    benchmark()
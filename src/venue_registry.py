@@ -0,0 +1,84 @@
+from venue_normalizer import clean_venue_name, map_unique
+
+
+CONFERENCE_WORDS = ("conference", "workshop", "proceedings", "symposium")
+
+
+# -------------------------------------------
+# VENUE REGISTRY (normalise once, intern to IDs)
+# -------------------------------------------
+class VenueRegistry:
+    """
+    Interns venues by canonical name. Every raw name is normalised with
+    clean_venue_name once, and each canonical name gets a small integer
+    ID; the venue type heuristic is memoised per (type, raw name) too.
+
+    The extraction writes the IDs to papers.csv (`venueId`) and
+    venues.csv, so preprocessing can join on them instead of cleaning
+    and comparing the names again.
+    """
+
+    def __init__(self):
+        self.names = []            # venueId -> canonical name
+        self._ids = {}             # canonical name -> venueId
+        self._types = {}           # (venueType, raw name) -> venueType
+        self._rows = {}            # (venueId, venueType, volume, pages) -> None
+
+    def canonical(self, name):
+        # clean_venue_name memoises per raw name
+        return clean_venue_name(name)
+
+    def intern(self, name):
+        """venueId of a raw venue name (None for an empty name)."""
+        canonical = self.canonical(name)
+        if not canonical:
+            return None
+        venue_id = self._ids.get(canonical)
+        if venue_id is None:
+            venue_id = len(self.names)
+            self._ids[canonical] = venue_id
+            self.names.append(canonical)
+        return venue_id
+
+    def classify(self, venue_type, name):
+        """Journals whose name looks like a conference are conferences."""
+        key = (venue_type, name)
+        result = self._types.get(key)
+        if result is None:
+            result = venue_type
+            if venue_type == "Journal" and any(cw in name.lower() for cw in CONFERENCE_WORDS):
+                result = "Conference"
+            self._types[key] = result
+        return result
+
+    def add_paper(self, paper):
+        """
+        Registers the venue of one PaperRecord and returns its venueId.
+        Journals use the journal name, volume and pages when known.
+        """
+        name = paper.venue or ""
+        venue_type = self.classify(paper.venueType, name)
+        volume = ""
+        pages = ""
+        if venue_type == "Journal":
+            if paper.journalName:
+                name = paper.journalName
+            volume = paper.journalVolume
+            pages = paper.pages
+
+        venue_id = self.intern(name)
+        if venue_id is not None:
+            self._rows[(venue_id, venue_type, volume, pages)] = None
+        return venue_id
+
+    def rows(self):
+        """One dict per distinct (venue, type, volume, pages), for venues.csv."""
+        return [
+            {"venueId": vid, "venueType": vtype, "name": self.names[vid],
+             "volume": volume, "pages": pages}
+            for vid, vtype, volume, pages in self._rows
+        ]
+
+    def map_names(self, series, processes=1):
+        """Canonical names for a pandas Series, normalising each distinct value once."""
+        return map_unique(series, processes=processes)
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from id_interning import IdTable, author_id_table, paper_id_table
+
+
+def test_intern_assigns_dense_keys_in_first_seen_order():
+    table = IdTable()
+    keys = table.intern(["b", "a", "b", "c"])
+    assert keys.tolist() == [0, 1, 0, 2]
+    assert keys.dtype == np.int64
+    assert table.intern(["c", "d"]).tolist() == [2, 3]
+    assert table.external([3, 0]).tolist() == ["d", "b"]
+
+
+def test_lookup_returns_minus_one_for_unknown_and_missing():
+    table = IdTable(["a", "b"])
+    assert table.lookup(["b", "zzz", None, np.nan, "a"]).tolist() == [1, -1, -1, -1, 0]
+    assert len(table) == 2
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "paper_ids.csv"
+    table = paper_id_table(str(path))
+    table.intern(["p1", "p2", "p3"])
+    table.save(str(path))
+
+    loaded = paper_id_table(str(path))
+    pd.testing.assert_frame_equal(loaded.to_frame(), table.to_frame())
+    assert loaded.lookup(["p3", "p1", "new"]).tolist() == [2, 0, -1]
+    # Keys of an earlier run never change, new IDs are appended
+    assert loaded.intern(["new", "p2"]).tolist() == [3, 1]
+
+
+def test_author_ids_are_normalised(tmp_path):
+    table = author_id_table(str(tmp_path / "author_ids.csv"))
+    assert table.intern(["123", 123.0, "123.0", " 456 "]).tolist() == [0, 0, 0, 1]
+    table.save(str(tmp_path / "author_ids.csv"))
+    loaded = author_id_table(str(tmp_path / "author_ids.csv"))
+    assert loaded.to_frame().columns.tolist() == ["authorKey", "authorId"]
+    assert loaded.lookup([123, "456"]).tolist() == [0, 1]
+
+
+def test_load_rejects_non_dense_keys(tmp_path):
+    path = tmp_path / "paper_ids.csv"
+    pd.DataFrame({"paperKey": [0, 2], "paperId": ["a", "b"]}).to_csv(path, index=False)
+    with pytest.raises(ValueError):
+        paper_id_table(str(path))
@@ -0,0 +1,65 @@
+import numpy as np
+
+from keyword_propagation import build_csr, decode_keywords, encode_keywords, propagate, propagate_keywords
+
+KEYWORDS = {
+    "p1": {"big data"},
+    "p2": {"ethics"},
+    "p3": set(),
+    "p4": {"indexing", "data storage"},
+    "p5": set(),
+    "p6": {"machine learning"},
+}
+REFERENCES = {
+    "p1": ["p2", "p3", "missing"],
+    "p2": ["p3", "p5"],
+    "p3": ["p4"],
+    "p4": [],
+    "p5": ["p5"],            # self-reference
+    "p6": ["p1", "p3"],
+}
+
+
+def one_hop(keywords, references):
+    """
+    The fields script's old single pass: every paper's keywords are
+    unioned into the papers it references. Uses the keywords from before
+    the pass, so a chain does not propagate further within one pass.
+    """
+    result = {pid: set(kws) for pid, kws in keywords.items()}
+    for pid, refs in references.items():
+        for rid in refs:
+            if rid in result and rid != pid:
+                result[rid] |= keywords[pid]
+    return result
+
+
+def test_depth_one_equals_old_one_hop_pass():
+    assert propagate_keywords(KEYWORDS, REFERENCES, depth=1) == one_hop(KEYWORDS, REFERENCES)
+
+
+def test_fixed_point_equals_repeated_one_hop():
+    expected = KEYWORDS
+    while True:
+        step = one_hop(expected, REFERENCES)
+        if step == expected:
+            break
+        expected = step
+    assert propagate_keywords(KEYWORDS, REFERENCES) == expected
+    assert propagate_keywords(KEYWORDS, REFERENCES, depth=2) == one_hop(one_hop(KEYWORDS, REFERENCES), REFERENCES)
+
+
+def test_bitset_round_trip_over_word_boundary():
+    vocabulary = [f"k{i}" for i in range(130)]
+    sets = [{"k0", "k63", "k64", "k129"}, set(), {"k65"}]
+    bits, vocab = encode_keywords(sets, vocabulary)
+    assert bits.shape == (3, 3)
+    assert decode_keywords(bits, vocab) == sets
+
+
+def test_propagate_without_edges_is_identity():
+    bits = np.array([[1], [2]], dtype=np.uint64)
+    indptr, indices = build_csr(2, [], [])
+    result, steps = propagate(bits, indptr, indices)
+    assert steps == 0
+    assert np.array_equal(result, bits)
@@ -0,0 +1,56 @@
+from keyword_tagger import KeywordTagger
+
+# Same vocabulary as TITLE_KEYWORDS in the fields script
+KEYWORDS = [
+    'data management', 'indexing', 'data modeling', 'big data',
+    'data processing', 'data storage', 'data querying',
+    'artificial intelligence', 'machine learning', 'ethics',
+    'semantic data', 'data warehouse', 'process mining',
+    'decision support'
+]
+
+PAPERS = [
+    ("Big Data Processing at Scale", "We revisit data warehouse design for machine learning."),
+    ("Indexing Semantic Data with Learned Structures", None),
+    ("On the Ethics of Artificial Intelligence", "A survey of AI ethics and decision support."),
+    ("Process mining for BIG DATA management", "Re-indexing and data storage trade-offs."),
+    ("A Note on Bigdata", "No keyword here: data-modeling is hyphenated."),
+    (None, "Data querying and data modeling in practice."),
+    ("", ""),
+]
+
+
+def substring_tags(text):
+    """The tagger the fields script used before: `tk.lower() in title_lower`."""
+    text_lower = (text or "").lower()
+    return {tk for tk in KEYWORDS if tk.lower() in text_lower}
+
+
+def test_title_tags_match_substring_loop():
+    tagger = KeywordTagger(KEYWORDS)
+    for title, _ in PAPERS:
+        assert tagger.tag(title) == substring_tags(title), title
+
+
+def test_title_and_abstract_tags_are_the_union_of_both():
+    tagger = KeywordTagger(KEYWORDS)
+    for title, abstract in PAPERS:
+        assert tagger.tag(title, abstract) == substring_tags(title) | substring_tags(abstract)
+
+
+def test_no_match_across_title_and_abstract():
+    tagger = KeywordTagger(KEYWORDS)
+    assert tagger.tag("Towards big", "data systems") == set()
+
+
+def test_tag_many_is_tag_per_document():
+    tagger = KeywordTagger(KEYWORDS)
+    titles = [t for t, _ in PAPERS]
+    abstracts = [a for _, a in PAPERS]
+    assert tagger.tag_many(titles, abstracts) == [tagger.tag(t, a) for t, a in PAPERS]
+
+
+def test_whole_words():
+    tagger = KeywordTagger(["data", "mining"], whole_words=True)
+    assert tagger.tag("Process mining of metadata") == {"mining"}
+    assert KeywordTagger(["data", "mining"]).tag("Process mining of metadata") == {"data", "mining"}
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from reviewer_assignment import REVIEWER_COUNTS, assign_reviewers
+
+
+def sample_graph(n_papers=300, n_authors=40, seed=0):
+    rng = np.random.default_rng(seed)
+    paper_ids = [f"p{i}" for i in range(n_papers)]
+    author_ids = [str(1000 + i) for i in range(n_authors)]
+    rows = []
+    for pid in paper_ids:
+        for aid in rng.choice(author_ids, size=rng.integers(1, 6), replace=False):
+            rows.append((aid, pid))
+    return paper_ids, author_ids, pd.DataFrame(rows, columns=['authorId', 'paperId'])
+
+
+def test_reviewers_are_never_authors_of_the_paper():
+    paper_ids, author_ids, writes = sample_graph()
+    reviews = assign_reviewers(paper_ids, author_ids, writes, seed=7)
+    authorship = set(zip(writes['authorId'], writes['paperId']))
+    assert len(reviews) > 0
+    assert not any(pair in authorship for pair in zip(reviews['authorId'], reviews['paperId']))
+
+
+def test_no_repeated_reviewer_and_counts_in_range():
+    paper_ids, author_ids, writes = sample_graph()
+    reviews = assign_reviewers(paper_ids, author_ids, writes, seed=7)
+    assert not reviews.duplicated().any()
+    per_paper = reviews.groupby('paperId').size()
+    assert set(per_paper.index) == set(paper_ids)
+    assert per_paper.between(min(REVIEWER_COUNTS), max(REVIEWER_COUNTS)).all()
+
+
+def test_reproducible_for_a_fixed_seed():
+    paper_ids, author_ids, writes = sample_graph()
+    first = assign_reviewers(paper_ids, author_ids, writes, seed=42)
+    second = assign_reviewers(paper_ids, author_ids, writes, seed=42)
+    other = assign_reviewers(paper_ids, author_ids, writes, seed=43)
+    pd.testing.assert_frame_equal(first, second)
+    assert not first.equals(other)
+
+
+def test_small_author_pool_caps_reviewer_count():
+    # Two of three authors wrote the paper: only one reviewer is possible
+    writes = pd.DataFrame({'authorId': ['1', '2'], 'paperId': ['p', 'p']})
+    reviews = assign_reviewers(['p'], ['1', '2', '3'], writes, seed=1)
+    assert reviews['authorId'].tolist() == ['3']
+
+
+def test_integer_keys_and_float_author_ids():
+    # Interned keys work as they are; "123.0" string IDs are normalised
+    writes = pd.DataFrame({'authorId': np.array([0, 1], dtype=np.int64), 'paperId': np.array([0, 0], dtype=np.int64)})
+    reviews = assign_reviewers(np.array([0]), np.arange(5, dtype=np.int64), writes, seed=3)
+    assert not set(reviews['authorId']) & {0, 1}
+    writes = pd.DataFrame({'authorId': [1.0, 2.0], 'paperId': ['p', 'p']})
+    reviews = assign_reviewers(['p'], ['1', '2', '3'], writes, seed=3)
+    assert reviews['authorId'].tolist() == ['3']